@@ -0,0 +1,154 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+
+from core.number.BigFloat import BigFloat
+
+from cache.provider.RedisCacheProvider import RedisCacheProvider
+from cache.provider.RedisCacheProviderWithHash import RedisCacheProviderWithHash
+from cache.utility.BigFloat_utility import crack_to_serialize, join_to_deserialize, pack_bigfloats, unpack_bigfloats
+
+KEY_PREFIX = 'bench:'
+
+
+def build_provider(args):
+    options = {
+        'REDIS_SERVER_ADDRESS': args.host,
+        'REDIS_SERVER_PORT': args.port,
+        'AUTO_CONNECT': not args.fake,
+        'REDIS_RAW_BYTES': args.raw_bytes
+    }
+    provider = RedisCacheProviderWithHash(options, auto_connect=not args.fake)
+    if args.fake:
+        # fakeredis is only a stand-in for running the benchmark without a redis-server
+        import fakeredis
+        provider.redis_client = fakeredis.FakeRedis(decode_responses=not args.raw_bytes)
+    return provider
+
+
+def server_bytes(provider):
+    try:
+        stats = provider.redis_client.info('stats')
+        return stats['total_net_input_bytes'] + stats['total_net_output_bytes']
+    except Exception:
+        return None
+
+
+def percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def run_case(provider, name, operation, iterations, warmup, payload_bytes):
+    for _ in range(warmup):
+        operation()
+    bytes_before = server_bytes(provider)
+    samples = []
+    started = time.perf_counter_ns()
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        operation()
+        samples.append(time.perf_counter_ns() - start)
+    elapsed = time.perf_counter_ns() - started
+    bytes_after = server_bytes(provider)
+    samples.sort()
+    return {
+        'case': name,
+        'iterations': iterations,
+        'ops_per_second': iterations / (elapsed / 1e9),
+        'p50_us': percentile(samples, 0.50) / 1e3,
+        'p99_us': percentile(samples, 0.99) / 1e3,
+        'mean_us': statistics.fmean(samples) / 1e3,
+        'payload_bytes_per_op': payload_bytes,
+        'bytes_transferred': None if bytes_before is None or bytes_after is None else bytes_after - bytes_before
+    }
+
+
+def store_fetch_cases(provider):
+    values = {
+        str: 'some-instrument-value',
+        int: 1234567,
+        float: 1234.5678,
+        BigFloat: BigFloat('1000000000.000000000012'),
+        dict: {'instrument': 'BTCUSDT', 'price': '28000.12', 'quantity': '0.001', 'exchange': 'binance'}
+    }
+    for as_type, value in values.items():
+        key = f'{KEY_PREFIX}store-fetch:{as_type.__name__}'
+        payload_bytes = len(str(provider.serialize(key, value)))
+        yield f'store[{as_type.__name__}]', lambda k=key, v=value: provider.store(k, v), payload_bytes
+        yield f'fetch[{as_type.__name__}]', lambda k=key, t=as_type: provider.fetch(k, as_type=t), payload_bytes
+
+
+def values_cases(provider, entries):
+    dict_values = {f'instrument-{i}': {'price': f'{i}.123456', 'quantity': f'{i}'} for i in range(entries)}
+    list_values = [{'instrument': f'instrument-{i}', 'price': f'{i}.123456', 'quantity': f'{i}'} for i in range(entries)]
+    list_key = lambda value: value['instrument']
+    dict_bytes = sum(len(k) + len(str(v)) for k, v in provider.serialize_values(dict_values).items())
+    list_bytes = sum(len(k) + len(str(v)) for k, v in provider.serialize_values(list_values, list_key).items())
+    yield f'values_store[dict:{entries}]', lambda: provider.values_store(f'{KEY_PREFIX}values:dict', dict_values), dict_bytes
+    yield f'values_store[list:{entries}]', lambda: provider.values_store(f'{KEY_PREFIX}values:list', list_values, custom_key=list_key), list_bytes
+    yield f'values_fetch[dict:{entries}]', lambda: provider.values_fetch(f'{KEY_PREFIX}values:dict', as_type=dict), dict_bytes
+    yield f'values_fetch[list:{entries}]', lambda: provider.values_fetch(f'{KEY_PREFIX}values:list', as_type=list), list_bytes
+
+
+def get_keys_cases(provider, keys):
+    provider.store_many({f'{KEY_PREFIX}keys:{i}': i for i in range(keys)})
+    key_bytes = sum(len(f'{KEY_PREFIX}keys:{i}') for i in range(keys))
+    yield f'get_keys[{keys}]', lambda: provider.get_keys(f'{KEY_PREFIX}keys:*'), key_bytes
+
+
+def bigfloat_cases(entries):
+    bigfloats = [BigFloat(f'{i}.{i:012d}') for i in range(entries)]
+    cracked = [crack_to_serialize(bigfloat) for bigfloat in bigfloats]
+    packed = pack_bigfloats(bigfloats)
+    yield f'bigfloat_crack[{entries}]', lambda: [crack_to_serialize(bigfloat) for bigfloat in bigfloats], None
+    yield f'bigfloat_join[{entries}]', lambda: [join_to_deserialize(*c) for c in cracked], None
+    yield f'bigfloat_pack[{entries}]', lambda: pack_bigfloats(bigfloats), len(packed)
+    yield f'bigfloat_unpack[{entries}]', lambda: unpack_bigfloats(packed), len(packed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='automata-redis provider hot path benchmark')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6379)
+    parser.add_argument('--fake', action='store_true', help='use fakeredis instead of a redis-server')
+    parser.add_argument('--raw-bytes', action='store_true', help='keep replies as bytes (REDIS_RAW_BYTES)')
+    parser.add_argument('--iterations', type=int, default=1000)
+    parser.add_argument('--bulk-iterations', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=10)
+    parser.add_argument('--entries', type=int, default=1000)
+    parser.add_argument('--output', default=None, help='write json report to file (default stdout)')
+    args = parser.parse_args(argv)
+
+    provider = build_provider(args)
+    results = []
+    for (name, operation, payload_bytes) in store_fetch_cases(provider):
+        results.append(run_case(provider, name, operation, args.iterations, args.warmup, payload_bytes))
+    for (name, operation, payload_bytes) in values_cases(provider, args.entries):
+        results.append(run_case(provider, name, operation, args.bulk_iterations, args.warmup, payload_bytes))
+    for (name, operation, payload_bytes) in get_keys_cases(provider, args.entries):
+        results.append(run_case(provider, name, operation, args.bulk_iterations, args.warmup, payload_bytes))
+    for (name, operation, payload_bytes) in bigfloat_cases(args.entries):
+        results.append(run_case(provider, name, operation, args.bulk_iterations, args.warmup, payload_bytes))
+    provider.delete_many(list(provider.iter_keys(f'{KEY_PREFIX}*')))
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'server': 'fakeredis' if args.fake else f'{args.host}:{args.port}',
+        'results': results
+    }
+    serialized_report = json.dumps(report, indent=2)
+    if args.output is None:
+        print(serialized_report)
+    else:
+        with open(args.output, 'w') as report_file:
+            report_file.write(serialized_report)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
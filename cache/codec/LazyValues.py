@@ -0,0 +1,30 @@
+from collections.abc import Mapping
+
+_UNDECODED = object()
+
+
+class LazyValues(Mapping):
+
+    def __init__(self, raw_values: dict, decode):
+        self.raw_values = raw_values
+        self.decode = decode
+        self.decoded_values = {}
+
+    def __getitem__(self, key):
+        value = self.decoded_values.get(key, _UNDECODED)
+        if value is _UNDECODED:
+            value = self.decode(self.raw_values[key])
+            self.decoded_values[key] = value
+        return value
+
+    def __contains__(self, key):
+        return key in self.raw_values
+
+    def __iter__(self):
+        return iter(self.raw_values)
+
+    def __len__(self):
+        return len(self.raw_values)
+
+    def __repr__(self):
+        return f'LazyValues({list(self.raw_values.keys())})'
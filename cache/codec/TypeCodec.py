@@ -0,0 +1,6 @@
+class TypeCodec:
+
+    # encode turns a value into JSON-able data, decode builds the value back from the parsed data
+    def __init__(self, encode, decode):
+        self.encode = encode
+        self.decode = decode
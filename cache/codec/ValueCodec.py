@@ -0,0 +1,205 @@
+import logging
+from typing import TypeVar
+
+from core.constants.not_available import NOT_AVAILABLE
+from core.number.BigFloat import BigFloat
+from coreutility.json.json_utility import as_json, as_pretty_json
+
+from cache.codec.LazyValues import LazyValues
+from cache.codec.type_codec_utility import type_codec_for, element_decoder, element_type_of
+from cache.serializer.serializer_utility import is_marked, dumps_marked, loads_marked, load_serializer, serializer_from_options, bigfloat_binary_from_options, \
+    compression_from_options, compression_threshold_from_options, DEFAULT_COMPRESSION_THRESHOLD
+from cache.utility.bytes_utility import as_text, as_bytes
+
+T = TypeVar("T")
+
+NOT_AVAILABLE_VALUES = (NOT_AVAILABLE, NOT_AVAILABLE.encode())
+JSON_HEADS = ('{', '[', ord('{'), ord('['))
+
+
+class ValueCodec:
+
+    def __init__(self, serializer=None, bigfloat_binary=False, compression=None, compression_threshold=DEFAULT_COMPRESSION_THRESHOLD):
+        self.log = logging.getLogger('ValueCodec')
+        # without a configured serializer values are written as unmarked JSON (as before markers existed)
+        self.serializer = serializer
+        self.bigfloat_binary = bigfloat_binary
+        self.bigfloat_serializer = load_serializer('bigfloat') if bigfloat_binary else None
+        self.bigfloat_array_serializer = load_serializer('bigfloat-array') if bigfloat_binary else None
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        # decoders resolved once per requested type
+        self.decoders = {}
+        self.values_decoders = {}
+
+    @classmethod
+    def from_options(cls, options):
+        return cls(serializer_from_options(options), bigfloat_binary_from_options(options), compression_from_options(options),
+                   compression_threshold_from_options(options))
+
+    def dumps(self, value):
+        dumped = as_pretty_json(value, indent=None) if self.serializer is None else dumps_marked(self.serializer, value)
+        if self.compression is None or len(dumped) < self.compression_threshold:
+            return dumped
+        return self.compress(dumped)
+
+    def compress(self, dumped):
+        compressed = dumps_marked(self.compression, dumped)
+        # keep whichever is smaller on the wire
+        return compressed if len(compressed) < len(as_bytes(dumped)) else dumped
+
+    @staticmethod
+    def loads(value, default='[]'):
+        if value is not None and is_marked(value):
+            return loads_marked(value)
+        return as_json(value, default)
+
+    def serialize(self, key, value):
+        if type(value) is BigFloat:
+            self.log.debug('BigFloat storing key:%s [%s]', key, value)
+            return self.serialize_bigfloat(value)
+        elif type(value) is dict:
+            self.log.debug('collection storing key:%s [%s]', key, value)
+            return self.dumps(value)
+        elif type(value) is list:
+            self.log.debug('list storing key:%s [%s]', key, value)
+            return self.serialize_list(value)
+        else:
+            self.log.debug('default storing key:%s [%s]', key, value)
+            return self.serialize_other(value)
+
+    def serialize_other(self, value):
+        type_codec = type_codec_for(type(value))
+        if type_codec is None:
+            return value
+        return self.dumps(type_codec.encode(value))
+
+    def serialize_bigfloat(self, value: BigFloat):
+        if self.bigfloat_binary:
+            return dumps_marked(self.bigfloat_serializer, value)
+        return str(value)
+
+    def serialize_list(self, value: list):
+        if self.bigfloat_binary and len(value) > 0 and all(type(v) is BigFloat for v in value):
+            return dumps_marked(self.bigfloat_array_serializer, value)
+        type_codec = type_codec_for(type(value[0])) if len(value) > 0 else None
+        if type_codec is not None:
+            return self.dumps([type_codec.encode(v) for v in value])
+        return self.dumps(value)
+
+    def deserialize(self, key, value, as_type: T = str):
+        decoder = self.decoders.get(as_type)
+        if decoder is None:
+            decoder = self.decoders[as_type] = self.build_decoder(as_type)
+        return decoder(key, value)
+
+    def build_decoder(self, as_type):
+        if as_type is bytes:
+            return lambda key, value: value
+        if as_type is int or as_type is float:
+            decode = lambda key, value: as_type(value)
+        elif as_type is BigFloat:
+            decode = lambda key, value: loads_marked(value) if is_marked(value) else BigFloat(as_text(value))
+        elif as_type is list:
+            decode = lambda key, value: self.loads(value)
+        elif as_type is dict:
+            decode = self.deserialize_dict
+        else:
+            decode = self.build_typed_decoder(as_type)
+
+        def decoder(key, value):
+            if value is None:
+                return None
+            if value in NOT_AVAILABLE_VALUES:
+                return NOT_AVAILABLE
+            return decode(key, value)
+        return decoder
+
+    def build_typed_decoder(self, as_type):
+        (container, element_type) = element_type_of(as_type)
+        if container is not None:
+            decode_element = element_decoder(element_type)
+            if container is list:
+                return lambda key, value: [decode_element(v) for v in self.loads(value)]
+            return lambda key, value: {k: decode_element(v) for k, v in self.loads(value, default='{}').items()}
+        type_codec = type_codec_for(as_type)
+        if type_codec is not None:
+            return lambda key, value: type_codec.decode(self.loads(value))
+        return lambda key, value: as_text(value)
+
+    def deserialize_dict(self, key, value):
+        result = self.loads(value)
+        self.log.debug('dict fetching key:%s [%s]', key, result)
+        return None if len(result) == 0 else result
+
+    def serialize_values(self, values, custom_key=None):
+        serialized_values = {}
+        if type(values) is dict:
+            for k, v in values.items():
+                serialized_values[k] = self.serialize_value(v)
+        elif type(values) is list:
+            for v in values:
+                value_key = next(iter(v)) if (custom_key is None) else custom_key(v)
+                serialized_values[value_key] = self.dumps(v) if type(v) is dict else self.serialize_value(v)
+        return serialized_values
+
+    def serialize_value(self, value):
+        if type(value) is BigFloat:
+            return self.serialize_bigfloat(value)
+        elif type(value) is dict:
+            return self.dumps(value)
+        elif type(value) is list:
+            return self.serialize_list(value)
+        return self.serialize_other(value)
+
+    def deserialize_values(self, values, as_type: T = list):
+        if as_type is bytes:
+            return values
+        if as_type is dict:
+            return {as_text(k): self.deserialize_value(v) for k, v in values.items()}
+        elif as_type is list:
+            return list([self.loads(v) for k, v in values.items()])
+        return self.values_decoder_for(as_type)(values)
+
+    def values_decoder_for(self, as_type):
+        # list[X] or dict[str, X] of hash values
+        decoder = self.values_decoders.get(as_type)
+        if decoder is None:
+            (container, element_type) = element_type_of(as_type)
+            if container is None:
+                raise ValueError(f'cannot fetch values as type:{as_type} please use list, dict, bytes, list[type] or dict[str, type]')
+            decode_element = element_decoder(element_type)
+            if container is list:
+                decoder = lambda values: [decode_element(self.deserialize_value(v)) for v in values.values()]
+            else:
+                decoder = lambda values: {as_text(k): decode_element(self.deserialize_value(v)) for k, v in values.items()}
+            self.values_decoders[as_type] = decoder
+        return decoder
+
+    def deserialize_fields(self, fields, values, as_type: T = dict):
+        deserialized_values = [None if v is None else self.deserialize_value(v) for v in values]
+        if as_type is dict:
+            return dict(zip(fields, deserialized_values))
+        return deserialized_values
+
+    def lazy_values(self, values):
+        if len(values) > 0 and type(next(iter(values))) is bytes:
+            values = {k.decode(): v for k, v in values.items()}
+        return LazyValues(values, self.deserialize_value)
+
+    def deserialize_value_of_key(self, value_key, value):
+        if value is None:
+            return value
+        deserialized_value = self.deserialize_value(value)
+        if type(deserialized_value) is dict:
+            return deserialized_value[value_key] if value_key in deserialized_value else deserialized_value
+        return deserialized_value
+
+    @staticmethod
+    def deserialize_value(value):
+        if is_marked(value):
+            return loads_marked(value)
+        # unmarked values are legacy JSON or plain strings
+        if len(value) > 0 and value[0] in JSON_HEADS:
+            return as_json(value)
+        return as_text(value)
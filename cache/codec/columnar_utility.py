@@ -0,0 +1,37 @@
+import numpy
+
+DEFAULT_COLUMN_DTYPE = numpy.float64
+
+
+def column_dtype(dtypes, field):
+    return numpy.dtype(dtypes.get(field, DEFAULT_COLUMN_DTYPE)) if dtypes is not None else numpy.dtype(DEFAULT_COLUMN_DTYPE)
+
+
+def records_to_columns(records, fields, dtypes=None, key_column=None, value_keys=None):
+    # one array per field, values are converted by numpy (decimal strings included) rather than per value in python
+    columns = {} if key_column is None else {key_column: numpy.array(value_keys, dtype=str)}
+    for field in fields:
+        values = numpy.array([record.get(field) if type(record) is dict else None for record in records], dtype=object)
+        columns[field] = as_column(values, column_dtype(dtypes, field))
+    return columns
+
+
+def as_column(values, dtype):
+    if dtype == numpy.dtype(object):
+        return values
+    missing = numpy.equal(values, None)
+    if missing.any():
+        if numpy.issubdtype(dtype, numpy.floating):
+            values[missing] = numpy.nan
+        elif numpy.issubdtype(dtype, numpy.str_):
+            values[missing] = ''
+        else:
+            raise ValueError(f'missing values cannot be held by dtype:{dtype}, please use a float or object dtype')
+    return values.astype(dtype)
+
+
+def concatenate_columns(chunks, fields, dtypes=None, key_column=None):
+    if len(chunks) == 0:
+        columns = {} if key_column is None else {key_column: numpy.empty(0, dtype=str)}
+        return {**columns, **{field: numpy.empty(0, dtype=column_dtype(dtypes, field)) for field in fields}}
+    return {column: numpy.concatenate([chunk[column] for chunk in chunks]) for column in chunks[0].keys()}
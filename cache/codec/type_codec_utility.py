@@ -0,0 +1,123 @@
+import dataclasses
+import typing
+
+from core.number.BigFloat import BigFloat
+
+from cache.codec.TypeCodec import TypeCodec
+from cache.utility.BigFloat_utility import to_decimal_string
+
+# codecs by type, resolved once per type (None for types without a codec)
+_type_codecs = {}
+
+
+def register_type_codec(value_type, encode, decode):
+    _type_codecs[value_type] = TypeCodec(encode, decode)
+
+
+def type_codec_for(value_type):
+    if value_type not in _type_codecs:
+        _type_codecs[value_type] = build_type_codec(value_type) if is_record_type(value_type) else None
+    return _type_codecs[value_type]
+
+
+def is_record_type(value_type):
+    if not isinstance(value_type, type) or value_type is BigFloat:
+        return False
+    return dataclasses.is_dataclass(value_type) or len(slot_names(value_type)) > 0
+
+
+def slot_names(value_type):
+    names = []
+    for base in reversed(value_type.__mro__):
+        slots = base.__dict__.get('__slots__', ())
+        for name in [slots] if type(slots) is str else slots:
+            if name not in ('__dict__', '__weakref__') and name not in names:
+                names.append(name)
+    return names
+
+
+def build_type_codec(value_type):
+    is_dataclass = dataclasses.is_dataclass(value_type)
+    names = [field.name for field in dataclasses.fields(value_type)] if is_dataclass else slot_names(value_type)
+    converters = field_converters(value_type, names)
+
+    def encode(value):
+        data = {name: getattr(value, name, None) for name in names}
+        for (name, encode_field, _) in converters:
+            if data[name] is not None:
+                data[name] = encode_field(data[name])
+        return data
+
+    def decode(data):
+        # the freshly parsed data is converted in place, no copy is made
+        for (name, _, decode_field) in converters:
+            if data.get(name) is not None:
+                data[name] = decode_field(data[name])
+        if is_dataclass:
+            return value_type(**data)
+        value = value_type.__new__(value_type)
+        for (name, field_value) in data.items():
+            object.__setattr__(value, name, field_value)
+        return value
+
+    return TypeCodec(encode, decode)
+
+
+def field_converters(value_type, names):
+    # only fields needing conversion (BigFloat, nested records & lists of them) are visited per value
+    try:
+        hints = typing.get_type_hints(value_type)
+    except (NameError, TypeError):
+        hints = {}
+    converters = []
+    for name in names:
+        converter = converter_for(hints.get(name))
+        if converter is not None:
+            converters.append((name, *converter))
+    return converters
+
+
+def converter_for(hint):
+    hint = optional_type(hint)
+    if hint is BigFloat:
+        return to_decimal_string, element_decoder(BigFloat)
+    if typing.get_origin(hint) is list and len(typing.get_args(hint)) == 1:
+        converter = converter_for(typing.get_args(hint)[0])
+        if converter is None:
+            return None
+        (encode_element, decode_element) = converter
+        return (lambda values: [encode_element(v) for v in values]), (lambda values: [decode_element(v) for v in values])
+    if is_record_type(hint):
+        type_codec = type_codec_for(hint)
+        return type_codec.encode, type_codec.decode
+    return None
+
+
+def optional_type(hint):
+    if typing.get_origin(hint) is typing.Union:
+        arguments = [argument for argument in typing.get_args(hint) if argument is not type(None)]
+        return arguments[0] if len(arguments) == 1 else hint
+    return hint
+
+
+def element_decoder(element_type):
+    # decodes an element that has already been parsed (from JSON or a hash field)
+    if element_type is BigFloat:
+        return lambda value: value if type(value) is BigFloat else BigFloat(str(value))
+    if element_type is int or element_type is float:
+        return element_type
+    type_codec = type_codec_for(element_type)
+    if type_codec is not None:
+        return type_codec.decode
+    return lambda value: value
+
+
+def element_type_of(as_type):
+    # list[X] and dict[str, X] fetch elements as X
+    origin = typing.get_origin(as_type)
+    arguments = typing.get_args(as_type)
+    if origin is list and len(arguments) == 1:
+        return origin, arguments[0]
+    if origin is dict and len(arguments) == 2:
+        return origin, arguments[1]
+    return None, None
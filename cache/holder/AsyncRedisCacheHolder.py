@@ -0,0 +1,48 @@
+import logging
+import threading
+from typing import TypeVar, Type
+
+from cache.holder.RedisCacheHolder import RedisCacheHolder
+from cache.holder.holder_utility import options_key
+from cache.provider.AsyncRedisCacheProvider import AsyncRedisCacheProvider
+from cache.provider.AsyncRedisCacheProviderWithHash import AsyncRedisCacheProviderWithHash
+from cache.utility.fork_utility import register_reset_after_fork
+
+T = TypeVar('T', AsyncRedisCacheProvider, AsyncRedisCacheProviderWithHash)
+
+
+class AsyncRedisCacheHolder:
+    __providers = {}
+    __default: T = None
+    __lock = threading.Lock()
+
+    def __new__(cls, options=None, held_type: Type[T] = AsyncRedisCacheProvider) -> T:
+        if options is None and AsyncRedisCacheHolder.__default is not None:
+            return AsyncRedisCacheHolder.__default
+        provider_key = (options_key(options), held_type)
+        provider = AsyncRedisCacheHolder.__providers.get(provider_key)
+        if provider is None:
+            with AsyncRedisCacheHolder.__lock:
+                provider = AsyncRedisCacheHolder.__providers.get(provider_key)
+                if provider is None:
+                    log = logging.getLogger('AsyncRedisCacheHolder')
+                    log.info(f'Holder obtaining (async) REDIS cache provider with options:{options}')
+                    auto_connect = RedisCacheHolder.set_auto_connect(options)
+                    provider = held_type(options, auto_connect)
+                    AsyncRedisCacheHolder.__providers[provider_key] = provider
+                    if AsyncRedisCacheHolder.__default is None:
+                        AsyncRedisCacheHolder.__default = provider
+        return provider
+
+    @staticmethod
+    def re_initialize():
+        AsyncRedisCacheHolder.__providers = {}
+        AsyncRedisCacheHolder.__default = None
+
+    @staticmethod
+    def reset_after_fork():
+        AsyncRedisCacheHolder.__lock = threading.Lock()
+        AsyncRedisCacheHolder.re_initialize()
+
+
+register_reset_after_fork(AsyncRedisCacheHolder.reset_after_fork)
@@ -1,23 +1,50 @@
 import logging
+import threading
 from typing import TypeVar, Type
 
+from cache.holder.holder_utility import options_key
 from cache.provider.RedisCacheProvider import RedisCacheProvider
 from cache.provider.RedisCacheProviderWithHash import RedisCacheProviderWithHash
+from cache.provider.RedisCacheProviderWithTimeSeries import RedisCacheProviderWithTimeSeries
+from cache.utility.fork_utility import register_reset_after_fork
 
-T = TypeVar('T', RedisCacheProvider, RedisCacheProviderWithHash)
+T = TypeVar('T', RedisCacheProvider, RedisCacheProviderWithHash, RedisCacheProviderWithTimeSeries)
 
 
 # todo: nice, would be just RedisCacheHolder(Generic[T]) (IDE having trouble)
 class RedisCacheHolder:
-    __instance: T = None
+    __providers = {}
+    __thread_providers = threading.local()
+    __default: T = None
+    __lock = threading.Lock()
 
-    def __new__(cls, options=None, held_type: Type[T] = RedisCacheProvider) -> T:
-        if cls.__instance is None:
-            log = logging.getLogger('RedisCacheHolder')
-            log.info(f'Holder obtaining REDIS cache provider with options:{options}')
-            auto_connect = cls.set_auto_connect(options)
-            cls.__instance = held_type(options, auto_connect)
-        return cls.__instance
+    def __new__(cls, options=None, held_type: Type[T] = RedisCacheProvider, per_thread=False) -> T:
+        # without options the first held provider is handed out
+        if options is None and RedisCacheHolder.__default is not None:
+            return RedisCacheHolder.__default
+        providers = RedisCacheHolder.__held_providers(per_thread)
+        provider_key = (options_key(options), held_type)
+        provider = providers.get(provider_key)
+        if provider is None:
+            with RedisCacheHolder.__lock:
+                provider = providers.get(provider_key)
+                if provider is None:
+                    log = logging.getLogger('RedisCacheHolder')
+                    log.info(f'Holder obtaining REDIS cache provider with options:{options}')
+                    auto_connect = cls.set_auto_connect(options)
+                    provider = held_type(options, auto_connect)
+                    providers[provider_key] = provider
+                    if RedisCacheHolder.__default is None and not per_thread:
+                        RedisCacheHolder.__default = provider
+        return provider
+
+    @staticmethod
+    def __held_providers(per_thread):
+        if not per_thread:
+            return RedisCacheHolder.__providers
+        if not hasattr(RedisCacheHolder.__thread_providers, 'providers'):
+            RedisCacheHolder.__thread_providers.providers = {}
+        return RedisCacheHolder.__thread_providers.providers
 
     @staticmethod
     def set_auto_connect(options):
@@ -27,6 +54,22 @@ class RedisCacheHolder:
             return True
         return options['AUTO_CONNECT']
 
+    @staticmethod
+    def client(read_only=False):
+        # cluster, sentinel primary or standalone client, read only hands out the replica client when configured
+        provider = RedisCacheHolder()
+        return provider.read_client if read_only else provider.redis_client
+
     @staticmethod
     def re_initialize():
-        RedisCacheHolder.__instance = None
+        RedisCacheHolder.__providers = {}
+        RedisCacheHolder.__thread_providers = threading.local()
+        RedisCacheHolder.__default = None
+
+    @staticmethod
+    def reset_after_fork():
+        RedisCacheHolder.__lock = threading.Lock()
+        RedisCacheHolder.re_initialize()
+
+
+register_reset_after_fork(RedisCacheHolder.reset_after_fork)
@@ -0,0 +1,14 @@
+def options_key(options):
+    if options is None:
+        return None
+    return tuple(sorted((name, _option_value_key(value)) for name, value in options.items()))
+
+
+def _option_value_key(value):
+    # lists & registries in options are not hashable, their repr identifies them well enough
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
@@ -0,0 +1,54 @@
+import time
+
+
+def payload_size(value):
+    if type(value) is str or type(value) is bytes:
+        return len(value)
+    if type(value) is dict:
+        return sum(payload_size(v) for v in value.values())
+    if type(value) is list:
+        return sum(payload_size(v) for v in value)
+    return None
+
+
+class InstrumentedValueCodec:
+
+    def __init__(self, codec, metrics):
+        self.codec = codec
+        self.metrics = metrics
+
+    def __getattr__(self, name):
+        return getattr(self.codec, name)
+
+    def serialize(self, key, value):
+        return self.__time_serialization('serialize', self.codec.serialize, key, value)
+
+    def serialize_values(self, values, custom_key=None):
+        return self.__time_serialization('serialize_values', self.codec.serialize_values, values, custom_key)
+
+    def serialize_value(self, value):
+        return self.__time_serialization('serialize_value', self.codec.serialize_value, value)
+
+    def deserialize(self, key, value, as_type=str):
+        return self.__time_deserialization('deserialize', value, self.codec.deserialize, key, value, as_type)
+
+    def deserialize_values(self, values, as_type=list):
+        return self.__time_deserialization('deserialize_values', values, self.codec.deserialize_values, values, as_type)
+
+    def deserialize_fields(self, fields, values, as_type=dict):
+        return self.__time_deserialization('deserialize_fields', values, self.codec.deserialize_fields, fields, values, as_type)
+
+    def deserialize_value_of_key(self, value_key, value):
+        return self.__time_deserialization('deserialize_value_of_key', value, self.codec.deserialize_value_of_key, value_key, value)
+
+    def __time_serialization(self, operation, serialize, *args):
+        start = time.perf_counter()
+        result = serialize(*args)
+        self.metrics.observe_serialization(operation, time.perf_counter() - start, payload_size(result))
+        return result
+
+    def __time_deserialization(self, operation, payload, deserialize, *args):
+        start = time.perf_counter()
+        result = deserialize(*args)
+        self.metrics.observe_serialization(operation, time.perf_counter() - start, payload_size(payload))
+        return result
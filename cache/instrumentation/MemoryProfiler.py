@@ -0,0 +1,114 @@
+import json
+import logging
+
+from cache.instrumentation.memory_profile_utility import key_prefix, listpack_limits, encoded_sizes, hash_encoded_sizes, \
+    COMPACT_ENCODINGS
+from cache.provider.RedisCacheProvider import DEFAULT_SCAN_COUNT
+from cache.utility.bytes_utility import as_text
+from cache.utility.collection_utility import chunk_iterable
+
+
+class MemoryProfiler:
+
+    # values of up to value_samples keys per prefix are read to measure alternative encodings
+    def __init__(self, provider, prefix_depth=1, value_samples=20, min_saving=0.1, max_large_hashes=100):
+        self.log = logging.getLogger('MemoryProfiler')
+        self.provider = provider
+        self.prefix_depth = prefix_depth
+        self.value_samples = value_samples
+        self.min_saving = min_saving
+        self.max_large_hashes = max_large_hashes
+
+    def profile(self, pattern='*', count=DEFAULT_SCAN_COUNT):
+        limits = listpack_limits(self.provider.redis_client)
+        prefixes = {}
+        large_hashes = []
+        for keys in chunk_iterable(self.provider.iter_keys(pattern, count), count):
+            self.profile_keys(keys, prefixes, large_hashes, limits)
+        large_hashes.sort(key=lambda large_hash: large_hash['memory_bytes'], reverse=True)
+        report = {
+            'pattern': pattern,
+            'prefix_depth': self.prefix_depth,
+            'keys': sum(stats['keys'] for stats in prefixes.values()),
+            'memory_bytes': sum(stats['memory_bytes'] for stats in prefixes.values()),
+            'listpack_limits': limits,
+            'prefixes': {prefix: self.summarize(stats) for prefix, stats in sorted(prefixes.items(), key=lambda item: -item[1]['memory_bytes'])},
+            'large_hashes': large_hashes[:self.max_large_hashes]
+        }
+        self.log.info(f'profiled {report["keys"]} keys matching:{pattern} using {report["memory_bytes"]} bytes')
+        return report
+
+    def profile_keys(self, keys, prefixes, large_hashes, limits):
+        pipeline = self.provider.read_client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.type(key)
+            pipeline.object('encoding', key)
+            pipeline.memory_usage(key)
+        # keys expiring in between are answered with errors, they are skipped
+        replies = pipeline.execute(raise_on_error=False)
+        profiled = []
+        for index, key in enumerate(keys):
+            (kind, encoding, memory) = replies[index * 3:index * 3 + 3]
+            if isinstance(memory, Exception) or memory is None or isinstance(encoding, Exception):
+                continue
+            prefix = key_prefix(key, self.prefix_depth)
+            stats = prefixes.setdefault(prefix, {'keys': 0, 'memory_bytes': 0, 'types': {}, 'encodings': {}, 'samples': 0, 'sampled_bytes': {}})
+            (kind, encoding) = (as_text(kind), as_text(encoding))
+            stats['keys'] += 1
+            stats['memory_bytes'] += memory
+            stats['types'][kind] = stats['types'].get(kind, 0) + 1
+            stats['encodings'][encoding] = stats['encodings'].get(encoding, 0) + 1
+            profiled.append((key, kind, encoding, memory, stats))
+        self.inspect_values(profiled, large_hashes, limits)
+
+    def inspect_values(self, profiled, large_hashes, limits):
+        pipeline = self.provider.read_client.pipeline(transaction=False)
+        queued = []
+        for (key, kind, encoding, memory, stats) in profiled:
+            large_hash = kind == 'hash' and encoding not in COMPACT_ENCODINGS
+            sampled = kind in ('string', 'hash') and stats['samples'] < self.value_samples
+            if large_hash:
+                pipeline.hlen(key)
+            if sampled:
+                stats['samples'] += 1
+                if kind == 'string':
+                    pipeline.get(key)
+                else:
+                    pipeline.hgetall(key)
+            queued.append((key, kind, memory, stats, large_hash, sampled))
+        replies = iter(pipeline.execute(raise_on_error=False))
+        for (key, kind, memory, stats, large_hash, sampled) in queued:
+            if large_hash:
+                fields = next(replies)
+                reason = 'entries' if isinstance(fields, int) and fields > limits['entries'] else 'value size'
+                large_hashes.append({'key': key, 'fields': fields if isinstance(fields, int) else None, 'memory_bytes': memory, 'reason': reason})
+            if sampled:
+                value = next(replies)
+                if isinstance(value, Exception) or value is None:
+                    continue
+                sizes = encoded_sizes(value) if kind == 'string' else hash_encoded_sizes(value)
+                for name, size in (sizes or {}).items():
+                    stats['sampled_bytes'][name] = stats['sampled_bytes'].get(name, 0) + size
+
+    def summarize(self, stats):
+        summary = {
+            'keys': stats['keys'],
+            'memory_bytes': stats['memory_bytes'],
+            'average_bytes': round(stats['memory_bytes'] / stats['keys']),
+            'types': stats['types'],
+            'encodings': stats['encodings'],
+            'sampled_keys': stats['samples'],
+            'sampled_json_bytes': stats['sampled_bytes'],
+            'suggested_encoding': None
+        }
+        sampled = stats['sampled_bytes']
+        if 'json' in sampled and len(sampled) > 1:
+            (best, best_bytes) = min(((name, size) for name, size in sampled.items() if name != 'json'), key=lambda item: item[1])
+            saving = 1 - best_bytes / sampled['json']
+            if saving >= self.min_saving:
+                summary['suggested_encoding'] = {'encoding': best, 'saving_ratio': round(saving, 3)}
+        return summary
+
+    @staticmethod
+    def to_json(report):
+        return json.dumps(report, indent=2)
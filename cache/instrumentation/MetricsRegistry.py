@@ -0,0 +1,101 @@
+import copy
+import threading
+from collections import defaultdict
+
+from cache.instrumentation.Histogram import Histogram, LATENCY_BUCKETS, SIZE_BUCKETS
+
+METRIC_PREFIX = 'automata_redis'
+
+
+def escape_label_value(value):
+    # exposition format label values escape backslash, double quote & line feed
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsRegistry:
+
+    def __init__(self, key_prefix_depth=0):
+        self.key_prefix_depth = key_prefix_depth
+        self.lock = threading.Lock()
+        self.calls = defaultdict(int)
+        self.errors = defaultdict(int)
+        self.call_durations = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.serialization_durations = defaultdict(lambda: Histogram(LATENCY_BUCKETS))
+        self.payload_sizes = defaultdict(lambda: Histogram(SIZE_BUCKETS))
+        self.hooks = []
+
+    def with_key_prefix_depth(self, key_prefix_depth):
+        # a view recording into the same metrics (and hooks) with its own key prefix depth
+        view = copy.copy(self)
+        view.key_prefix_depth = key_prefix_depth
+        return view
+
+    def add_hook(self, hook):
+        # hook(method, key, seconds, error) is called after every instrumented provider call
+        self.hooks.append(hook)
+
+    def key_prefix(self, key):
+        if self.key_prefix_depth == 0 or type(key) is not str:
+            return ''
+        return ':'.join(key.split(':')[:self.key_prefix_depth])
+
+    def observe_call(self, method, key, seconds, error=None):
+        labels = (method, self.key_prefix(key))
+        with self.lock:
+            self.calls[labels] += 1
+            if error is not None:
+                self.errors[labels] += 1
+            self.call_durations[labels].observe(seconds)
+        for hook in self.hooks:
+            hook(method, key, seconds, error)
+
+    def observe_serialization(self, operation, seconds, payload_bytes=None):
+        with self.lock:
+            self.serialization_durations[operation].observe(seconds)
+            if payload_bytes is not None:
+                self.payload_sizes[operation].observe(payload_bytes)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'calls': {f'{method}|{prefix}': count for (method, prefix), count in self.calls.items()},
+                'errors': {f'{method}|{prefix}': count for (method, prefix), count in self.errors.items()},
+                'call_seconds': {f'{method}|{prefix}': histogram.sum for (method, prefix), histogram in self.call_durations.items()},
+                'serialization_seconds': {operation: histogram.sum for operation, histogram in self.serialization_durations.items()},
+                'payload_bytes': {operation: histogram.sum for operation, histogram in self.payload_sizes.items()}
+            }
+
+    def to_prometheus(self):
+        lines = []
+        with self.lock:
+            self.__counter(lines, 'calls_total', 'provider calls', self.calls)
+            self.__counter(lines, 'errors_total', 'provider calls raising an error', self.errors)
+            self.__histogram(lines, 'call_duration_seconds', 'provider call latency', self.call_durations, ('method', 'prefix'))
+            self.__histogram(lines, 'serialization_duration_seconds', 'value (de)serialization time', self.serialization_durations, ('operation',))
+            self.__histogram(lines, 'payload_bytes', 'serialized payload size', self.payload_sizes, ('operation',))
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def __labels(names, values, extra=None):
+        values = values if type(values) is tuple else (values,)
+        pairs = [f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)]
+        if extra is not None:
+            pairs.append(extra)
+        return '{' + ','.join(pairs) + '}'
+
+    def __counter(self, lines, name, description, counters):
+        lines.append(f'# HELP {METRIC_PREFIX}_{name} {description}')
+        lines.append(f'# TYPE {METRIC_PREFIX}_{name} counter')
+        for labels, count in sorted(counters.items()):
+            lines.append(f'{METRIC_PREFIX}_{name}{self.__labels(("method", "prefix"), labels)} {count}')
+
+    def __histogram(self, lines, name, description, histograms, label_names):
+        lines.append(f'# HELP {METRIC_PREFIX}_{name} {description}')
+        lines.append(f'# TYPE {METRIC_PREFIX}_{name} histogram')
+        for labels, histogram in sorted(histograms.items()):
+            cumulative_counts = histogram.cumulative_counts()
+            for bound, count in zip(list(histogram.buckets) + ['+Inf'], cumulative_counts):
+                bucket_label = 'le="' + str(bound) + '"'
+                lines.append(f'{METRIC_PREFIX}_{name}_bucket{self.__labels(label_names, labels, bucket_label)} {count}')
+            lines.append(f'{METRIC_PREFIX}_{name}_sum{self.__labels(label_names, labels)} {histogram.sum}')
+            lines.append(f'{METRIC_PREFIX}_{name}_count{self.__labels(label_names, labels)} {histogram.count}')
@@ -0,0 +1,64 @@
+import functools
+import time
+
+from cache.instrumentation.MetricsRegistry import MetricsRegistry
+
+REDIS_METRICS = 'REDIS_METRICS'
+REDIS_METRICS_KEY_PREFIX_DEPTH = 'REDIS_METRICS_KEY_PREFIX_DEPTH'
+
+_default_registry = None
+
+
+def default_metrics_registry():
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = MetricsRegistry()
+    return _default_registry
+
+
+def metrics_from_options(options):
+    metrics = None if options is None else options.get(REDIS_METRICS)
+    if metrics is None or metrics is False:
+        return None
+    registry = metrics if isinstance(metrics, MetricsRegistry) else default_metrics_registry()
+    # the depth only applies to this provider's calls, the registry is shared
+    if REDIS_METRICS_KEY_PREFIX_DEPTH in options:
+        return registry.with_key_prefix_depth(int(options[REDIS_METRICS_KEY_PREFIX_DEPTH]))
+    return registry
+
+
+def instrumented(method):
+    # providers without metrics pay a single attribute check per call
+    @functools.wraps(method)
+    def record(self, *args, **kwargs):
+        if self.metrics is None:
+            return method(self, *args, **kwargs)
+        start = time.perf_counter()
+        error = None
+        try:
+            return method(self, *args, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            key = args[0] if len(args) > 0 else None
+            self.metrics.observe_call(method.__name__, key, time.perf_counter() - start, error)
+    return record
+
+
+def instrumented_async(method):
+    @functools.wraps(method)
+    async def record(self, *args, **kwargs):
+        if self.metrics is None:
+            return await method(self, *args, **kwargs)
+        start = time.perf_counter()
+        error = None
+        try:
+            return await method(self, *args, **kwargs)
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            key = args[0] if len(args) > 0 else None
+            self.metrics.observe_call(method.__name__, key, time.perf_counter() - start, error)
+    return record
@@ -0,0 +1,71 @@
+import redis
+
+from cache.serializer.serializer_utility import is_marked, dumps_marked, load_serializer, reader_for_marker
+from cache.utility.bytes_utility import as_text, as_bytes
+
+# hashes above either limit are converted from listpack to hashtable (redis < 7 names them ziplist)
+DEFAULT_LISTPACK_ENTRIES = 128
+DEFAULT_LISTPACK_VALUE = 64
+COMPACT_ENCODINGS = ('listpack', 'ziplist')
+
+JSON_HEADS = ('{', '[', ord('{'), ord('['))
+JSON_MARKERS = ('J', ord('J'))
+
+# alternatives a JSON value is measured against (when installed)
+CANDIDATE_SERIALIZERS = ['msgpack']
+CANDIDATE_COMPRESSIONS = ['zstd', 'lz4']
+
+
+def key_prefix(key, depth):
+    return ':'.join(key.split(':')[:depth])
+
+
+def listpack_limits(client):
+    try:
+        config = {as_text(name): as_text(value) for name, value in client.config_get('hash-max-*').items()}
+    except redis.exceptions.RedisError:
+        # CONFIG is often disabled on managed servers
+        config = {}
+    entries = config.get('hash-max-listpack-entries', config.get('hash-max-ziplist-entries', DEFAULT_LISTPACK_ENTRIES))
+    value = config.get('hash-max-listpack-value', config.get('hash-max-ziplist-value', DEFAULT_LISTPACK_VALUE))
+    return {'entries': int(entries), 'value': int(value)}
+
+
+def json_payload(value):
+    # JSON values (plain or marked) as text, None for anything else (binary payloads are never decoded)
+    if type(value) not in (str, bytes) or len(value) == 0:
+        return None
+    if is_marked(value):
+        return as_text(value[2:]) if value[1] in JSON_MARKERS else None
+    return as_text(value) if value[0] in JSON_HEADS else None
+
+
+def encoded_sizes(value):
+    # stored size of a JSON value as is and under each available alternative
+    payload = json_payload(value)
+    if payload is None:
+        return None
+    sizes = {'json': len(as_bytes(value))}
+    data = None
+    for name in CANDIDATE_SERIALIZERS:
+        try:
+            serializer = load_serializer(name)
+            data = reader_for_marker('J').loads(payload) if data is None else data
+            sizes[name] = len(as_bytes(dumps_marked(serializer, data)))
+        except (ImportError, ValueError, TypeError):
+            continue
+    for name in CANDIDATE_COMPRESSIONS:
+        try:
+            # compression is only kept when smaller (see ValueCodec.compress)
+            sizes[name] = min(len(as_bytes(dumps_marked(load_serializer(name), payload))), sizes['json'])
+        except ImportError:
+            continue
+    return sizes
+
+
+def hash_encoded_sizes(values: dict):
+    sizes = {}
+    for value in values.values():
+        for name, size in (encoded_sizes(value) or {}).items():
+            sizes[name] = sizes.get(name, 0) + size
+    return sizes if len(sizes) > 0 else None
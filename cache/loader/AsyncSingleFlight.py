@@ -0,0 +1,25 @@
+import asyncio
+
+
+class AsyncSingleFlight:
+
+    # concurrent calls for the same key share the result (or error) of the first one
+    def __init__(self):
+        self.flights = {}
+
+    async def run(self, key, function):
+        if key not in self.flights:
+            self.flights[key] = asyncio.ensure_future(self.fly(key, function))
+        # a cancelled caller must not cancel the load the others wait on
+        return await asyncio.shield(self.flights[key])
+
+    def run_in_background(self, key, function):
+        if key not in self.flights:
+            self.flights[key] = asyncio.ensure_future(self.fly(key, function))
+        return self.flights[key]
+
+    async def fly(self, key, function):
+        try:
+            return await function()
+        finally:
+            del self.flights[key]
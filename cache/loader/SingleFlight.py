@@ -0,0 +1,38 @@
+import concurrent.futures
+import threading
+
+
+class SingleFlight:
+
+    # concurrent calls for the same key share the result (or error) of the first one
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.flights = {}
+
+    def join(self, key):
+        with self.lock:
+            if key in self.flights:
+                return self.flights[key], False
+            flight = self.flights[key] = concurrent.futures.Future()
+            return flight, True
+
+    def run(self, key, function):
+        (flight, leader) = self.join(key)
+        if leader:
+            self.fly(key, flight, function)
+        return flight.result()
+
+    def run_in_background(self, key, function):
+        (flight, leader) = self.join(key)
+        if leader:
+            threading.Thread(target=self.fly, args=(key, flight, function), name='cache-refresh', daemon=True).start()
+        return flight
+
+    def fly(self, key, flight, function):
+        try:
+            flight.set_result(function())
+        except Exception as error:
+            flight.set_exception(error)
+        finally:
+            with self.lock:
+                del self.flights[key]
@@ -0,0 +1,33 @@
+REDIS_LOAD_LOCK_TTL = 'REDIS_LOAD_LOCK_TTL'
+REDIS_LOAD_WAIT_INTERVAL = 'REDIS_LOAD_WAIT_INTERVAL'
+
+DEFAULT_LOAD_LOCK_TTL = 5
+DEFAULT_LOAD_WAIT_INTERVAL = 0.05
+
+LOAD_LOCK_SUFFIX = ':load-lock'
+
+
+def load_lock_ttl_from_options(options):
+    return float(options.get(REDIS_LOAD_LOCK_TTL, DEFAULT_LOAD_LOCK_TTL)) if options is not None else DEFAULT_LOAD_LOCK_TTL
+
+
+def load_wait_interval_from_options(options):
+    return float(options.get(REDIS_LOAD_WAIT_INTERVAL, DEFAULT_LOAD_WAIT_INTERVAL)) if options is not None else DEFAULT_LOAD_WAIT_INTERVAL
+
+
+def load_lock_key(key):
+    return f'{key}{LOAD_LOCK_SUFFIX}'
+
+
+def stored_ttl(ttl, stale_ttl):
+    # a stale value is kept (and served while refreshing) for stale_ttl past its ttl
+    if ttl is None:
+        return None
+    return ttl + (stale_ttl or 0)
+
+
+def refresh_window(ttl, refresh_ahead, stale_ttl):
+    # remaining expiry (seconds) from which a served value is refreshed in the background
+    if ttl is None or (refresh_ahead is None and stale_ttl is None):
+        return None
+    return (refresh_ahead or 0) + (stale_ttl or 0)
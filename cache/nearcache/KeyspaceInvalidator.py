@@ -0,0 +1,57 @@
+import logging
+import threading
+
+import redis
+
+from cache.utility.bytes_utility import as_text
+
+
+# fallback invalidation on keyspace notifications, server requires 'notify-keyspace-events' (e.g. 'KA')
+class KeyspaceInvalidator:
+
+    def __init__(self, redis_client, near_cache, prefixes=None, db=0, reconnect_delay=1.0):
+        self.log = logging.getLogger('KeyspaceInvalidator')
+        self.redis_client = redis_client
+        self.near_cache = near_cache
+        self.channel_prefix = f'__keyspace@{db}__:'
+        self.patterns = [f'{self.channel_prefix}{prefix}*' for prefix in (prefixes or [''])]
+        self.reconnect_delay = reconnect_delay
+        self.pubsub = None
+        self.stopped = threading.Event()
+        self.subscribed = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='near-cache-keyspace', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(timeout=self.reconnect_delay * 2)
+        self.__close()
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                self.pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                self.pubsub.psubscribe(*self.patterns)
+                self.near_cache.invalidate_all()
+                self.subscribed.set()
+                while not self.stopped.is_set():
+                    message = self.pubsub.get_message(timeout=self.reconnect_delay)
+                    if message is not None:
+                        self.on_message(message)
+            except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError, OSError) as error:
+                self.log.warning(f'keyspace subscription lost, flushing near cache [{error}]')
+                self.subscribed.clear()
+                self.near_cache.invalidate_all()
+                self.__close()
+                self.stopped.wait(self.reconnect_delay)
+
+    def on_message(self, message):
+        channel = as_text(message['channel'])
+        self.near_cache.invalidate(channel[len(self.channel_prefix):])
+
+    def __close(self):
+        if self.pubsub is not None:
+            self.pubsub.close()
+            self.pubsub = None
@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class NearCache:
+
+    def __init__(self, max_size=10000, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # bumped on every invalidation, loads that raced an invalidation of their key are not cached
+        self.epoch = 0
+        # epoch of the latest invalidation per key (the oldest are forgotten beyond max_size)
+        self.invalidated = OrderedDict()
+        # loads started before this epoch are not cached at all (invalidate_all or forgotten invalidations)
+        self.cleared_epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or self.__expired(entry):
+                self.misses += 1
+                return MISSING
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_or_load(self, key, loader):
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+        epoch = self.epoch
+        value = loader()
+        self.put(key, value, epoch)
+        return value
+
+    def get_or_load_field(self, key, field, loader):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and not self.__expired(entry) and field in entry[0]:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0][field]
+            self.misses += 1
+            epoch = self.epoch
+        value = loader()
+        with self.lock:
+            if self.__raced(key, epoch):
+                return value
+            entry = self.entries.get(key)
+            if entry is None or self.__expired(entry):
+                self.__put({field: value}, key)
+            else:
+                entry[0][field] = value
+                self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value, epoch=None, ttl=None):
+        with self.lock:
+            if epoch is not None and self.__raced(key, epoch):
+                return
+            self.__put(value, key, ttl)
+
+    def invalidate(self, key):
+        with self.lock:
+            self.epoch += 1
+            self.invalidated[key] = self.epoch
+            self.invalidated.move_to_end(key)
+            if len(self.invalidated) > self.max_size:
+                self.cleared_epoch = self.invalidated.popitem(last=False)[1]
+            if self.entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_all(self):
+        with self.lock:
+            self.epoch += 1
+            self.cleared_epoch = self.epoch
+            self.invalidated.clear()
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'size': len(self.entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+    def __put(self, value, key, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = None if ttl is None else time.monotonic() + ttl
+        self.entries[key] = (value, expires_at)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def __raced(self, key, epoch):
+        return epoch < self.cleared_epoch or self.invalidated.get(key, 0) > epoch
+
+    @staticmethod
+    def __expired(entry):
+        return entry[1] is not None and entry[1] <= time.monotonic()
@@ -0,0 +1,79 @@
+import logging
+import threading
+
+import redis
+
+from cache.utility.bytes_utility import as_text
+
+INVALIDATE_CHANNEL = '__redis__:invalidate'
+
+
+# server-assisted invalidation: CLIENT TRACKING (BCAST) redirected to a dedicated connection (RESP2 redirect mode)
+class TrackingInvalidator:
+
+    def __init__(self, connection_pool, near_cache, prefixes=None, reconnect_delay=1.0):
+        self.log = logging.getLogger('TrackingInvalidator')
+        self.connection_pool = connection_pool
+        self.near_cache = near_cache
+        self.prefixes = prefixes or []
+        self.reconnect_delay = reconnect_delay
+        self.connection = None
+        self.stopped = threading.Event()
+        self.subscribed = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='near-cache-tracking', daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(timeout=self.reconnect_delay * 2)
+        self.__disconnect()
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                self.__subscribe()
+                while not self.stopped.is_set():
+                    if self.connection.can_read(timeout=self.reconnect_delay):
+                        self.on_message(self.connection.read_response())
+            except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError, OSError) as error:
+                self.log.warning(f'tracking connection lost, flushing near cache [{error}]')
+                self.subscribed.clear()
+                # without a live tracking connection any entry may be stale
+                self.near_cache.invalidate_all()
+                self.__disconnect()
+                self.stopped.wait(self.reconnect_delay)
+
+    def on_message(self, message):
+        if type(message) is not list or len(message) < 3 or as_text(message[0]) != 'message':
+            return
+        keys = message[2]
+        if keys is None:
+            self.near_cache.invalidate_all()
+            return
+        for key in keys:
+            self.near_cache.invalidate(as_text(key))
+
+    def __subscribe(self):
+        # built outside the pool, a redirect connection must not hold one of its slots
+        self.connection = self.connection_pool.connection_class(**self.connection_pool.connection_kwargs)
+        self.connection.connect()
+        self.connection.send_command('CLIENT', 'ID')
+        client_id = self.connection.read_response()
+        tracking_args = ['CLIENT', 'TRACKING', 'ON', 'REDIRECT', client_id, 'BCAST']
+        for prefix in self.prefixes:
+            tracking_args.extend(['PREFIX', prefix])
+        self.connection.send_command(*tracking_args)
+        self.connection.read_response()
+        self.connection.send_command('SUBSCRIBE', INVALIDATE_CHANNEL)
+        self.connection.read_response()
+        # anything cached before tracking was active was never covered by invalidation
+        self.near_cache.invalidate_all()
+        self.subscribed.set()
+        self.log.info(f'tracking invalidation subscribed for prefixes:{self.prefixes}')
+
+    def __disconnect(self):
+        if self.connection is not None:
+            self.connection.disconnect()
+            self.connection = None
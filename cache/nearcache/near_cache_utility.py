@@ -0,0 +1,40 @@
+from cache.nearcache.KeyspaceInvalidator import KeyspaceInvalidator
+from cache.nearcache.NearCache import NearCache
+from cache.nearcache.TrackingInvalidator import TrackingInvalidator
+
+REDIS_NEAR_CACHE = 'REDIS_NEAR_CACHE'
+REDIS_NEAR_CACHE_MAX_SIZE = 'REDIS_NEAR_CACHE_MAX_SIZE'
+REDIS_NEAR_CACHE_TTL = 'REDIS_NEAR_CACHE_TTL'
+REDIS_NEAR_CACHE_PREFIXES = 'REDIS_NEAR_CACHE_PREFIXES'
+REDIS_NEAR_CACHE_INVALIDATION = 'REDIS_NEAR_CACHE_INVALIDATION'
+
+TRACKING_INVALIDATION = 'tracking'
+KEYSPACE_INVALIDATION = 'keyspace'
+
+DEFAULT_NEAR_CACHE_MAX_SIZE = 10000
+
+
+def near_cache_enabled(options):
+    return options is not None and options.get(REDIS_NEAR_CACHE, False) is True
+
+
+def near_cache_prefixes(options):
+    prefixes = options.get(REDIS_NEAR_CACHE_PREFIXES, [])
+    if type(prefixes) is str:
+        return [prefix.strip() for prefix in prefixes.split(',') if len(prefix.strip()) > 0]
+    return list(prefixes)
+
+
+def build_near_cache(options, redis_client):
+    max_size = int(options.get(REDIS_NEAR_CACHE_MAX_SIZE, DEFAULT_NEAR_CACHE_MAX_SIZE))
+    ttl = float(options[REDIS_NEAR_CACHE_TTL]) if REDIS_NEAR_CACHE_TTL in options else None
+    near_cache = NearCache(max_size, ttl)
+    prefixes = near_cache_prefixes(options)
+    invalidation = options.get(REDIS_NEAR_CACHE_INVALIDATION, TRACKING_INVALIDATION)
+    if invalidation == KEYSPACE_INVALIDATION:
+        db = redis_client.connection_pool.connection_kwargs.get('db', 0)
+        invalidator = KeyspaceInvalidator(redis_client, near_cache, prefixes, db)
+    else:
+        invalidator = TrackingInvalidator(redis_client.connection_pool, near_cache, prefixes)
+    invalidator.start()
+    return near_cache, invalidator
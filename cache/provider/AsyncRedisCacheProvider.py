@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import uuid
+from typing import TypeVar
+
+import redis
+import redis.asyncio as redis_asyncio
+
+from cache.codec.ValueCodec import ValueCodec
+from cache.instrumentation.InstrumentedValueCodec import InstrumentedValueCodec
+from cache.instrumentation.instrumentation_utility import metrics_from_options, instrumented_async
+from cache.loader.AsyncSingleFlight import AsyncSingleFlight
+from cache.loader.loader_utility import load_lock_ttl_from_options, load_wait_interval_from_options, load_lock_key, stored_ttl, \
+    refresh_window
+from cache.nearcache.NearCache import MISSING
+from cache.provider.RedisCacheProvider import DEFAULT_SCAN_COUNT
+from cache.script.script_utility import RELEASE_LOCK_SCRIPT
+from cache.subscriber.change_utility import publish_changes_enabled, change_channel_prefix, change_channel, change_message
+from cache.utility.bytes_utility import as_text
+from cache.utility.connection_pool_utility import create_async_connection_pool
+from cache.utility.expiry_utility import default_ttl_from_options, effective_ttl, expiry_arguments, expiry_milliseconds, \
+    queue_set_many
+from cache.utility.options_utility import REDIS_SERVER_ADDRESS, REDIS_SERVER_PORT, REDIS_UNIX_SOCKET_PATH, check_options
+from cache.writebehind.AsyncWriteBehindBuffer import AsyncWriteBehindBuffer
+from cache.writebehind.write_behind_utility import write_behind_enabled, build_write_behind, queue_buffered_writes, RETRIED_FLUSH_ERRORS
+
+T = TypeVar("T")
+
+
+class AsyncRedisCacheProvider:
+
+    def __init__(self, options, auto_connect=True):
+        self.log = logging.getLogger('AsyncRedisCacheProvider')
+        self.options = options
+        self.auto_connect = auto_connect
+        check_options(self.log, self.options, self.auto_connect)
+        self.metrics = metrics_from_options(options)
+        self.codec = ValueCodec.from_options(options)
+        if self.metrics is not None:
+            self.codec = InstrumentedValueCodec(self.codec, self.metrics)
+        self.default_ttl = default_ttl_from_options(options)
+        self.publish_changes = publish_changes_enabled(options)
+        self.change_channel_prefix = change_channel_prefix(options)
+        self.load_lock_ttl = load_lock_ttl_from_options(options)
+        self.load_wait_interval = load_wait_interval_from_options(options)
+        self.single_flight = AsyncSingleFlight()
+        self.release_lock_script = None
+        self.write_buffer = build_write_behind(options, AsyncWriteBehindBuffer, self.flush) if write_behind_enabled(options) else None
+        if self.auto_connect:
+            self.server_address = options.get(REDIS_UNIX_SOCKET_PATH, options.get(REDIS_SERVER_ADDRESS))
+            self.server_port = options.get(REDIS_SERVER_PORT)
+            self.log.info(f'Connecting (async) to REDIS server {self.server_address}:{self.server_port}')
+            self.redis_client = redis_asyncio.Redis(connection_pool=create_async_connection_pool(options))
+
+    async def can_connect(self):
+        try:
+            return await self.redis_client.ping()
+        except (redis.exceptions.ConnectionError, OSError):
+            return False
+
+    async def close(self):
+        # buffered writes are flushed on close, there is no flush on exit without a running loop
+        if self.write_buffer is not None:
+            await self.write_buffer.stop()
+        await self.redis_client.close(close_connection_pool=True)
+
+    @instrumented_async
+    async def flush(self):
+        # sends the writes buffered in write behind mode in one pipeline, returns the number of writes
+        if self.write_buffer is None:
+            return 0
+        async with self.write_buffer.flush_lock:
+            (values, fields) = self.write_buffer.drain()
+            if len(values) == 0 and len(fields) == 0:
+                return 0
+            # drained writes are read from the buffer until the pipeline has executed
+            try:
+                await self.write_buffered(values, fields)
+            except RETRIED_FLUSH_ERRORS:
+                self.write_buffer.restore(values, fields)
+                raise
+            finally:
+                self.write_buffer.flushed()
+        return len(values) + sum(len(key_fields) for (key_fields, _) in fields.values())
+
+    async def write_buffered(self, values, fields):
+        async with self.redis_client.pipeline(transaction=False) as pipeline:
+            queue_buffered_writes(pipeline, values, fields)
+            for key in values.keys():
+                self.publish_change(pipeline, key, 'set')
+            for key, (key_fields, _) in fields.items():
+                for field in key_fields.keys():
+                    self.publish_change(pipeline, key, 'hset', field)
+            await pipeline.execute()
+
+    async def flush_buffered_writes(self):
+        # writes that bypass the buffer, and reads the buffer cannot answer, go out after the buffered writes
+        if self.write_buffer is not None and self.write_buffer.busy():
+            await self.flush()
+
+    def buffered_value(self, key, field=None):
+        # a value written in write behind mode is read from the buffer until it is flushed, MISSING otherwise
+        if self.write_buffer is None:
+            return MISSING
+        value = self.write_buffer.pending_value(key) if field is None else self.write_buffer.pending_field(key, field)
+        # numbers are buffered as given, redis answers them as text
+        return value if value is MISSING or type(value) in (str, bytes) else str(value)
+
+    def buffered_values(self, key_fields, values):
+        if self.write_buffer is None or not self.write_buffer.busy():
+            return values
+        buffered_values = [self.buffered_value(*key_field) for key_field in key_fields]
+        return [value if buffered_value is MISSING else buffered_value for value, buffered_value in zip(values, buffered_values)]
+
+    def publish_change(self, pipeline, key, operation, field=None):
+        # queued next to the write so subscribers hear about it in the same round trip
+        if self.publish_changes:
+            pipeline.publish(change_channel(self.change_channel_prefix, key), change_message(operation, field))
+
+    @instrumented_async
+    async def get_keys(self, pattern='*'):
+        # SCAN may report a key more than once, keep first occurrence only
+        return list(dict.fromkeys([key async for key in self.iter_keys(pattern)]))
+
+    async def iter_keys(self, pattern='*', count=DEFAULT_SCAN_COUNT):
+        await self.flush_buffered_writes()
+        cursor = None
+        while cursor != 0:
+            (cursor, keys) = await self.redis_client.scan(cursor or 0, match=pattern, count=count)
+            for key in keys:
+                yield as_text(key)
+
+    @instrumented_async
+    async def store(self, key, value, ttl=None):
+        self.log.debug('storing for key:%s', key)
+        expiry = expiry_arguments(effective_ttl(ttl, self.default_ttl))
+        if self.write_buffer is not None:
+            self.write_buffer.put(key, self.codec.serialize(key, value), expiry)
+            return
+        if self.publish_changes:
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                pipeline.set(key, self.codec.serialize(key, value), **expiry)
+                self.publish_change(pipeline, key, 'set')
+                await pipeline.execute()
+        else:
+            await self.redis_client.set(key, self.codec.serialize(key, value), **expiry)
+
+    @instrumented_async
+    async def store_many(self, values: dict, ttl=None):
+        self.log.debug('storing many for keys:%s', values.keys())
+        serialized_values = {key: self.codec.serialize(key, value) for key, value in values.items()}
+        if len(serialized_values) == 0:
+            return
+        expiry = expiry_arguments(effective_ttl(ttl, self.default_ttl))
+        if self.write_buffer is not None:
+            for key, value in serialized_values.items():
+                self.write_buffer.put(key, value, expiry)
+            return
+        if self.publish_changes or len(expiry) > 0:
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                queue_set_many(pipeline, serialized_values, expiry)
+                for key in serialized_values.keys():
+                    self.publish_change(pipeline, key, 'set')
+                await pipeline.execute()
+        else:
+            await self.redis_client.mset(serialized_values)
+
+    @instrumented_async
+    async def refresh_expiry(self, keys, ttl=None):
+        ttl = effective_ttl(ttl, self.default_ttl)
+        if len(keys) == 0 or ttl is None:
+            return 0
+        await self.flush_buffered_writes()
+        async with self.redis_client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.pexpire(key, expiry_milliseconds(ttl))
+            return sum(await pipeline.execute())
+
+    @instrumented_async
+    async def time_to_live(self, key):
+        await self.flush_buffered_writes()
+        milliseconds = await self.redis_client.pttl(key)
+        return None if milliseconds < 0 else milliseconds / 1000
+
+    @instrumented_async
+    async def fetch(self, key, as_type: T = str):
+        value = self.buffered_value(key)
+        if value is MISSING:
+            value = await self.redis_client.get(key)
+        return self.codec.deserialize(key, value, as_type)
+
+    @instrumented_async
+    async def fetch_many(self, keys, as_type: T = str):
+        if len(keys) == 0:
+            return []
+        as_types = as_type if type(as_type) is list else [as_type] * len(keys)
+        values = self.buffered_values([(key,) for key in keys], await self.redis_client.mget(keys))
+        return [self.codec.deserialize(key, value, value_type) for key, value, value_type in zip(keys, values, as_types)]
+
+    async def fetch_with_expiry(self, key, as_type: T = str):
+        await self.flush_buffered_writes()
+        async with self.redis_client.pipeline(transaction=False) as pipeline:
+            pipeline.get(key)
+            pipeline.pttl(key)
+            (value, milliseconds) = await pipeline.execute()
+        return self.codec.deserialize(key, value, as_type), None if milliseconds < 0 else milliseconds / 1000
+
+    @instrumented_async
+    async def get_or_load(self, key, loader, ttl=None, as_type: T = str, refresh_ahead=None, stale_ttl=None):
+        # see RedisCacheProvider.get_or_load, loader is a coroutine function
+        return await self.load_through(key, loader, lambda: self.fetch(key, as_type), lambda: self.fetch_with_expiry(key, as_type),
+                                       lambda value, value_ttl: self.store(key, value, value_ttl), ttl, refresh_ahead, stale_ttl)
+
+    async def load_through(self, key, loader, read, read_with_expiry, write, ttl, refresh_ahead, stale_ttl):
+        ttl = effective_ttl(ttl, self.default_ttl)
+        window = refresh_window(ttl, refresh_ahead, stale_ttl)
+        if window is None:
+            value = await read()
+        else:
+            (value, remaining) = await read_with_expiry()
+            if value is not None and remaining is not None and remaining <= window:
+                refresh = lambda: self.refresh(key, loader, write, stored_ttl(ttl, stale_ttl))
+                self.single_flight.run_in_background((key, 'refresh'), refresh)
+        if value is not None:
+            return value
+        return await self.single_flight.run(key, lambda: self.load(key, loader, read, write, stored_ttl(ttl, stale_ttl)))
+
+    async def load(self, key, loader, read, write, ttl):
+        token = await self.acquire_load_lock(key)
+        while token is None:
+            # another process is loading, its value is picked up (its lock expires should it fail)
+            await asyncio.sleep(self.load_wait_interval)
+            value = await read()
+            if value is not None:
+                return value
+            token = await self.acquire_load_lock(key)
+        try:
+            return await self.write_loaded(await loader(), write, ttl)
+        finally:
+            await self.release_load_lock(key, token)
+
+    async def refresh(self, key, loader, write, ttl):
+        token = await self.acquire_load_lock(key)
+        if token is None:
+            return None
+        try:
+            return await self.write_loaded(await loader(), write, ttl)
+        except Exception as error:
+            self.log.warning(f'refreshing key:{key} failed, serving current value [{error}]')
+        finally:
+            await self.release_load_lock(key, token)
+
+    async def write_loaded(self, value, write, ttl):
+        if value is not None:
+            await write(value, ttl)
+            # waiting processes poll for the value, it is not left in the write behind buffer
+            await self.flush_buffered_writes()
+        return value
+
+    async def acquire_load_lock(self, key):
+        token = uuid.uuid4().hex
+        acquired = await self.redis_client.set(load_lock_key(key), token, nx=True, px=expiry_milliseconds(self.load_lock_ttl))
+        return token if acquired else None
+
+    async def release_load_lock(self, key, token):
+        if self.release_lock_script is None:
+            self.release_lock_script = self.redis_client.register_script(RELEASE_LOCK_SCRIPT)
+        await self.release_lock_script(keys=[load_lock_key(key)], args=[token])
+
+    @instrumented_async
+    async def delete(self, key):
+        if self.write_buffer is not None:
+            self.write_buffer.discard(key)
+        if self.publish_changes:
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                pipeline.delete(key)
+                self.publish_change(pipeline, key, 'del')
+                return (await pipeline.execute())[0]
+        return await self.redis_client.delete(key)
+
+    @instrumented_async
+    async def delete_many(self, keys):
+        if len(keys) == 0:
+            return 0
+        if self.write_buffer is not None:
+            self.write_buffer.discard(*keys)
+        async with self.redis_client.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.delete(key)
+            for key in keys:
+                self.publish_change(pipeline, key, 'del')
+            return sum((await pipeline.execute())[:len(keys)])
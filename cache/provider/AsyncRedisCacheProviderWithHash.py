@@ -0,0 +1,125 @@
+from typing import TypeVar
+
+from cache.codec.ValueCodec import ValueCodec
+from cache.instrumentation.instrumentation_utility import instrumented_async
+from cache.nearcache.NearCache import MISSING
+from cache.provider.AsyncRedisCacheProvider import AsyncRedisCacheProvider
+from cache.provider.RedisCacheProvider import DEFAULT_SCAN_COUNT
+from cache.provider.RedisCacheProviderWithHash import REDIS_VALUES_STORE_CHUNK_SIZE, DEFAULT_VALUES_STORE_CHUNK_SIZE
+from cache.utility.collection_utility import chunk_mapping
+from cache.utility.expiry_utility import effective_ttl, expiry_milliseconds
+
+T = TypeVar("T")
+
+
+class AsyncRedisCacheProviderWithHash(AsyncRedisCacheProvider):
+
+    def __init__(self, options, auto_connect=True):
+        super().__init__(options, auto_connect)
+        self.values_store_chunk_size = int(options.get(REDIS_VALUES_STORE_CHUNK_SIZE, DEFAULT_VALUES_STORE_CHUNK_SIZE))
+
+    @instrumented_async
+    async def values_store(self, key, values, custom_key=None, atomic=False, ttl=None):
+        self.log.debug('storing values for key:%s', key)
+        serialized_values = self.codec.serialize_values(values, custom_key)
+        if len(serialized_values) == 0:
+            return
+        await self.flush_buffered_writes()
+        async with self.redis_client.pipeline(transaction=atomic) as pipeline:
+            for chunk in chunk_mapping(serialized_values, self.values_store_chunk_size):
+                pipeline.hset(key, mapping=chunk)
+            self.queue_expire(pipeline, key, ttl)
+            self.publish_change(pipeline, key, 'hset')
+            await pipeline.execute()
+
+    def queue_expire(self, pipeline, key, ttl):
+        # hash expiry is key level, it is refreshed by every write to the hash
+        ttl = effective_ttl(ttl, self.default_ttl)
+        if ttl is not None:
+            pipeline.pexpire(key, expiry_milliseconds(ttl))
+
+    @instrumented_async
+    async def values_set_value(self, key, value_key, value, ttl=None):
+        if self.write_buffer is not None:
+            ttl = effective_ttl(ttl, self.default_ttl)
+            self.write_buffer.put_field(key, value_key, self.codec.serialize_value(value), None if ttl is None else expiry_milliseconds(ttl))
+            return
+        if self.publish_changes or effective_ttl(ttl, self.default_ttl) is not None:
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                pipeline.hset(key, value_key, self.codec.serialize_value(value))
+                self.queue_expire(pipeline, key, ttl)
+                self.publish_change(pipeline, key, 'hset', value_key)
+                await pipeline.execute()
+        else:
+            await self.redis_client.hset(key, value_key, self.codec.serialize_value(value))
+
+    @instrumented_async
+    async def values_get_value(self, key, value_key):
+        value = self.buffered_value(key, value_key)
+        if value is MISSING:
+            value = await self.redis_client.hget(key, value_key)
+        return self.codec.deserialize_value_of_key(value_key, value)
+
+    @instrumented_async
+    async def values_delete_value(self, key, value_key):
+        if self.write_buffer is not None:
+            self.write_buffer.discard_field(key, value_key)
+        if self.publish_changes:
+            async with self.redis_client.pipeline(transaction=False) as pipeline:
+                pipeline.hdel(key, value_key)
+                self.publish_change(pipeline, key, 'hdel', value_key)
+                await pipeline.execute()
+        else:
+            await self.redis_client.hdel(key, value_key)
+
+    @instrumented_async
+    async def values_fetch(self, key, as_type: T = list, lazy=False):
+        self.log.debug('fetching values for key:%s', key)
+        await self.flush_buffered_writes()
+        values = await self.redis_client.hgetall(key)
+        if lazy and as_type is dict:
+            return self.codec.lazy_values(values)
+        return self.codec.deserialize_values(values, as_type)
+
+    async def values_fetch_with_expiry(self, key, as_type: T = list):
+        await self.flush_buffered_writes()
+        async with self.redis_client.pipeline(transaction=False) as pipeline:
+            pipeline.hgetall(key)
+            pipeline.pttl(key)
+            (values, milliseconds) = await pipeline.execute()
+        return self.fetch_loaded_values(values, as_type), None if milliseconds < 0 else milliseconds / 1000
+
+    def fetch_loaded_values(self, values, as_type):
+        # an empty hash does not exist, it reads as missing
+        return None if len(values) == 0 else self.codec.deserialize_values(values, as_type)
+
+    @instrumented_async
+    async def values_get_or_load(self, key, loader, ttl=None, as_type: T = list, custom_key=None, refresh_ahead=None, stale_ttl=None):
+        # get_or_load for hashes, loader returns the values for values_store
+        async def read():
+            await self.flush_buffered_writes()
+            return self.fetch_loaded_values(await self.redis_client.hgetall(key), as_type)
+        write = lambda values, values_ttl: self.values_store(key, values, custom_key, atomic=True, ttl=values_ttl)
+        return await self.load_through(key, loader, read, lambda: self.values_fetch_with_expiry(key, as_type), write, ttl, refresh_ahead, stale_ttl)
+
+    @instrumented_async
+    async def values_fetch_fields(self, key, fields, as_type: T = dict):
+        self.log.debug('fetching values for key:%s fields:%s', key, fields)
+        if len(fields) == 0:
+            return {} if as_type is dict else []
+        values = self.buffered_values([(key, field) for field in fields], await self.redis_client.hmget(key, fields))
+        return self.codec.deserialize_fields(fields, values, as_type)
+
+    async def iter_values(self, key, as_type: T = list, pattern='*', count=DEFAULT_SCAN_COUNT):
+        self.log.debug('iterating values for key:%s', key)
+        await self.flush_buffered_writes()
+        cursor = None
+        while cursor != 0:
+            (cursor, values) = await self.redis_client.hscan(key, cursor or 0, match=pattern, count=count)
+            deserialized_values = self.codec.deserialize_values(values, as_type)
+            for value in (deserialized_values.items() if type(deserialized_values) is dict else deserialized_values):
+                yield value
+
+    @staticmethod
+    def deserialize_value(value):
+        return ValueCodec.deserialize_value(value)
@@ -1,16 +1,33 @@
 import logging
+import time
+import uuid
 from typing import TypeVar
 
 import redis
-from core.constants.not_available import NOT_AVAILABLE
-from core.number.BigFloat import BigFloat
-from core.options.exception.MissingOptionError import MissingOptionError
-from coreutility.json.json_utility import as_json, as_pretty_json
+
+from cache.codec.ValueCodec import ValueCodec
+from cache.instrumentation.InstrumentedValueCodec import InstrumentedValueCodec
+from cache.instrumentation.instrumentation_utility import metrics_from_options, instrumented
+from cache.loader.SingleFlight import SingleFlight
+from cache.loader.loader_utility import load_lock_ttl_from_options, load_wait_interval_from_options, load_lock_key, stored_ttl, \
+    refresh_window
+from cache.nearcache.NearCache import MISSING
+from cache.nearcache.near_cache_utility import near_cache_enabled, build_near_cache
+from cache.script.RedisScripts import RedisScripts
+from cache.snapshot.snapshot_utility import write_snapshot_header, write_string_entry, write_hash_entry, read_snapshot, queue_snapshot_entries
+from cache.subscriber.change_utility import publish_changes_enabled, change_channel_prefix, change_channel, change_message
+from cache.utility.bytes_utility import as_text
+from cache.utility.collection_utility import chunk_iterable
+from cache.utility.expiry_utility import default_ttl_from_options, effective_ttl, expiry_arguments, expiry_milliseconds, \
+    queue_set_many
+from cache.utility.options_utility import REDIS_SERVER_ADDRESS, REDIS_SERVER_PORT, REDIS_UNIX_SOCKET_PATH, check_options
+from cache.utility.topology_utility import get_clients, is_cluster
+from cache.writebehind.WriteBehindBuffer import WriteBehindBuffer
+from cache.writebehind.write_behind_utility import write_behind_enabled, build_write_behind, queue_buffered_writes, RETRIED_FLUSH_ERRORS
 
 T = TypeVar("T")
 
-REDIS_SERVER_ADDRESS = 'REDIS_SERVER_ADDRESS'
-REDIS_SERVER_PORT = 'REDIS_SERVER_PORT'
+DEFAULT_SCAN_COUNT = 1000
 
 
 class RedisCacheProvider:
@@ -20,23 +37,133 @@ class RedisCacheProvider:
         self.options = options
         self.auto_connect = auto_connect
         self.__check_options()
+        self.metrics = metrics_from_options(options)
+        self.codec = ValueCodec.from_options(options)
+        if self.metrics is not None:
+            self.codec = InstrumentedValueCodec(self.codec, self.metrics)
+        self.default_ttl = default_ttl_from_options(options)
+        self.publish_changes = publish_changes_enabled(options)
+        self.change_channel_prefix = change_channel_prefix(options)
+        self.cluster = is_cluster(options)
+        self.load_lock_ttl = load_lock_ttl_from_options(options)
+        self.load_wait_interval = load_wait_interval_from_options(options)
+        self.single_flight = SingleFlight()
+        self.replica_client = None
+        self.redis_scripts = None
+        self.near_cache = None
+        self.near_cache_invalidator = None
+        self.write_buffer = build_write_behind(options, WriteBehindBuffer, self.flush) if write_behind_enabled(options) else None
         if self.auto_connect:
-            self.server_address = options[REDIS_SERVER_ADDRESS]
-            self.server_port = options[REDIS_SERVER_PORT]
+            self.server_address = options.get(REDIS_UNIX_SOCKET_PATH, options.get(REDIS_SERVER_ADDRESS))
+            self.server_port = options.get(REDIS_SERVER_PORT)
             self.log.info(f'Connecting to REDIS server {self.server_address}:{self.server_port}')
-            self.redis_client = redis.Redis(host=self.server_address, port=self.server_port, decode_responses=True)
+            (self.redis_client, self.replica_client) = get_clients(options)
+            if near_cache_enabled(options) and self.cluster:
+                self.log.warning('near cache is not supported against a REDIS cluster, continuing without it')
+            elif near_cache_enabled(options):
+                (self.near_cache, self.near_cache_invalidator) = build_near_cache(options, self.redis_client)
 
     def __check_options(self):
-        if self.options is None:
-            self.log.warning(f'missing option please provide options {REDIS_SERVER_ADDRESS} and {REDIS_SERVER_PORT}')
-            raise MissingOptionError(f'missing option please provide options {REDIS_SERVER_ADDRESS} and {REDIS_SERVER_PORT}')
-        if self.auto_connect is True:
-            if REDIS_SERVER_ADDRESS not in self.options:
-                self.log.warning(f'missing option please provide option {REDIS_SERVER_ADDRESS}')
-                raise MissingOptionError(f'missing option please provide option {REDIS_SERVER_ADDRESS}')
-            if REDIS_SERVER_PORT not in self.options:
-                self.log.warning(f'missing option please provide option {REDIS_SERVER_PORT}')
-                raise MissingOptionError(f'missing option please provide option {REDIS_SERVER_PORT}')
+        check_options(self.log, self.options, self.auto_connect)
+
+    @property
+    def read_client(self):
+        # replica reads may lag the primary slightly
+        return self.redis_client if self.replica_client is None else self.replica_client
+
+    def scripts(self):
+        if self.redis_scripts is None:
+            self.redis_scripts = RedisScripts(self.redis_client).preload()
+        return self.redis_scripts
+
+    def script_change_arguments(self, key, operation, field=None):
+        # expiry & change publish arguments shared by the scripts
+        if not self.publish_changes:
+            return ['', '']
+        return [change_channel(self.change_channel_prefix, key), change_message(operation, field)]
+
+    def near_cache_active(self):
+        # entries are only trusted while the invalidation subscription is live
+        return self.near_cache is not None and self.near_cache_invalidator.subscribed.is_set()
+
+    def invalidate_near_cache(self, *keys):
+        if self.near_cache is not None:
+            for key in keys:
+                self.near_cache.invalidate(key)
+
+    def publish_change(self, client, key, operation, field=None):
+        client.publish(change_channel(self.change_channel_prefix, key), change_message(operation, field))
+
+    def execute_with_changes(self, pipeline, changes):
+        # changes (key, operation, field) go out in the same round trip, cluster pipelines block PUBLISH so there they follow it
+        if not self.publish_changes:
+            return pipeline.execute()
+        if not self.cluster:
+            for change in changes:
+                self.publish_change(pipeline, *change)
+            return pipeline.execute()
+        replies = pipeline.execute()
+        for change in changes:
+            self.publish_change(self.redis_client, *change)
+        return replies
+
+    def key_pipeline(self, key, transaction=False):
+        # cluster pipelines cannot MULTI, a single key transaction runs on the primary owning the key slot
+        if transaction and self.cluster:
+            return self.redis_client.get_redis_connection(self.redis_client.get_node_from_key(key)).pipeline(transaction=True)
+        return self.redis_client.pipeline(transaction=transaction)
+
+    def close(self):
+        if self.write_buffer is not None:
+            self.write_buffer.stop()
+        if self.near_cache_invalidator is not None:
+            self.near_cache_invalidator.stop()
+
+    @instrumented
+    def flush(self):
+        # sends the writes buffered in write behind mode in one pipeline, returns the number of writes
+        if self.write_buffer is None:
+            return 0
+        with self.write_buffer.flush_lock:
+            (values, fields) = self.write_buffer.drain()
+            if len(values) == 0 and len(fields) == 0:
+                return 0
+            # drained writes are read from the buffer until the pipeline has executed
+            try:
+                self.write_buffered(values, fields)
+                self.invalidate_near_cache(*values.keys(), *fields.keys())
+            except RETRIED_FLUSH_ERRORS:
+                self.write_buffer.restore(values, fields)
+                raise
+            finally:
+                self.write_buffer.flushed()
+        return len(values) + sum(len(key_fields) for (key_fields, _) in fields.values())
+
+    def write_buffered(self, values, fields):
+        pipeline = self.redis_client.pipeline(transaction=False)
+        queue_buffered_writes(pipeline, values, fields, self.cluster)
+        changes = [(key, 'set') for key in values.keys()]
+        changes.extend((key, 'hset', field) for key, (key_fields, _) in fields.items() for field in key_fields.keys())
+        self.execute_with_changes(pipeline, changes)
+
+    def flush_buffered_writes(self):
+        # writes that bypass the buffer, and reads the buffer cannot answer, go out after the buffered writes
+        if self.write_buffer is not None and self.write_buffer.busy():
+            self.flush()
+
+    def buffered_value(self, key, field=None):
+        # a value written in write behind mode is read from the buffer until it is flushed, MISSING otherwise
+        if self.write_buffer is None:
+            return MISSING
+        value = self.write_buffer.pending_value(key) if field is None else self.write_buffer.pending_field(key, field)
+        # numbers are buffered as given, redis answers them as text
+        return value if value is MISSING or type(value) in (str, bytes) else str(value)
+
+    def buffered_values(self, key_fields, values):
+        if self.write_buffer is None or not self.write_buffer.busy():
+            return values
+        buffered_values = [self.buffered_value(*key_field) for key_field in key_fields]
+        return [value if buffered_value is MISSING else buffered_value for value, buffered_value in zip(values, buffered_values)]
 
     def can_connect(self):
         try:
@@ -44,38 +171,277 @@ class RedisCacheProvider:
         except redis.exceptions.ConnectionError:
             return False
 
+    @instrumented
     def get_keys(self, pattern='*'):
-        return self.redis_client.keys(pattern)
-
-    def store(self, key, value):
-        self.log.debug(f'storing for key:{key}')
-        if type(value) is BigFloat:
-            self.log.debug(f'BigFloat storing key:{key} [{value}]')
-            self.redis_client.set(key, str(value))
-        elif type(value) is dict:
-            self.log.debug(f'collection storing key:{key} [{value}]')
-            serialized_json = as_pretty_json(value, indent=None)
-            self.redis_client.set(key, serialized_json)
+        # SCAN may report a key more than once, keep first occurrence only
+        return list(dict.fromkeys(self.iter_keys(pattern)))
+
+    def iter_keys(self, pattern='*', count=DEFAULT_SCAN_COUNT):
+        self.flush_buffered_writes()
+        if self.cluster:
+            # every primary keeps its own cursor
+            yield from map(as_text, self.redis_client.scan_iter(match=pattern, count=count))
+            return
+        cursor = None
+        while cursor != 0:
+            (cursor, keys) = self.read_client.scan(cursor or 0, match=pattern, count=count)
+            yield from map(as_text, keys)
+
+    @instrumented
+    def store(self, key, value, ttl=None):
+        self.log.debug('storing for key:%s', key)
+        expiry = expiry_arguments(effective_ttl(ttl, self.default_ttl))
+        if self.write_buffer is not None:
+            self.write_buffer.put(key, self.serialize(key, value), expiry)
+            return
+        if self.publish_changes:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            pipeline.set(key, self.serialize(key, value), **expiry)
+            self.execute_with_changes(pipeline, [(key, 'set')])
         else:
-            self.log.debug(f'default storing key:{key} [{value}]')
-            self.redis_client.set(key, value)
+            self.redis_client.set(key, self.serialize(key, value), **expiry)
+        self.invalidate_near_cache(key)
+
+    @instrumented
+    def store_many(self, values: dict, ttl=None):
+        self.log.debug('storing many for keys:%s', values.keys())
+        serialized_values = {key: self.serialize(key, value) for key, value in values.items()}
+        if len(serialized_values) == 0:
+            return
+        expiry = expiry_arguments(effective_ttl(ttl, self.default_ttl))
+        if self.write_buffer is not None:
+            for key, value in serialized_values.items():
+                self.write_buffer.put(key, value, expiry)
+            return
+        if self.publish_changes or len(expiry) > 0:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            queue_set_many(pipeline, serialized_values, expiry, self.cluster)
+            self.execute_with_changes(pipeline, [(key, 'set') for key in serialized_values.keys()])
+        elif self.cluster:
+            self.redis_client.mset_nonatomic(serialized_values)
+        else:
+            self.redis_client.mset(serialized_values)
+        self.invalidate_near_cache(*serialized_values.keys())
+
+    @instrumented
+    def compare_and_set(self, key, expected, value, ttl=None):
+        # expected None only sets a key that does not exist yet
+        self.flush_buffered_writes()
+        ttl = effective_ttl(ttl, self.default_ttl)
+        arguments = ['absent', ''] if expected is None else ['equal', self.serialize(key, expected)]
+        arguments += [self.serialize(key, value), '' if ttl is None else expiry_milliseconds(ttl)]
+        updated = self.scripts().compare_and_set(keys=[key], args=arguments + self.script_change_arguments(key, 'set')) == 1
+        if updated:
+            self.invalidate_near_cache(key)
+        return updated
+
+    @instrumented
+    def refresh_expiry(self, keys, ttl=None):
+        ttl = effective_ttl(ttl, self.default_ttl)
+        if len(keys) == 0 or ttl is None:
+            return 0
+        self.flush_buffered_writes()
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.pexpire(key, expiry_milliseconds(ttl))
+        return sum(pipeline.execute())
+
+    @instrumented
+    def time_to_live(self, key):
+        self.flush_buffered_writes()
+        milliseconds = self.read_client.pttl(key)
+        return None if milliseconds < 0 else milliseconds / 1000
 
+    def serialize(self, key, value):
+        return self.codec.serialize(key, value)
+
+    @instrumented
     def fetch(self, key, as_type: T = str):
-        value = self.redis_client.get(key)
-        if value is not None and value == NOT_AVAILABLE:
-            return NOT_AVAILABLE
-        if as_type is int:
-            return None if value is None else int(value)
-        elif as_type is float:
-            return None if value is None else float(value)
-        elif as_type is BigFloat:
-            return None if value is None else BigFloat(value)
-        elif as_type is dict:
-            result = as_json(value)
-            self.log.debug(f'dict fetching key:{key} [{result}]')
-            return None if len(result) == 0 else result
+        value = self.buffered_value(key)
+        if value is not MISSING:
+            return self.deserialize(key, value, as_type)
+        # near cache entries live until invalidated, so they are loaded from the primary (replicas may lag)
+        if self.near_cache_active():
+            value = self.near_cache.get_or_load(key, lambda: self.redis_client.get(key))
         else:
+            value = self.read_client.get(key)
+        return self.deserialize(key, value, as_type)
+
+    @instrumented
+    def fetch_many(self, keys, as_type: T = str):
+        if len(keys) == 0:
+            return []
+        as_types = as_type if type(as_type) is list else [as_type] * len(keys)
+        values = self.buffered_values([(key,) for key in keys], self.__fetch_values(keys))
+        return [self.deserialize(key, value, value_type) for key, value, value_type in zip(keys, values, as_types)]
+
+    def __fetch_values(self, keys):
+        if not self.near_cache_active():
+            return self.mget(keys)
+        epoch = self.near_cache.epoch
+        values = [self.near_cache.get(key) for key in keys]
+        missing_keys = [key for key, value in zip(keys, values) if value is MISSING]
+        if len(missing_keys) == 0:
+            return values
+        loaded_values = dict(zip(missing_keys, self.mget(missing_keys, self.redis_client)))
+        for key, value in loaded_values.items():
+            self.near_cache.put(key, value, epoch)
+        return [loaded_values[key] if value is MISSING else value for key, value in zip(keys, values)]
+
+    def fetch_with_expiry(self, key, as_type: T = str):
+        self.flush_buffered_writes()
+        pipeline = self.read_client.pipeline(transaction=False)
+        pipeline.get(key)
+        pipeline.pttl(key)
+        (value, milliseconds) = pipeline.execute()
+        return self.deserialize(key, value, as_type), None if milliseconds < 0 else milliseconds / 1000
+
+    @instrumented
+    def get_or_load(self, key, loader, ttl=None, as_type: T = str, refresh_ahead=None, stale_ttl=None):
+        # a missing key is loaded once across threads (single flight) & processes (load lock), others wait for it,
+        # within refresh_ahead of expiry (or past ttl, kept for stale_ttl) the value is served & refreshed in the background
+        return self.load_through(key, loader, lambda: self.fetch(key, as_type), lambda: self.fetch_with_expiry(key, as_type),
+                                 lambda value, value_ttl: self.store(key, value, value_ttl), ttl, refresh_ahead, stale_ttl)
+
+    def load_through(self, key, loader, read, read_with_expiry, write, ttl, refresh_ahead, stale_ttl):
+        ttl = effective_ttl(ttl, self.default_ttl)
+        window = refresh_window(ttl, refresh_ahead, stale_ttl)
+        if window is None:
+            value = read()
+        else:
+            (value, remaining) = read_with_expiry()
+            if value is not None and remaining is not None and remaining <= window:
+                refresh = lambda: self.refresh(key, loader, write, stored_ttl(ttl, stale_ttl))
+                self.single_flight.run_in_background((key, 'refresh'), refresh)
+        if value is not None:
             return value
+        return self.single_flight.run(key, lambda: self.load(key, loader, read, write, stored_ttl(ttl, stale_ttl)))
+
+    def load(self, key, loader, read, write, ttl):
+        token = self.acquire_load_lock(key)
+        while token is None:
+            # another process is loading, its value is picked up (its lock expires should it fail)
+            time.sleep(self.load_wait_interval)
+            value = read()
+            if value is not None:
+                return value
+            token = self.acquire_load_lock(key)
+        try:
+            return self.write_loaded(loader(), write, ttl)
+        finally:
+            self.release_load_lock(key, token)
+
+    def refresh(self, key, loader, write, ttl):
+        token = self.acquire_load_lock(key)
+        if token is None:
+            return None
+        try:
+            return self.write_loaded(loader(), write, ttl)
+        except Exception as error:
+            self.log.warning(f'refreshing key:{key} failed, serving current value [{error}]')
+        finally:
+            self.release_load_lock(key, token)
 
+    def write_loaded(self, value, write, ttl):
+        if value is not None:
+            write(value, ttl)
+            # waiting processes poll for the value, it is not left in the write behind buffer
+            self.flush_buffered_writes()
+        return value
+
+    def acquire_load_lock(self, key):
+        token = uuid.uuid4().hex
+        acquired = self.redis_client.set(load_lock_key(key), token, nx=True, px=expiry_milliseconds(self.load_lock_ttl))
+        return token if acquired else None
+
+    def release_load_lock(self, key, token):
+        self.scripts().release_lock(keys=[load_lock_key(key)], args=[token])
+
+    def mget(self, keys, client=None):
+        client = self.read_client if client is None else client
+        # cluster MGET is split into one MGET per hash slot
+        if self.cluster:
+            return client.mget_nonatomic(keys)
+        return client.mget(keys)
+
+    def deserialize(self, key, value, as_type: T = str):
+        return self.codec.deserialize(key, value, as_type)
+
+    @instrumented
     def delete(self, key):
-        return self.redis_client.delete(key)
+        if self.write_buffer is not None:
+            self.write_buffer.discard(key)
+        if self.publish_changes:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            pipeline.delete(key)
+            deleted = self.execute_with_changes(pipeline, [(key, 'del')])[0]
+        else:
+            deleted = self.redis_client.delete(key)
+        self.invalidate_near_cache(key)
+        return deleted
+
+    @instrumented
+    def delete_many(self, keys):
+        if len(keys) == 0:
+            return 0
+        if self.write_buffer is not None:
+            self.write_buffer.discard(*keys)
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.delete(key)
+        deleted = sum(self.execute_with_changes(pipeline, [(key, 'del') for key in keys])[:len(keys)])
+        self.invalidate_near_cache(*keys)
+        return deleted
+
+    @instrumented
+    def export_snapshot(self, path, pattern='*', count=DEFAULT_SCAN_COUNT):
+        # plain & hash keys with their remaining expiry, returns the number of keys written
+        exported = 0
+        with open(path, 'wb') as snapshot:
+            write_snapshot_header(snapshot)
+            for keys in chunk_iterable(self.iter_keys(pattern, count), count):
+                exported += self.export_keys(snapshot, keys)
+        self.log.info(f'exported {exported} keys matching:{pattern} to {path}')
+        return exported
+
+    def export_keys(self, snapshot, keys):
+        pipeline = self.read_client.pipeline(transaction=False)
+        for key in keys:
+            pipeline.type(key)
+            pipeline.pttl(key)
+        replies = pipeline.execute()
+        kinds = dict(zip(keys, map(as_text, replies[0::2])))
+        expiries = dict(zip(keys, replies[1::2]))
+        exported_keys = [key for key in keys if kinds[key] in ('string', 'hash')]
+        pipeline = self.read_client.pipeline(transaction=False)
+        for key in exported_keys:
+            if kinds[key] == 'string':
+                pipeline.get(key)
+            else:
+                pipeline.hgetall(key)
+        exported = 0
+        for key, value in zip(exported_keys, pipeline.execute()):
+            # keys expiring in between the round trips are left out
+            if value is None or len(value) == 0:
+                continue
+            expiry = -1 if expiries[key] < 0 else max(expiries[key], 1)
+            if kinds[key] == 'string':
+                write_string_entry(snapshot, key, value, expiry)
+            else:
+                write_hash_entry(snapshot, key, value, expiry)
+            exported += 1
+        return exported
+
+    @instrumented
+    def import_snapshot(self, path, batch_size=DEFAULT_SCAN_COUNT):
+        # snapshot keys are replaced (with their exported expiry), returns the number of keys written
+        self.flush_buffered_writes()
+        imported = 0
+        for entries in chunk_iterable(read_snapshot(path), batch_size):
+            pipeline = self.redis_client.pipeline(transaction=False)
+            queue_snapshot_entries(pipeline, entries, self.cluster)
+            pipeline.execute()
+            self.invalidate_near_cache(*[as_text(key) for (_, key, _, _) in entries])
+            imported += len(entries)
+        self.log.info(f'imported {imported} keys from {path}')
+        return imported
@@ -1,65 +1,213 @@
 from typing import TypeVar
 
-from coreutility.json.json_utility import as_pretty_json, as_json
+import redis
+from core.number.BigFloat import BigFloat
 
-from cache.provider.RedisCacheProvider import RedisCacheProvider
+from cache.codec.ValueCodec import ValueCodec
+from cache.instrumentation.instrumentation_utility import instrumented
+from cache.nearcache.NearCache import MISSING
+from cache.provider.RedisCacheProvider import RedisCacheProvider, DEFAULT_SCAN_COUNT
+from cache.utility.BigFloat_utility import to_decimal_string
+from cache.utility.bytes_utility import as_text
+from cache.utility.collection_utility import chunk_mapping
+from cache.utility.expiry_utility import effective_ttl, expiry_milliseconds
+from cache.utility.merge_patch_utility import merge_patch
 
 T = TypeVar("T")
 
+REDIS_VALUES_STORE_CHUNK_SIZE = 'REDIS_VALUES_STORE_CHUNK_SIZE'
+DEFAULT_VALUES_STORE_CHUNK_SIZE = 1000
+# attempts of a patch whose hash keeps changing underneath it
+PATCH_ATTEMPTS = 10
+
 
 class RedisCacheProviderWithHash(RedisCacheProvider):
 
     def __init__(self, options, auto_connect=True):
         super().__init__(options, auto_connect)
+        self.values_store_chunk_size = int(options.get(REDIS_VALUES_STORE_CHUNK_SIZE, DEFAULT_VALUES_STORE_CHUNK_SIZE))
+
+    @instrumented
+    def values_store(self, key, values, custom_key=None, atomic=False, ttl=None):
+        self.log.debug('storing values for key:%s', key)
+        serialized_values = self.serialize_values(values, custom_key)
+        if len(serialized_values) == 0:
+            return
+        self.flush_buffered_writes()
+        # one round trip: every chunk is a multi-field HSET queued on the same pipeline
+        pipeline = self.key_pipeline(key, transaction=atomic)
+        for chunk in chunk_mapping(serialized_values, self.values_store_chunk_size):
+            pipeline.hset(key, mapping=chunk)
+        self.queue_expire(pipeline, key, ttl)
+        self.execute_with_changes(pipeline, [(key, 'hset')])
+        self.invalidate_near_cache(key)
+
+    def queue_expire(self, pipeline, key, ttl):
+        # hash expiry is key level, it is refreshed by every write to the hash
+        ttl = effective_ttl(ttl, self.default_ttl)
+        if ttl is not None:
+            pipeline.pexpire(key, expiry_milliseconds(ttl))
 
-    def values_store(self, key, values, custom_key=None):
-        self.log.debug(f'storing values for key:{key}')
-        if type(values) is dict:
-            for k, v in values.items():
-                if type(v) is dict:
-                    serialized_value = as_pretty_json(v, indent=None)
-                    self.redis_client.hset(key, k, serialized_value)
-                else:
-                    self.redis_client.hset(key, k, v)
-        elif type(values) is list:
-            for v in values:
-                value_key = next(iter(v)) if (custom_key is None) else custom_key(v)
-                serialized_value = as_pretty_json(v, indent=None)
-                self.log.debug(f'storing key:[{value_key}] value:[{serialized_value}]')
-                self.redis_client.hset(key, value_key, serialized_value)
-
-    def values_set_value(self, key, value_key, value):
-        if type(value) is dict or type(value) is list:
-            serialized_value = as_pretty_json(value, indent=None)
-            self.redis_client.hset(key, value_key, serialized_value)
+    def serialize_values(self, values, custom_key=None):
+        return self.codec.serialize_values(values, custom_key)
+
+    @instrumented
+    def values_set_value(self, key, value_key, value, ttl=None):
+        if self.write_buffer is not None:
+            ttl = effective_ttl(ttl, self.default_ttl)
+            self.write_buffer.put_field(key, value_key, self.codec.serialize_value(value), None if ttl is None else expiry_milliseconds(ttl))
+            return
+        if self.publish_changes or effective_ttl(ttl, self.default_ttl) is not None:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            pipeline.hset(key, value_key, self.codec.serialize_value(value))
+            self.queue_expire(pipeline, key, ttl)
+            self.execute_with_changes(pipeline, [(key, 'hset', value_key)])
         else:
-            self.redis_client.hset(key, value_key, value)
+            self.redis_client.hset(key, value_key, self.codec.serialize_value(value))
+        self.invalidate_near_cache(key)
+
+    @instrumented
+    def values_patch_value(self, key, value_key, patch: dict, ttl=None):
+        # JSON merge patch (None removes a member) written under WATCH, retried should the hash change in between
+        self.log.debug('patching value for key:%s value key:%s', key, value_key)
+        self.flush_buffered_writes()
+        with self.key_pipeline(key, transaction=True) as pipeline:
+            for _ in range(PATCH_ATTEMPTS):
+                try:
+                    pipeline.watch(key)
+                    document = self.patch_document(value_key, pipeline.hget(key, value_key))
+                    # values stored from a list are wrapped by their value key
+                    patched = merge_patch(document[value_key] if type(document.get(value_key)) is dict else document, patch)
+                    pipeline.multi()
+                    pipeline.hset(key, value_key, self.codec.serialize_value(document))
+                    self.queue_expire(pipeline, key, ttl)
+                    self.execute_with_changes(pipeline, [(key, 'hset', value_key)])
+                    break
+                except redis.exceptions.WatchError:
+                    self.log.debug('patched value for key:%s value key:%s changed, retrying', key, value_key)
+            else:
+                raise redis.exceptions.WatchError(f'value key:{value_key} of key:{key} kept changing, not patched after {PATCH_ATTEMPTS} attempts')
+        self.invalidate_near_cache(key)
+        return patched
 
+    def patch_document(self, value_key, value):
+        document = {} if value is None else self.codec.deserialize_value(value)
+        if type(document) is not dict:
+            raise ValueError(f'only JSON object hash values can be patched, value key:{value_key} holds {type(document).__name__}')
+        return document
+
+    @instrumented
+    def values_increment_value(self, key, value_key, amount, ttl=None):
+        self.flush_buffered_writes()
+        ttl = effective_ttl(ttl, self.default_ttl)
+        if type(amount) is BigFloat:
+            arguments = [value_key, to_decimal_string(amount), '' if ttl is None else expiry_milliseconds(ttl)]
+            incremented = BigFloat(as_text(self.scripts().increment_bigfloat(keys=[key], args=arguments + self.script_change_arguments(key, 'hset', value_key))))
+        else:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            if type(amount) is int:
+                pipeline.hincrby(key, value_key, amount)
+            else:
+                pipeline.hincrbyfloat(key, value_key, amount)
+            self.queue_expire(pipeline, key, ttl)
+            incremented = self.execute_with_changes(pipeline, [(key, 'hset', value_key)])[0]
+        self.invalidate_near_cache(key)
+        return incremented
+
+    @instrumented
     def values_get_value(self, key, value_key):
-        value = self.redis_client.hget(key, value_key)
-        if value is None:
-            return value
-        deserialized_value = self.deserialize_value(value)
-        if type(deserialized_value) is dict:
-            return deserialized_value[value_key] if value_key in deserialized_value else deserialized_value
-        return deserialized_value
+        value = self.buffered_value(key, value_key)
+        if value is not MISSING:
+            return self.codec.deserialize_value_of_key(value_key, value)
+        if self.near_cache_active():
+            value = self.near_cache.get_or_load_field(key, value_key, lambda: self.redis_client.hget(key, value_key))
+        else:
+            value = self.read_client.hget(key, value_key)
+        return self.codec.deserialize_value_of_key(value_key, value)
 
+    @instrumented
     def values_delete_value(self, key, value_key):
-        self.redis_client.hdel(key, value_key)
-
-    def values_fetch(self, key, as_type: T = list):
-        self.log.debug(f'fetching values for key:{key}')
-        if as_type is dict:
-            values = self.redis_client.hgetall(key)
-            for k, v in values.items():
-                values[k] = self.deserialize_value(v)
-            return values
-        elif as_type is list:
-            stored_values = self.redis_client.hgetall(key)
-            return list([as_json(v) for k, v in stored_values.items()])
+        if self.write_buffer is not None:
+            self.write_buffer.discard_field(key, value_key)
+        if self.publish_changes:
+            pipeline = self.redis_client.pipeline(transaction=False)
+            pipeline.hdel(key, value_key)
+            self.execute_with_changes(pipeline, [(key, 'hdel', value_key)])
+        else:
+            self.redis_client.hdel(key, value_key)
+        self.invalidate_near_cache(key)
+
+    @instrumented
+    def values_fetch(self, key, as_type: T = list, lazy=False):
+        self.log.debug('fetching values for key:%s', key)
+        self.flush_buffered_writes()
+        values = self.read_client.hgetall(key)
+        if lazy and as_type is dict:
+            return self.codec.lazy_values(values)
+        return self.codec.deserialize_values(values, as_type)
+
+    def values_fetch_with_expiry(self, key, as_type: T = list):
+        self.flush_buffered_writes()
+        pipeline = self.read_client.pipeline(transaction=False)
+        pipeline.hgetall(key)
+        pipeline.pttl(key)
+        (values, milliseconds) = pipeline.execute()
+        return self.fetch_loaded_values(values, as_type), None if milliseconds < 0 else milliseconds / 1000
+
+    def fetch_loaded_values(self, values, as_type):
+        # an empty hash does not exist, it reads as missing
+        return None if len(values) == 0 else self.codec.deserialize_values(values, as_type)
+
+    @instrumented
+    def values_get_or_load(self, key, loader, ttl=None, as_type: T = list, custom_key=None, refresh_ahead=None, stale_ttl=None):
+        # get_or_load for hashes, loader returns the values for values_store
+        def read():
+            self.flush_buffered_writes()
+            return self.fetch_loaded_values(self.read_client.hgetall(key), as_type)
+        write = lambda values, values_ttl: self.values_store(key, values, custom_key, atomic=True, ttl=values_ttl)
+        return self.load_through(key, loader, read, lambda: self.values_fetch_with_expiry(key, as_type), write, ttl, refresh_ahead, stale_ttl)
+
+    @instrumented
+    def values_fetch_fields(self, key, fields, as_type: T = dict):
+        self.log.debug('fetching values for key:%s fields:%s', key, fields)
+        if len(fields) == 0:
+            return {} if as_type is dict else []
+        values = self.buffered_values([(key, field) for field in fields], self.read_client.hmget(key, fields))
+        return self.codec.deserialize_fields(fields, values, as_type)
+
+    def iter_values(self, key, as_type: T = list, pattern='*', count=DEFAULT_SCAN_COUNT):
+        self.log.debug('iterating values for key:%s', key)
+        self.flush_buffered_writes()
+        cursor = None
+        while cursor != 0:
+            (cursor, values) = self.read_client.hscan(key, cursor or 0, match=pattern, count=count)
+            deserialized_values = self.codec.deserialize_values(values, as_type)
+            yield from deserialized_values.items() if type(deserialized_values) is dict else deserialized_values
+
+    @instrumented
+    def values_fetch_columns(self, key, fields, dtypes=None, key_column=None, count=DEFAULT_SCAN_COUNT):
+        # record values as one NumPy array per field (float64 unless given in dtypes), hash field names as key_column,
+        # streamed by HSCAN so only one chunk of records is held at a time (requires numpy)
+        from cache.codec.columnar_utility import records_to_columns, concatenate_columns
+        self.log.debug('fetching columns:%s for key:%s', fields, key)
+        self.flush_buffered_writes()
+        chunks = []
+        # HSCAN may report a field more than once while the hash is resized
+        seen = set()
+        cursor = None
+        while cursor != 0:
+            (cursor, values) = self.read_client.hscan(key, cursor or 0, count=count)
+            (value_keys, records) = ([], [])
+            for value_key, value in values.items():
+                value_key = as_text(value_key)
+                if value_key not in seen:
+                    seen.add(value_key)
+                    value_keys.append(value_key)
+                    records.append(self.codec.deserialize_value(value))
+            if len(records) > 0:
+                chunks.append(records_to_columns(records, fields, dtypes, key_column, value_keys))
+        return concatenate_columns(chunks, fields, dtypes, key_column)
 
     @staticmethod
     def deserialize_value(value):
-        if value.startswith('{') or value.startswith('['):
-            return as_json(value)
-        return value
+        return ValueCodec.deserialize_value(value)
@@ -0,0 +1,109 @@
+import time
+from array import array
+from typing import TypeVar
+
+from core.number.BigFloat import BigFloat
+
+from cache.instrumentation.instrumentation_utility import instrumented
+from cache.provider.RedisCacheProvider import RedisCacheProvider
+from cache.serializer.serializer_utility import is_marked, loads_marked
+from cache.utility.bytes_utility import as_text, as_bytes
+
+T = TypeVar("T")
+
+REDIS_TIMESERIES_BACKEND = 'REDIS_TIMESERIES_BACKEND'
+REDIS_TIMESERIES_MAX_LENGTH = 'REDIS_TIMESERIES_MAX_LENGTH'
+
+STREAM_BACKEND = 'stream'
+SORTED_SET_BACKEND = 'sortedset'
+
+STREAM_VALUE_FIELD = 'v'
+
+
+def now_timestamp():
+    return time.time_ns() // 1_000_000
+
+
+def series_member(timestamp, serialized_value):
+    # member carries the timestamp so equal values at different times stay distinct, numbers are sent as text
+    return f'{timestamp}:'.encode() + as_bytes(serialized_value if type(serialized_value) is bytes else str(serialized_value))
+
+
+class RedisCacheProviderWithTimeSeries(RedisCacheProvider):
+
+    def __init__(self, options, auto_connect=True):
+        super().__init__(options, auto_connect)
+        # sorted sets work on every server, the stream backend requires redis 7
+        self.series_backend = options.get(REDIS_TIMESERIES_BACKEND, SORTED_SET_BACKEND)
+        if self.series_backend not in [STREAM_BACKEND, SORTED_SET_BACKEND]:
+            raise ValueError(f'unknown time series backend:{self.series_backend} please use one of {[STREAM_BACKEND, SORTED_SET_BACKEND]}')
+        self.series_max_length = int(options[REDIS_TIMESERIES_MAX_LENGTH]) if REDIS_TIMESERIES_MAX_LENGTH in options else None
+
+    @instrumented
+    def series_append(self, key, value, timestamp=None, max_length=None):
+        self.append_series_values(key, [now_timestamp() if timestamp is None else timestamp], [value], max_length)
+
+    @instrumented
+    def series_append_many(self, key, timestamps, values, max_length=None):
+        self.append_series_values(key, timestamps, values, max_length)
+
+    def append_series_values(self, key, timestamps, values, max_length):
+        # shared by both (instrumented) appends, so a single append is recorded once
+        self.log.debug('appending %s series values for key:%s', len(values), key)
+        if len(timestamps) != len(values):
+            raise ValueError(f'series append for key:{key} has {len(timestamps)} timestamps for {len(values)} values')
+        if len(values) == 0:
+            return
+        if self.series_backend == STREAM_BACKEND and any(later < earlier for earlier, later in zip(timestamps, timestamps[1:])):
+            # stream entry ids only grow, appends older than the last entry of the stream are rejected by the server
+            raise ValueError(f'stream series append for key:{key} has decreasing timestamps')
+        max_length = self.series_max_length if max_length is None else max_length
+        serialized_values = [self.codec.serialize_value(value) for value in values]
+        pipeline = self.redis_client.pipeline(transaction=False)
+        if self.series_backend == STREAM_BACKEND:
+            for timestamp, serialized_value in zip(timestamps, serialized_values):
+                # explicit millisecond with server assigned sequence ('<ms>-*' requires redis 7)
+                pipeline.xadd(key, {STREAM_VALUE_FIELD: serialized_value}, id=f'{timestamp}-*', maxlen=max_length, approximate=True)
+        else:
+            pipeline.zadd(key, {series_member(timestamp, serialized_value): timestamp for timestamp, serialized_value in zip(timestamps, serialized_values)})
+            if max_length is not None:
+                pipeline.zremrangebyrank(key, 0, -(max_length + 1))
+        pipeline.execute()
+
+    @instrumented
+    def series_range(self, key, start=None, end=None, count=None, as_type: T = BigFloat):
+        self.log.debug('fetching series range for key:%s [%s, %s]', key, start, end)
+        timestamps = array('q')
+        values = []
+        if self.series_backend == STREAM_BACKEND:
+            entries = self.read_client.xrange(key, '-' if start is None else start, '+' if end is None else end, count=count)
+            for (entry_id, fields) in entries:
+                entry_id = as_text(entry_id)
+                timestamps.append(int(entry_id[:entry_id.index('-')]))
+                values.append(fields[STREAM_VALUE_FIELD] if STREAM_VALUE_FIELD in fields else fields[STREAM_VALUE_FIELD.encode()])
+        else:
+            members = self.read_client.zrangebyscore(key, '-inf' if start is None else start, '+inf' if end is None else end,
+                                                     start=None if count is None else 0, num=count)
+            for member in members:
+                separator = member.index(':' if type(member) is str else b':')
+                timestamps.append(int(member[:separator]))
+                values.append(member[separator + 1:])
+        return timestamps, self.__deserialize_series(key, values, as_type)
+
+    @instrumented
+    def series_trim(self, key, max_length):
+        if self.series_backend == STREAM_BACKEND:
+            return self.redis_client.xtrim(key, maxlen=max_length, approximate=False)
+        return self.redis_client.zremrangebyrank(key, 0, -(max_length + 1))
+
+    def series_length(self, key):
+        if self.series_backend == STREAM_BACKEND:
+            return self.read_client.xlen(key)
+        return self.read_client.zcard(key)
+
+    def __deserialize_series(self, key, values, as_type):
+        if as_type is float or as_type is int:
+            # binary stored BigFloat values are unpacked before conversion
+            number_values = [as_type(str(loads_marked(value))) if is_marked(value) else as_type(value) for value in values]
+            return array('d' if as_type is float else 'q', number_values)
+        return [self.codec.deserialize(key, value, as_type) for value in values]
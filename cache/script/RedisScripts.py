@@ -0,0 +1,16 @@
+from cache.script.script_utility import COMPARE_AND_SET_SCRIPT, INCREMENT_BIGFLOAT_SCRIPT, RELEASE_LOCK_SCRIPT
+
+
+class RedisScripts:
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        # registered scripts run as EVALSHA (reloading themselves should the server lose them)
+        self.compare_and_set = redis_client.register_script(COMPARE_AND_SET_SCRIPT)
+        self.increment_bigfloat = redis_client.register_script(INCREMENT_BIGFLOAT_SCRIPT)
+        self.release_lock = redis_client.register_script(RELEASE_LOCK_SCRIPT)
+
+    def preload(self):
+        for script in [self.compare_and_set, self.increment_bigfloat, self.release_lock]:
+            script.sha = self.redis_client.script_load(script.script)
+        return self
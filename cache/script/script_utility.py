@@ -0,0 +1,107 @@
+# scripts take (px, channel, message) as their last arguments: '' skips the expiry / change publish
+
+COMPARE_AND_SET_SCRIPT = """
+local current = redis.call('GET', KEYS[1])
+if ARGV[1] == 'absent' then
+    if current then
+        return 0
+    end
+elseif current ~= ARGV[2] then
+    return 0
+end
+if ARGV[4] ~= '' then
+    redis.call('SET', KEYS[1], ARGV[3], 'PX', ARGV[4])
+else
+    redis.call('SET', KEYS[1], ARGV[3])
+end
+if ARGV[5] ~= '' then
+    redis.call('PUBLISH', ARGV[5], ARGV[6])
+end
+return 1
+"""
+
+# exact decimal string arithmetic, Lua numbers are doubles
+INCREMENT_BIGFLOAT_SCRIPT = """
+local function parse(value)
+    local negative = string.find(value, '-', 1, true) ~= nil
+    value = (string.gsub(value, '-', ''))
+    local point = string.find(value, '.', 1, true)
+    if point == nil then
+        return negative, value, 0
+    end
+    return negative, string.sub(value, 1, point - 1) .. string.sub(value, point + 1), string.len(value) - point
+end
+local function add_digits(a, b)
+    local result, carry = {}, 0
+    for i = string.len(a), 1, -1 do
+        local sum = string.byte(a, i) + string.byte(b, i) - 96 + carry
+        carry = math.floor(sum / 10)
+        result[i] = sum % 10
+    end
+    return (carry > 0 and tostring(carry) or '') .. table.concat(result)
+end
+local function subtract_digits(a, b)
+    local result, borrow = {}, 0
+    for i = string.len(a), 1, -1 do
+        local difference = string.byte(a, i) - string.byte(b, i) - borrow
+        borrow = 0
+        if difference < 0 then
+            difference = difference + 10
+            borrow = 1
+        end
+        result[i] = difference
+    end
+    return table.concat(result)
+end
+local current = redis.call('HGET', KEYS[1], ARGV[1]) or '0'
+if string.byte(current, 1) == 0 then
+    return redis.error_reply('binary BigFloat values cannot be incremented')
+end
+if string.find(current, '[^%d%.%-]') then
+    return redis.error_reply('hash value is not a number')
+end
+local current_negative, current_digits, current_scale = parse(current)
+local amount_negative, amount_digits, amount_scale = parse(ARGV[2])
+local scale = math.max(current_scale, amount_scale)
+current_digits = current_digits .. string.rep('0', scale - current_scale)
+amount_digits = amount_digits .. string.rep('0', scale - amount_scale)
+local width = math.max(string.len(current_digits), string.len(amount_digits))
+current_digits = string.rep('0', width - string.len(current_digits)) .. current_digits
+amount_digits = string.rep('0', width - string.len(amount_digits)) .. amount_digits
+local negative, digits
+if current_negative == amount_negative then
+    negative, digits = current_negative, add_digits(current_digits, amount_digits)
+elseif current_digits >= amount_digits then
+    negative, digits = current_negative, subtract_digits(current_digits, amount_digits)
+else
+    negative, digits = amount_negative, subtract_digits(amount_digits, current_digits)
+end
+digits = string.rep('0', scale + 1 - string.len(digits)) .. digits
+local integer = (string.gsub(string.sub(digits, 1, string.len(digits) - scale), '^0+', ''))
+if integer == '' then
+    integer = '0'
+end
+local result = integer
+if scale > 0 then
+    result = result .. '.' .. string.sub(digits, string.len(digits) - scale + 1)
+end
+if negative and string.find(result, '[1-9]') then
+    result = '-' .. result
+end
+redis.call('HSET', KEYS[1], ARGV[1], result)
+if ARGV[3] ~= '' then
+    redis.call('PEXPIRE', KEYS[1], ARGV[3])
+end
+if ARGV[4] ~= '' then
+    redis.call('PUBLISH', ARGV[4], ARGV[5])
+end
+return result
+"""
+
+# deletes the lock only while it still holds the token of its owner
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
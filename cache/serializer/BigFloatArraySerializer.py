@@ -0,0 +1,14 @@
+from cache.utility.BigFloat_utility import pack_bigfloats, unpack_bigfloats
+
+
+class BigFloatArraySerializer:
+    name = 'bigfloat-array'
+    marker = 'A'
+
+    @staticmethod
+    def dumps(value) -> bytes:
+        return pack_bigfloats(value)
+
+    @staticmethod
+    def loads(value: bytes):
+        return unpack_bigfloats(value)
@@ -0,0 +1,15 @@
+from cache.utility.BigFloat_utility import pack_bigfloat, unpack_bigfloat
+
+
+class BigFloatSerializer:
+    name = 'bigfloat'
+    marker = 'B'
+
+    # packed bytes are sent as raw bytes (see dumps_marked)
+    @staticmethod
+    def dumps(value) -> bytes:
+        return pack_bigfloat(value)
+
+    @staticmethod
+    def loads(value: bytes):
+        return unpack_bigfloat(value)
@@ -0,0 +1,17 @@
+import json
+
+from coreutility.json.json_utility import as_pretty_json
+
+
+class JsonSerializer:
+    name = 'json'
+    marker = 'J'
+
+    @staticmethod
+    def dumps(value) -> str:
+        return as_pretty_json(value, indent=None)
+
+    @staticmethod
+    def loads(value):
+        # json cannot read a memoryview, orjson can
+        return json.loads(value.tobytes() if type(value) is memoryview else value)
@@ -0,0 +1,22 @@
+import lz4.frame
+
+from cache.serializer.serializer_utility import loads_payload
+from cache.utility.bytes_utility import as_bytes
+
+
+class Lz4Compression:
+    name = 'lz4'
+    marker = 'L'
+
+    def __init__(self, level=0, dictionary: bytes = None):
+        if dictionary is not None:
+            raise ValueError('compression dictionaries are only supported by zstd')
+        self.level = level
+
+    # the serialized payload is text or (msgpack) bytes, compressed bytes are sent as raw bytes
+    def dumps(self, value) -> bytes:
+        return lz4.frame.compress(as_bytes(value), compression_level=self.level)
+
+    @staticmethod
+    def loads(value: bytes):
+        return loads_payload(lz4.frame.decompress(value))
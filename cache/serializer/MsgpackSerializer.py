@@ -0,0 +1,24 @@
+import msgpack
+
+
+def canonical(value):
+    # maps are packed in insertion order, sorting their keys (as json & orjson do) makes equal values pack equally
+    if type(value) is dict:
+        return {k: canonical(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if type(value) is list:
+        return [canonical(v) for v in value]
+    return value
+
+
+class MsgpackSerializer:
+    name = 'msgpack'
+    marker = 'M'
+
+    # packed bytes are sent as raw bytes (see dumps_marked)
+    @staticmethod
+    def dumps(value) -> bytes:
+        return msgpack.packb(canonical(value), use_bin_type=True)
+
+    @staticmethod
+    def loads(value: bytes):
+        return msgpack.unpackb(value, raw=False, strict_map_key=False)
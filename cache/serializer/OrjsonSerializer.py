@@ -0,0 +1,15 @@
+import orjson
+
+
+class OrjsonSerializer:
+    name = 'orjson'
+    # orjson writes plain JSON, so values stay readable by the json serializer
+    marker = 'J'
+
+    @staticmethod
+    def dumps(value) -> str:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode()
+
+    @staticmethod
+    def loads(value):
+        return orjson.loads(value)
@@ -0,0 +1,50 @@
+import threading
+
+import zstandard
+
+from cache.serializer.serializer_utility import loads_payload
+from cache.utility.bytes_utility import as_bytes
+
+# dictionaries by id, a stored frame names the dictionary it was compressed with
+_dictionaries = {}
+_local = threading.local()
+
+
+def train_dictionary(samples, size=16384) -> bytes:
+    return zstandard.train_dictionary(size, [sample.encode() for sample in samples]).as_bytes()
+
+
+def _decompressor(dict_id):
+    # zstandard (de)compressors must not be shared between threads
+    decompressors = getattr(_local, 'decompressors', None)
+    if decompressors is None:
+        decompressors = _local.decompressors = {}
+    if dict_id not in decompressors:
+        if dict_id != 0 and dict_id not in _dictionaries:
+            raise ValueError(f'zstd dictionary:{dict_id} is not loaded, please configure it with option REDIS_COMPRESSION_DICTIONARY')
+        decompressors[dict_id] = zstandard.ZstdDecompressor(dict_data=_dictionaries.get(dict_id))
+    return decompressors[dict_id]
+
+
+class ZstdCompression:
+    name = 'zstd'
+    marker = 'Z'
+
+    def __init__(self, level=3, dictionary: bytes = None):
+        self.level = level
+        self.dictionary = None if dictionary is None else zstandard.ZstdCompressionDict(dictionary)
+        if self.dictionary is not None:
+            _dictionaries[self.dictionary.dict_id()] = self.dictionary
+        self.local = threading.local()
+
+    # the serialized payload is text or (msgpack) bytes, compressed bytes are sent as raw bytes
+    def dumps(self, value) -> bytes:
+        compressor = getattr(self.local, 'compressor', None)
+        if compressor is None:
+            compressor = self.local.compressor = zstandard.ZstdCompressor(level=self.level, dict_data=self.dictionary)
+        return compressor.compress(as_bytes(value))
+
+    @staticmethod
+    def loads(value: bytes):
+        dict_id = zstandard.get_frame_parameters(value).dict_id
+        return loads_payload(_decompressor(dict_id).decompress(value))
@@ -0,0 +1,142 @@
+import importlib
+
+REDIS_SERIALIZER = 'REDIS_SERIALIZER'
+REDIS_BIGFLOAT_STORAGE = 'REDIS_BIGFLOAT_STORAGE'
+REDIS_COMPRESSION = 'REDIS_COMPRESSION'
+REDIS_COMPRESSION_THRESHOLD = 'REDIS_COMPRESSION_THRESHOLD'
+REDIS_COMPRESSION_LEVEL = 'REDIS_COMPRESSION_LEVEL'
+REDIS_COMPRESSION_DICTIONARY = 'REDIS_COMPRESSION_DICTIONARY'
+
+BIGFLOAT_STRING_STORAGE = 'string'
+BIGFLOAT_BINARY_STORAGE = 'binary'
+
+DEFAULT_COMPRESSION_THRESHOLD = 1024
+
+FORMAT_MARKER = '\x00'
+FORMAT_MARKER_BYTE = b'\x00'
+# a marked value starts with the marker as text or (raw bytes mode) as a byte
+MARKED_HEADS = (FORMAT_MARKER, 0)
+
+SERIALIZERS = {
+    'json': ('cache.serializer.JsonSerializer', 'JsonSerializer'),
+    'orjson': ('cache.serializer.OrjsonSerializer', 'OrjsonSerializer'),
+    'msgpack': ('cache.serializer.MsgpackSerializer', 'MsgpackSerializer')
+}
+
+# value encoders are only used for their own types, they cannot be selected for dict/list values
+VALUE_ENCODERS = {
+    'bigfloat': ('cache.serializer.BigFloatSerializer', 'BigFloatSerializer'),
+    'bigfloat-array': ('cache.serializer.BigFloatArraySerializer', 'BigFloatArraySerializer')
+}
+
+# compressions wrap an already serialized (marked or JSON) payload
+COMPRESSIONS = {
+    'zstd': ('cache.serializer.ZstdCompression', 'ZstdCompression'),
+    'lz4': ('cache.serializer.Lz4Compression', 'Lz4Compression')
+}
+
+# readers for each stored format marker, orjson is preferred for JSON when installed
+FORMAT_READERS = {
+    'J': ['orjson', 'json'],
+    'M': ['msgpack'],
+    'B': ['bigfloat'],
+    'A': ['bigfloat-array'],
+    'Z': ['zstd'],
+    'L': ['lz4']
+}
+
+# markers of payloads sent as raw bytes
+BINARY_MARKERS = ('M', 'B', 'A', 'Z', 'L')
+
+_loaded_serializers = {}
+
+
+def load_serializer(name):
+    if name not in _loaded_serializers:
+        _loaded_serializers[name] = _serializer_class(name)()
+    return _loaded_serializers[name]
+
+
+def _serializer_class(name):
+    for table in [SERIALIZERS, VALUE_ENCODERS, COMPRESSIONS]:
+        if name in table:
+            (module_name, class_name) = table[name]
+            return getattr(importlib.import_module(module_name), class_name)
+    raise ValueError(f'unknown serializer:{name} please use one of {list(SERIALIZERS.keys())}')
+
+
+def serializer_from_options(options):
+    if options is None or REDIS_SERIALIZER not in options:
+        return None
+    if options[REDIS_SERIALIZER] not in SERIALIZERS:
+        raise ValueError(f'unknown serializer:{options[REDIS_SERIALIZER]} please use one of {list(SERIALIZERS.keys())}')
+    return load_serializer(options[REDIS_SERIALIZER])
+
+
+def compression_from_options(options):
+    if options is None or REDIS_COMPRESSION not in options:
+        return None
+    if options[REDIS_COMPRESSION] not in COMPRESSIONS:
+        raise ValueError(f'unknown compression:{options[REDIS_COMPRESSION]} please use one of {list(COMPRESSIONS.keys())}')
+    compression_class = _serializer_class(options[REDIS_COMPRESSION])
+    level = int(options[REDIS_COMPRESSION_LEVEL]) if REDIS_COMPRESSION_LEVEL in options else compression_class().level
+    return compression_class(level, _compression_dictionary(options.get(REDIS_COMPRESSION_DICTIONARY)))
+
+
+def _compression_dictionary(dictionary):
+    # trained dictionary content or the path of a file holding it
+    if dictionary is None or type(dictionary) is bytes:
+        return dictionary
+    with open(dictionary, 'rb') as dictionary_file:
+        return dictionary_file.read()
+
+
+def compression_threshold_from_options(options):
+    if options is None:
+        return DEFAULT_COMPRESSION_THRESHOLD
+    return int(options.get(REDIS_COMPRESSION_THRESHOLD, DEFAULT_COMPRESSION_THRESHOLD))
+
+
+def bigfloat_binary_from_options(options):
+    return options is not None and options.get(REDIS_BIGFLOAT_STORAGE, BIGFLOAT_STRING_STORAGE) == BIGFLOAT_BINARY_STORAGE
+
+
+def is_marked(value):
+    return len(value) > 1 and value[0] in MARKED_HEADS
+
+
+def dumps_marked(serializer, value):
+    dumped = serializer.dumps(value)
+    if type(dumped) is bytes:
+        return FORMAT_MARKER_BYTE + serializer.marker.encode() + dumped
+    return f'{FORMAT_MARKER}{serializer.marker}{dumped}'
+
+
+def loads_marked(value):
+    if type(value) is str:
+        marker = value[1]
+        if marker in BINARY_MARKERS:
+            # decoded replies keep the bytes that are not utf-8 surrogate escaped (see connection_settings)
+            return reader_for_marker(marker).loads(value[2:].encode('utf-8', 'surrogateescape'))
+        return reader_for_marker(marker).loads(value[2:])
+    marker = chr(value[1])
+    if marker == 'J':
+        # JSON is parsed straight from the reply buffer
+        return reader_for_marker(marker).loads(memoryview(value)[2:])
+    return reader_for_marker(marker).loads(value[2:])
+
+
+def loads_payload(value):
+    # marked payloads are read by their format, unmarked ones are JSON
+    return loads_marked(value) if is_marked(value) else reader_for_marker('J').loads(value)
+
+
+def reader_for_marker(marker):
+    if marker not in FORMAT_READERS:
+        raise ValueError(f'unknown stored format marker:{marker}')
+    for name in FORMAT_READERS[marker]:
+        try:
+            return load_serializer(name)
+        except ImportError:
+            continue
+    raise ImportError(f'no serializer installed to read stored format marker:{marker}')
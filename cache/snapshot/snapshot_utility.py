@@ -0,0 +1,88 @@
+import mmap
+import struct
+
+from cache.utility.bytes_utility import as_bytes
+from cache.utility.expiry_utility import queue_set_many
+
+# file: magic, then entries of kind (uint8), expiry milliseconds (int64, -1 without expiry) & length prefixed key,
+# a string entry holds its length prefixed value, a hash entry its field count & length prefixed field/value pairs
+SNAPSHOT_MAGIC = b'ARSNAP1\n'
+ENTRY_HEAD = struct.Struct('<Bq')
+LENGTH = struct.Struct('<I')
+
+STRING_ENTRY = 1
+HASH_ENTRY = 2
+
+
+def write_snapshot_header(snapshot):
+    snapshot.write(SNAPSHOT_MAGIC)
+
+
+def write_string_entry(snapshot, key, value, expiry_milliseconds):
+    snapshot.write(ENTRY_HEAD.pack(STRING_ENTRY, expiry_milliseconds))
+    write_prefixed(snapshot, key)
+    write_prefixed(snapshot, value)
+
+
+def write_hash_entry(snapshot, key, values: dict, expiry_milliseconds):
+    snapshot.write(ENTRY_HEAD.pack(HASH_ENTRY, expiry_milliseconds))
+    write_prefixed(snapshot, key)
+    snapshot.write(LENGTH.pack(len(values)))
+    for field, value in values.items():
+        write_prefixed(snapshot, field)
+        write_prefixed(snapshot, value)
+
+
+def write_prefixed(snapshot, value):
+    data = as_bytes(value)
+    snapshot.write(LENGTH.pack(len(data)))
+    snapshot.write(data)
+
+
+def read_snapshot(path):
+    # yields (kind, key, value, expiry milliseconds), the file is mapped rather than read
+    with open(path, 'rb') as snapshot, mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        if mapped[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+            raise ValueError(f'{path} is not a cache snapshot')
+        offset = len(SNAPSHOT_MAGIC)
+        while offset < len(mapped):
+            (kind, expiry_milliseconds) = ENTRY_HEAD.unpack_from(mapped, offset)
+            (key, offset) = read_prefixed(mapped, offset + ENTRY_HEAD.size)
+            if kind == STRING_ENTRY:
+                (value, offset) = read_prefixed(mapped, offset)
+            elif kind == HASH_ENTRY:
+                (value, offset) = read_fields(mapped, offset)
+            else:
+                raise ValueError(f'unknown snapshot entry kind:{kind} at offset:{offset}')
+            yield kind, key, value, expiry_milliseconds
+
+
+def read_fields(mapped, offset):
+    (count,) = LENGTH.unpack_from(mapped, offset)
+    offset += LENGTH.size
+    values = {}
+    for _ in range(count):
+        (field, offset) = read_prefixed(mapped, offset)
+        (values[field], offset) = read_prefixed(mapped, offset)
+    return values, offset
+
+
+def read_prefixed(mapped, offset):
+    (length,) = LENGTH.unpack_from(mapped, offset)
+    start = offset + LENGTH.size
+    return mapped[start:start + length], start + length
+
+
+def queue_snapshot_entries(pipeline, entries, cluster=False):
+    # hashes are replaced rather than merged into, unexpiring strings go out as MSET
+    unexpiring = {key: value for (kind, key, value, expiry_milliseconds) in entries if kind == STRING_ENTRY and expiry_milliseconds < 0}
+    if len(unexpiring) > 0:
+        queue_set_many(pipeline, unexpiring, {}, cluster)
+    for (kind, key, value, expiry_milliseconds) in entries:
+        if kind == STRING_ENTRY and expiry_milliseconds >= 0:
+            pipeline.set(key, value, px=expiry_milliseconds)
+        elif kind == HASH_ENTRY:
+            pipeline.delete(key)
+            pipeline.hset(key, mapping=value)
+            if expiry_milliseconds >= 0:
+                pipeline.pexpire(key, expiry_milliseconds)
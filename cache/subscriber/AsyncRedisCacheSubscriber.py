@@ -0,0 +1,67 @@
+import asyncio
+import logging
+
+import redis
+import redis.asyncio as redis_asyncio
+
+from cache.subscriber.ChangeCoalescer import ChangeCoalescer
+from cache.subscriber.change_utility import change_channel_prefix, change_channel, parse_change
+from cache.utility.connection_pool_utility import create_async_connection_pool
+from cache.utility.options_utility import check_options
+
+
+class AsyncRedisCacheSubscriber:
+
+    def __init__(self, options, keys=None, patterns=None, coalesce_window=0.05, reconnect_delay=1.0):
+        self.log = logging.getLogger('AsyncRedisCacheSubscriber')
+        check_options(self.log, options, True)
+        self.prefix = change_channel_prefix(options)
+        self.channels = [change_channel(self.prefix, key) for key in (keys or [])]
+        self.patterns = [change_channel(self.prefix, pattern) for pattern in (patterns or [])]
+        self.coalescer = ChangeCoalescer(coalesce_window)
+        self.reconnect_delay = reconnect_delay
+        self.redis_client = redis_asyncio.Redis(connection_pool=create_async_connection_pool(options))
+        self.pubsub = None
+        self.ready = []
+
+    async def subscribe(self):
+        self.pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        if len(self.channels) > 0:
+            await self.pubsub.subscribe(*self.channels)
+        if len(self.patterns) > 0:
+            await self.pubsub.psubscribe(*self.patterns)
+        return self
+
+    async def close(self):
+        await self.__close()
+        await self.redis_client.close(close_connection_pool=True)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while len(self.ready) == 0:
+            try:
+                if self.pubsub is None:
+                    await self.subscribe()
+                await self.__receive()
+            except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError, OSError) as error:
+                # changes published while disconnected are not replayed
+                self.log.warning(f'changes subscription lost, resubscribing [{error}]')
+                await self.__close()
+                await asyncio.sleep(self.reconnect_delay)
+        return self.ready.pop(0)
+
+    async def __receive(self):
+        # idles for the reconnect delay while nothing is pending
+        remaining = self.coalescer.remaining()
+        message = await self.pubsub.get_message(timeout=self.reconnect_delay if remaining is None else remaining)
+        if message is not None:
+            self.coalescer.add(parse_change(self.prefix, message['channel'], message['data']))
+        if self.coalescer.due():
+            self.ready = self.coalescer.drain()
+
+    async def __close(self):
+        if self.pubsub is not None:
+            await self.pubsub.close()
+            self.pubsub = None
@@ -0,0 +1,32 @@
+import time
+
+
+class ChangeCoalescer:
+
+    # keeps the latest event per key & field until the window since the first pending event has elapsed
+    def __init__(self, window):
+        self.window = window
+        self.pending = {}
+        self.first_pending_at = None
+
+    def add(self, event):
+        if self.first_pending_at is None:
+            self.first_pending_at = time.monotonic()
+        # changes to different fields of one hash are delivered separately
+        self.pending.pop((event.key, event.field), None)
+        self.pending[(event.key, event.field)] = event
+
+    def remaining(self):
+        # None while nothing is pending
+        if self.first_pending_at is None:
+            return None
+        return max(0.0, self.first_pending_at + self.window - time.monotonic())
+
+    def due(self):
+        return self.first_pending_at is not None and self.remaining() == 0.0
+
+    def drain(self):
+        events = list(self.pending.values())
+        self.pending = {}
+        self.first_pending_at = None
+        return events
@@ -0,0 +1,12 @@
+class ChangeEvent:
+
+    def __init__(self, key, operation, field=None):
+        self.key = key
+        self.operation = operation
+        self.field = field
+
+    def __eq__(self, other):
+        return isinstance(other, ChangeEvent) and (self.key, self.operation, self.field) == (other.key, other.operation, other.field)
+
+    def __repr__(self):
+        return f'ChangeEvent(key={self.key}, operation={self.operation}, field={self.field})'
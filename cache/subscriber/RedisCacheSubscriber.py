@@ -0,0 +1,80 @@
+import logging
+import threading
+
+import redis
+
+from cache.subscriber.ChangeCoalescer import ChangeCoalescer
+from cache.subscriber.change_utility import change_channel_prefix, change_channel, parse_change
+from cache.utility.options_utility import check_options
+from cache.utility.topology_utility import get_clients
+
+
+class RedisCacheSubscriber:
+
+    def __init__(self, options, callback, keys=None, patterns=None, coalesce_window=0.05, reconnect_delay=1.0):
+        self.log = logging.getLogger('RedisCacheSubscriber')
+        check_options(self.log, options, True)
+        self.callback = callback
+        self.prefix = change_channel_prefix(options)
+        self.channels = [change_channel(self.prefix, key) for key in (keys or [])]
+        self.patterns = [change_channel(self.prefix, pattern) for pattern in (patterns or [])]
+        self.coalescer = ChangeCoalescer(coalesce_window)
+        self.reconnect_delay = reconnect_delay
+        # changes are published on the primary (cluster & sentinel setups included)
+        self.redis_client = get_clients(options)[0]
+        self.pubsub = None
+        self.stopped = threading.Event()
+        self.subscribed = threading.Event()
+        self.thread = threading.Thread(target=self.run, name='cache-change-subscriber', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join(timeout=self.reconnect_delay * 2)
+        self.__close()
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                self.__subscribe()
+                while not self.stopped.is_set():
+                    self.__receive()
+            except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError, OSError) as error:
+                # changes published while disconnected are not replayed
+                self.log.warning(f'changes subscription lost, resubscribing [{error}]')
+                self.subscribed.clear()
+                self.__close()
+                self.stopped.wait(self.reconnect_delay)
+
+    def __subscribe(self):
+        self.pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        if len(self.channels) > 0:
+            self.pubsub.subscribe(*self.channels)
+        if len(self.patterns) > 0:
+            self.pubsub.psubscribe(*self.patterns)
+        self.subscribed.set()
+        self.log.info(f'subscribed to changes channels:{self.channels} patterns:{self.patterns}')
+
+    def __receive(self):
+        # idles for the reconnect delay while nothing is pending (stop is noticed in between)
+        remaining = self.coalescer.remaining()
+        message = self.pubsub.get_message(timeout=self.reconnect_delay if remaining is None else remaining)
+        if message is not None:
+            self.coalescer.add(parse_change(self.prefix, message['channel'], message['data']))
+        if self.coalescer.due():
+            self.__deliver(self.coalescer.drain())
+
+    def __close(self):
+        if self.pubsub is not None:
+            self.pubsub.close()
+            self.pubsub = None
+
+    def __deliver(self, events):
+        for event in events:
+            try:
+                self.callback(event)
+            except Exception as error:
+                self.log.warning(f'change callback failed for {event} [{error}]')
@@ -0,0 +1,29 @@
+from cache.subscriber.ChangeEvent import ChangeEvent
+from cache.utility.bytes_utility import as_text
+
+REDIS_PUBLISH_CHANGES = 'REDIS_PUBLISH_CHANGES'
+REDIS_CHANGE_CHANNEL_PREFIX = 'REDIS_CHANGE_CHANNEL_PREFIX'
+
+DEFAULT_CHANGE_CHANNEL_PREFIX = 'change:'
+
+
+def publish_changes_enabled(options):
+    return options is not None and options.get(REDIS_PUBLISH_CHANGES, False) is True
+
+
+def change_channel_prefix(options):
+    return DEFAULT_CHANGE_CHANNEL_PREFIX if options is None else options.get(REDIS_CHANGE_CHANNEL_PREFIX, DEFAULT_CHANGE_CHANNEL_PREFIX)
+
+
+def change_channel(prefix, key):
+    return f'{prefix}{key}'
+
+
+def change_message(operation, field=None):
+    return operation if field is None else f'{operation}:{field}'
+
+
+def parse_change(prefix, channel, data):
+    (operation, _, field) = as_text(data).partition(':')
+    return ChangeEvent(as_text(channel)[len(prefix):], operation, field if len(field) > 0 else None)
+
@@ -0,0 +1,41 @@
+import numpy
+
+# 64 bit values take up to 10 varint bytes, 9 hold 63 bits (decoded values of 10 bytes are left to python)
+VARINT_GROUPS = numpy.arange(10, dtype=numpy.uint64)
+VARINT_SHIFTS = VARINT_GROUPS * numpy.uint64(7)
+INT64_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+
+def fits_int64(numbers):
+    return len(numbers) == 0 or (min(numbers) >= INT64_RANGE[0] and max(numbers) <= INT64_RANGE[1])
+
+
+def pack_bigfloat_columns(decimals, numbers) -> bytes:
+    # decimal places & scaled numbers as int64 columns, zigzagged, interleaved and varint encoded in one pass
+    numbers = numpy.array(numbers, dtype=numpy.int64)
+    zigzagged = ((numbers << 1) ^ (numbers >> 63)).view(numpy.uint64)
+    values = numpy.empty(len(numbers) * 2, dtype=numpy.uint64)
+    values[0::2] = numpy.array(decimals, dtype=numpy.uint64)
+    values[1::2] = zigzagged
+    groups = values[:, None] >> VARINT_SHIFTS
+    lengths = numpy.maximum((groups != 0).sum(axis=1), 1)[:, None]
+    continued = (VARINT_GROUPS < (lengths - 1)).astype(numpy.uint64) << numpy.uint64(7)
+    encoded = ((groups & numpy.uint64(0x7f)) | continued).astype(numpy.uint8)
+    return encoded[VARINT_GROUPS < lengths].tobytes()
+
+
+def unpack_bigfloat_columns(packed: bytes):
+    # (decimals, numbers) lists, None for payloads holding values beyond 63 bits or not ending on a whole pair
+    data = numpy.frombuffer(packed, dtype=numpy.uint8)
+    ends = data < 0x80
+    if len(data) == 0 or not ends[-1] or numpy.count_nonzero(ends) % 2 != 0:
+        return None
+    starts = numpy.flatnonzero(numpy.concatenate(([True], ends[:-1])))
+    positions = numpy.arange(len(data)) - numpy.repeat(starts, numpy.diff(numpy.append(starts, len(data))))
+    if positions.max() > 8:
+        return None
+    contributions = (data & 0x7f).astype(numpy.uint64) << (positions.astype(numpy.uint64) * numpy.uint64(7))
+    values = numpy.add.reduceat(contributions, starts)
+    zigzagged = values[1::2]
+    numbers = (zigzagged >> numpy.uint64(1)).astype(numpy.int64) ^ -(zigzagged & numpy.uint64(1)).astype(numpy.int64)
+    return values[0::2].tolist(), numbers.tolist()
@@ -1,20 +1,109 @@
-import re
-
 from core.number.BigFloat import BigFloat
 
+# arrays from this size are packed by numpy (when installed), smaller ones are quicker one value at a time
+VECTORIZED_MIN_SIZE = 64
+
 
 def crack_to_serialize(bigfloat: BigFloat):
     if str(bigfloat) == '0.0':
         return 0, 0, 0
     (number_str, decimal_str) = bigfloat.crack()
-    match_leading_zeros = re.search('(^0+)', decimal_str)
-    decimal_leading_zeros = len(match_leading_zeros.group(1)) if match_leading_zeros else 0
+    decimal_leading_zeros = len(decimal_str) - len(decimal_str.lstrip('0'))
     return int(number_str), int(decimal_str), decimal_leading_zeros
 
 
 def join_to_deserialize(number, decimal, leading_decimal_zeros):
-    complete_number = f'{number}.{decimal}'
-    if leading_decimal_zeros > 0:
-        zero_padding = ''.rjust(leading_decimal_zeros, '0')
-        complete_number = f'{number}.{zero_padding}{decimal}'
-    return BigFloat(complete_number)
+    zero_padding = '0' * leading_decimal_zeros
+    return BigFloat(f'{number}.{zero_padding}{decimal}')
+
+
+def to_decimal_string(bigfloat: BigFloat):
+    # str(BigFloat) renders values between -1 and 0 without a leading sign
+    decimals = bigfloat.decimals
+    digits = str(-bigfloat.number if bigfloat.number < 0 else bigfloat.number).rjust(decimals + 1, '0')
+    text = digits if decimals == 0 else f'{digits[:-decimals]}.{digits[-decimals:]}'
+    return f'-{text}' if bigfloat.number < 0 else text
+
+
+def zigzag(number):
+    # signed scaled numbers as unsigned, small magnitudes of either sign stay short
+    return number << 1 if number >= 0 else (-number << 1) - 1
+
+
+def unzigzag(value):
+    return -((value + 1) >> 1) if value & 1 else value >> 1
+
+
+def write_varint(value, packed: bytearray):
+    while value > 0x7f:
+        packed.append(value & 0x7f | 0x80)
+        value >>= 7
+    packed.append(value)
+
+
+def read_varint(packed, offset):
+    value = shift = 0
+    while True:
+        byte = packed[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def write_bigfloat(bigfloat: BigFloat, packed: bytearray):
+    # varint layout: decimal places, zigzag scaled number (27123.45 packs into 5 bytes)
+    write_varint(bigfloat.decimals, packed)
+    write_varint(zigzag(bigfloat.number), packed)
+
+
+def read_bigfloat(packed, offset):
+    (decimals, offset) = read_varint(packed, offset)
+    (number, offset) = read_varint(packed, offset)
+    return BigFloat(unzigzag(number), decimals), offset
+
+
+def pack_bigfloat(bigfloat: BigFloat) -> bytes:
+    packed = bytearray()
+    write_bigfloat(bigfloat, packed)
+    return bytes(packed)
+
+
+def unpack_bigfloat(packed: bytes) -> BigFloat:
+    return read_bigfloat(packed, 0)[0]
+
+
+def bigfloat_array_utility():
+    try:
+        import cache.utility.BigFloat_array_utility as array_utility
+        return array_utility
+    except ImportError:
+        return None
+
+
+def pack_bigfloats(bigfloats) -> bytes:
+    # same layout either way, values beyond 64 bits are packed one at a time
+    bigfloats = list(bigfloats)
+    array_utility = bigfloat_array_utility() if len(bigfloats) >= VECTORIZED_MIN_SIZE else None
+    if array_utility is not None:
+        numbers = [bigfloat.number for bigfloat in bigfloats]
+        if array_utility.fits_int64(numbers):
+            return array_utility.pack_bigfloat_columns([bigfloat.decimals for bigfloat in bigfloats], numbers)
+    packed = bytearray()
+    for bigfloat in bigfloats:
+        write_bigfloat(bigfloat, packed)
+    return bytes(packed)
+
+
+def unpack_bigfloats(packed: bytes):
+    array_utility = bigfloat_array_utility() if len(packed) >= VECTORIZED_MIN_SIZE * 2 else None
+    columns = None if array_utility is None else array_utility.unpack_bigfloat_columns(packed)
+    if columns is not None:
+        return [BigFloat(number, decimals) for decimals, number in zip(*columns)]
+    bigfloats = []
+    offset = 0
+    while offset < len(packed):
+        (bigfloat, offset) = read_bigfloat(packed, offset)
+        bigfloats.append(bigfloat)
+    return bigfloats
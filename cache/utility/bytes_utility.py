@@ -0,0 +1,8 @@
+def as_text(value):
+    # raw bytes mode replies are only decoded where text is required
+    return value.decode() if type(value) is bytes else value
+
+
+def as_bytes(value):
+    # surrogate escaped binary payloads encode back to their stored bytes
+    return value.encode('utf-8', 'surrogateescape') if type(value) is str else value
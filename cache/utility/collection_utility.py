@@ -0,0 +1,15 @@
+import itertools
+
+
+def chunk_mapping(mapping: dict, chunk_size):
+    items = list(mapping.items())
+    for start in range(0, len(items), chunk_size):
+        yield dict(items[start:start + chunk_size])
+
+
+def chunk_iterable(iterable, chunk_size):
+    iterator = iter(iterable)
+    chunk = list(itertools.islice(iterator, chunk_size))
+    while len(chunk) > 0:
+        yield chunk
+        chunk = list(itertools.islice(iterator, chunk_size))
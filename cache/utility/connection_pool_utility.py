@@ -0,0 +1,92 @@
+import threading
+
+import redis
+import redis.asyncio as redis_asyncio
+
+from cache.utility.fork_utility import register_reset_after_fork
+from cache.utility.options_utility import REDIS_SERVER_ADDRESS, REDIS_SERVER_PORT, REDIS_UNIX_SOCKET_PATH
+
+REDIS_MAX_CONNECTIONS = 'REDIS_MAX_CONNECTIONS'
+REDIS_SOCKET_TIMEOUT = 'REDIS_SOCKET_TIMEOUT'
+REDIS_SOCKET_CONNECT_TIMEOUT = 'REDIS_SOCKET_CONNECT_TIMEOUT'
+REDIS_SOCKET_KEEPALIVE = 'REDIS_SOCKET_KEEPALIVE'
+REDIS_HEALTH_CHECK_INTERVAL = 'REDIS_HEALTH_CHECK_INTERVAL'
+REDIS_RAW_BYTES = 'REDIS_RAW_BYTES'
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def connection_pool_settings(options):
+    settings = connection_settings(options)
+    if REDIS_UNIX_SOCKET_PATH in options:
+        # unix domain socket connections have no TCP connect timeout or keepalive
+        settings['path'] = options[REDIS_UNIX_SOCKET_PATH]
+        return settings
+    settings['host'] = options[REDIS_SERVER_ADDRESS]
+    settings['port'] = int(options[REDIS_SERVER_PORT])
+    return settings | tcp_connection_settings(options)
+
+
+def raw_bytes_from_options(options):
+    return options is not None and options.get(REDIS_RAW_BYTES, False) is True
+
+
+def connection_settings(options):
+    settings = {'decode_responses': not raw_bytes_from_options(options)}
+    if settings['decode_responses']:
+        # binary payloads are sent as raw bytes, decoding keeps their non utf-8 bytes surrogate escaped
+        settings['encoding_errors'] = 'surrogateescape'
+    if REDIS_MAX_CONNECTIONS in options:
+        settings['max_connections'] = int(options[REDIS_MAX_CONNECTIONS])
+    if REDIS_SOCKET_TIMEOUT in options:
+        settings['socket_timeout'] = float(options[REDIS_SOCKET_TIMEOUT])
+    if REDIS_HEALTH_CHECK_INTERVAL in options:
+        settings['health_check_interval'] = int(options[REDIS_HEALTH_CHECK_INTERVAL])
+    return settings
+
+
+def tcp_connection_settings(options):
+    settings = {}
+    if REDIS_SOCKET_CONNECT_TIMEOUT in options:
+        settings['socket_connect_timeout'] = float(options[REDIS_SOCKET_CONNECT_TIMEOUT])
+    if REDIS_SOCKET_KEEPALIVE in options:
+        settings['socket_keepalive'] = options[REDIS_SOCKET_KEEPALIVE] is True
+    return settings
+
+
+def get_connection_pool(options) -> redis.ConnectionPool:
+    settings = connection_pool_settings(options)
+    pool_key = tuple(sorted(settings.items()))
+    with _pools_lock:
+        if pool_key not in _pools:
+            _pools[pool_key] = redis.ConnectionPool(**_with_connection_class(settings, redis.UnixDomainSocketConnection))
+        return _pools[pool_key]
+
+
+def create_async_connection_pool(options) -> redis_asyncio.ConnectionPool:
+    # async connections belong to the event loop they were opened on, each async provider owns (and closes) its pool
+    return redis_asyncio.ConnectionPool(**_with_connection_class(connection_pool_settings(options), redis_asyncio.UnixDomainSocketConnection))
+
+
+def release_connection_pools():
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.disconnect()
+        _pools.clear()
+
+
+def _reset_pools_after_fork():
+    # the parent keeps using its sockets, the child only forgets them
+    global _pools_lock
+    _pools_lock = threading.Lock()
+    _pools.clear()
+
+
+def _with_connection_class(settings, unix_connection_class):
+    if 'path' in settings:
+        settings['connection_class'] = unix_connection_class
+    return settings
+
+
+register_reset_after_fork(_reset_pools_after_fork)
@@ -0,0 +1,39 @@
+REDIS_DEFAULT_TTL = 'REDIS_DEFAULT_TTL'
+
+
+def default_ttl_from_options(options):
+    ttl = options.get(REDIS_DEFAULT_TTL) if options is not None else None
+    return None if ttl is None else check_ttl(float(ttl))
+
+
+def effective_ttl(ttl, default_ttl):
+    return default_ttl if ttl is None else check_ttl(ttl)
+
+
+def check_ttl(ttl):
+    # SET rejects a zero or negative expiry while EXPIRE deletes the key
+    if ttl <= 0:
+        raise ValueError(f'ttl:{ttl} must be positive, leave it out to store without expiry')
+    return ttl
+
+
+def expiry_milliseconds(ttl):
+    return int(round(ttl * 1000))
+
+
+def expiry_arguments(ttl):
+    # whole seconds go out as SET EX, anything finer as SET PX
+    if ttl is None:
+        return {}
+    if float(ttl).is_integer():
+        return {'ex': int(ttl)}
+    return {'px': expiry_milliseconds(ttl)}
+
+
+def queue_set_many(pipeline, serialized_values, expiry, cluster=False):
+    # MSET cannot carry an expiry and cluster pipelines block it, those values are queued as individual SETs
+    if len(expiry) == 0 and not cluster:
+        pipeline.mset(serialized_values)
+        return
+    for key, value in serialized_values.items():
+        pipeline.set(key, value, **expiry)
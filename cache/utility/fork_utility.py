@@ -0,0 +1,7 @@
+import os
+
+
+def register_reset_after_fork(callback):
+    # a forked child must not reuse the parent's sockets (or locks held at fork time)
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=callback)
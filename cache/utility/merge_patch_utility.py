@@ -0,0 +1,10 @@
+def merge_patch(target: dict, patch: dict):
+    # JSON merge patch (RFC 7396), None removes a member, untouched members are kept as they are
+    for name, value in patch.items():
+        if value is None:
+            target.pop(name, None)
+        elif type(value) is dict:
+            target[name] = merge_patch(target[name] if type(target.get(name)) is dict else {}, value)
+        else:
+            target[name] = value
+    return target
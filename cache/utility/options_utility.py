@@ -0,0 +1,25 @@
+from core.options.exception.MissingOptionError import MissingOptionError
+
+REDIS_SERVER_ADDRESS = 'REDIS_SERVER_ADDRESS'
+REDIS_SERVER_PORT = 'REDIS_SERVER_PORT'
+REDIS_UNIX_SOCKET_PATH = 'REDIS_UNIX_SOCKET_PATH'
+REDIS_CLUSTER_NODES = 'REDIS_CLUSTER_NODES'
+REDIS_SENTINEL_NODES = 'REDIS_SENTINEL_NODES'
+REDIS_SENTINEL_SERVICE_NAME = 'REDIS_SENTINEL_SERVICE_NAME'
+
+
+def check_options(log, options, auto_connect):
+    if options is None:
+        log.warning(f'missing option please provide options {REDIS_SERVER_ADDRESS} and {REDIS_SERVER_PORT}')
+        raise MissingOptionError(f'missing option please provide options {REDIS_SERVER_ADDRESS} and {REDIS_SERVER_PORT}')
+    if auto_connect is True and REDIS_SENTINEL_NODES in options and REDIS_SENTINEL_SERVICE_NAME not in options:
+        log.warning(f'missing option please provide option {REDIS_SENTINEL_SERVICE_NAME}')
+        raise MissingOptionError(f'missing option please provide option {REDIS_SENTINEL_SERVICE_NAME}')
+    # cluster & sentinel setups are addressed through their node lists
+    if auto_connect is True and not any(option in options for option in [REDIS_UNIX_SOCKET_PATH, REDIS_CLUSTER_NODES, REDIS_SENTINEL_NODES]):
+        if REDIS_SERVER_ADDRESS not in options:
+            log.warning(f'missing option please provide option {REDIS_SERVER_ADDRESS}')
+            raise MissingOptionError(f'missing option please provide option {REDIS_SERVER_ADDRESS}')
+        if REDIS_SERVER_PORT not in options:
+            log.warning(f'missing option please provide option {REDIS_SERVER_PORT}')
+            raise MissingOptionError(f'missing option please provide option {REDIS_SERVER_PORT}')
@@ -0,0 +1,72 @@
+import threading
+
+import redis
+from redis.cluster import RedisCluster, ClusterNode
+from redis.sentinel import Sentinel
+
+from cache.utility.connection_pool_utility import get_connection_pool, connection_settings, tcp_connection_settings
+from cache.utility.fork_utility import register_reset_after_fork
+from cache.utility.options_utility import REDIS_CLUSTER_NODES, REDIS_SENTINEL_NODES, REDIS_SENTINEL_SERVICE_NAME
+
+REDIS_READ_FROM_REPLICAS = 'REDIS_READ_FROM_REPLICAS'
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def is_cluster(options):
+    return options is not None and REDIS_CLUSTER_NODES in options
+
+
+def is_sentinel(options):
+    return options is not None and REDIS_SENTINEL_NODES in options
+
+
+def read_from_replicas(options):
+    return options.get(REDIS_READ_FROM_REPLICAS, False) is True
+
+
+def parse_nodes(nodes):
+    if type(nodes) is str:
+        nodes = [node.strip() for node in nodes.split(',') if len(node.strip()) > 0]
+    parsed_nodes = []
+    for node in nodes:
+        (host, port) = node.rsplit(':', 1) if type(node) is str else node
+        parsed_nodes.append((host, int(port)))
+    return parsed_nodes
+
+
+def get_clients(options):
+    # (primary client, replica client or None when reads go to the primary)
+    if not is_cluster(options) and not is_sentinel(options):
+        return redis.Redis(connection_pool=get_connection_pool(options)), None
+    settings = connection_settings(options) | tcp_connection_settings(options)
+    client_key = (tuple(parse_nodes(options.get(REDIS_CLUSTER_NODES, options.get(REDIS_SENTINEL_NODES)))),
+                  options.get(REDIS_SENTINEL_SERVICE_NAME), read_from_replicas(options), tuple(sorted(settings.items())))
+    with _clients_lock:
+        if client_key not in _clients:
+            _clients[client_key] = _cluster_clients(options, settings) if is_cluster(options) else _sentinel_clients(options, settings)
+        return _clients[client_key]
+
+
+def _reset_clients_after_fork():
+    global _clients_lock
+    _clients_lock = threading.Lock()
+    _clients.clear()
+
+
+def _cluster_clients(options, settings):
+    # the cluster client routes reads to replicas itself
+    startup_nodes = [ClusterNode(host, port) for (host, port) in parse_nodes(options[REDIS_CLUSTER_NODES])]
+    return RedisCluster(startup_nodes=startup_nodes, read_from_replicas=read_from_replicas(options), **settings), None
+
+
+def _sentinel_clients(options, settings):
+    sentinel_settings = {name: value for name, value in settings.items() if name == 'socket_timeout'} | tcp_connection_settings(options)
+    sentinel = Sentinel(parse_nodes(options[REDIS_SENTINEL_NODES]), sentinel_kwargs=sentinel_settings, **settings)
+    service_name = options[REDIS_SENTINEL_SERVICE_NAME]
+    replica_client = sentinel.slave_for(service_name) if read_from_replicas(options) else None
+    return sentinel.master_for(service_name), replica_client
+
+
+register_reset_after_fork(_reset_clients_after_fork)
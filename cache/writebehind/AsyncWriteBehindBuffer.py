@@ -0,0 +1,52 @@
+import asyncio
+import logging
+
+from cache.writebehind.WriteBuffer import WriteBuffer
+
+
+class AsyncWriteBehindBuffer(WriteBuffer):
+
+    # flushed every interval (or once max pending is reached) from a task of the running loop, stop() flushes the rest,
+    # the task is (re)started by the first write after construction or stop()
+    def __init__(self, flush, interval, max_pending):
+        super().__init__(max_pending)
+        self.log = logging.getLogger('AsyncWriteBehindBuffer')
+        self.flush = flush
+        self.interval = interval
+        self.wake = None
+        self.stopped = False
+        self.task = None
+        self.flush_lock = asyncio.Lock()
+
+    def written(self):
+        if self.task is None or self.task.done():
+            self.stopped = False
+            self.wake = asyncio.Event()
+            self.task = asyncio.get_running_loop().create_task(self.run())
+        if self.full():
+            self.wake.set()
+
+    async def stop(self):
+        self.stopped = True
+        if self.task is not None:
+            self.wake.set()
+            await self.task
+            self.task = None
+        await self.flush_quietly()
+
+    async def run(self):
+        while not self.stopped:
+            try:
+                await asyncio.wait_for(self.wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wake.clear()
+            await self.flush_quietly()
+
+    async def flush_quietly(self):
+        if self.pending == 0:
+            return
+        try:
+            await self.flush()
+        except Exception as error:
+            self.log.warning(f'write behind flush failed [{error}]')
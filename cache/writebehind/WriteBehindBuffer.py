@@ -0,0 +1,63 @@
+import atexit
+import logging
+import threading
+
+from cache.writebehind.WriteBuffer import WriteBuffer
+
+
+class WriteBehindBuffer(WriteBuffer):
+
+    # flushed every interval (or once max pending is reached) from a background thread and on exit,
+    # the thread is (re)started by the first write after construction, stop() or a fork
+    def __init__(self, flush, interval, max_pending):
+        super().__init__(max_pending)
+        self.log = logging.getLogger('WriteBehindBuffer')
+        self.flush = flush
+        self.interval = interval
+        self.wake = threading.Event()
+        self.stopped = threading.Event()
+        self.start_lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.thread = None
+
+    def written(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.start()
+        if self.full():
+            self.wake.set()
+
+    def start(self):
+        with self.start_lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            if self.thread is not None:
+                # the thread did not survive a fork, locks held by the parent's threads at fork time are never released
+                (self.lock, self.flush_lock) = (threading.Lock(), threading.Lock())
+            self.stopped.clear()
+            self.thread = threading.Thread(target=self.run, name='cache-write-behind', daemon=True)
+            self.thread.start()
+            atexit.register(self.stop)
+
+    def stop(self):
+        self.stopped.set()
+        self.wake.set()
+        with self.start_lock:
+            if self.thread is not None:
+                self.thread.join()
+                self.thread = None
+                atexit.unregister(self.stop)
+        self.flush_quietly()
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.wake.wait(self.interval)
+            self.wake.clear()
+            self.flush_quietly()
+
+    def flush_quietly(self):
+        if self.pending == 0:
+            return
+        try:
+            self.flush()
+        except Exception as error:
+            self.log.warning(f'write behind flush failed [{error}]')
@@ -0,0 +1,113 @@
+import threading
+
+from cache.nearcache.NearCache import MISSING
+
+
+class WriteBuffer:
+
+    # pending writes, only the latest value per key (and per hash field) is kept
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+        self.lock = threading.Lock()
+        self.values = {}
+        self.fields = {}
+        self.pending = 0
+        # drained writes stay readable until their flush completes (one flush at a time, see flush_lock)
+        self.flushing_values = {}
+        self.flushing_fields = {}
+
+    def put(self, key, value, expiry):
+        with self.lock:
+            # a SET replaces the key, pending hash fields of it are superseded
+            if key in self.fields:
+                self.pending -= len(self.fields.pop(key)[0])
+            if key not in self.values:
+                self.pending += 1
+            self.values[key] = (value, expiry)
+        self.written()
+
+    def put_field(self, key, field, value, expiry_milliseconds):
+        with self.lock:
+            (fields, pending_expiry) = self.fields.get(key, ({}, None))
+            if field not in fields:
+                self.pending += 1
+            fields[field] = value
+            # a write without expiry leaves the pending one (as HSET leaves the key expiry)
+            self.fields[key] = (fields, pending_expiry if expiry_milliseconds is None else expiry_milliseconds)
+        self.written()
+
+    def written(self):
+        pass
+
+    def pending_value(self, key):
+        # latest buffered (or still flushing) value of a key, MISSING when none is pending
+        with self.lock:
+            if key in self.values:
+                return self.values[key][0]
+            if key in self.fields:
+                return MISSING
+            return self.flushing_values[key][0] if key in self.flushing_values else MISSING
+
+    def pending_field(self, key, field):
+        with self.lock:
+            if key in self.fields and field in self.fields[key][0]:
+                return self.fields[key][0][field]
+            if key in self.values:
+                return MISSING
+            return self.flushing_fields[key][0].get(field, MISSING) if key in self.flushing_fields else MISSING
+
+    def full(self):
+        return self.pending >= self.max_pending
+
+    def busy(self):
+        # writes pending or on their way to redis
+        return self.pending > 0 or len(self.flushing_values) > 0 or len(self.flushing_fields) > 0
+
+    def discard(self, *keys):
+        with self.lock:
+            for key in keys:
+                if key in self.values:
+                    del self.values[key]
+                    self.pending -= 1
+                if key in self.fields:
+                    self.pending -= len(self.fields.pop(key)[0])
+                self.flushing_values.pop(key, None)
+                self.flushing_fields.pop(key, None)
+
+    def discard_field(self, key, field):
+        with self.lock:
+            if key in self.fields and field in self.fields[key][0]:
+                del self.fields[key][0][field]
+                self.pending -= 1
+            if key in self.flushing_fields:
+                (flushing_fields, expiry_milliseconds) = self.flushing_fields[key]
+                self.flushing_fields[key] = ({f: v for f, v in flushing_fields.items() if f != field}, expiry_milliseconds)
+
+    def drain(self):
+        # drained writes are read from here until flushed() (or restore()) is called for them
+        with self.lock:
+            (values, fields) = (self.values, self.fields)
+            (self.values, self.fields, self.pending) = ({}, {}, 0)
+            (self.flushing_values, self.flushing_fields) = (dict(values), dict(fields))
+        return values, fields
+
+    def flushed(self):
+        with self.lock:
+            (self.flushing_values, self.flushing_fields) = ({}, {})
+
+    def restore(self, values, fields):
+        # writes that failed to flush go back unless they were superseded meanwhile
+        with self.lock:
+            # keys & fields discarded while flushing stay discarded
+            values = {key: value for key, value in values.items() if key in self.flushing_values}
+            fields = {key: self.flushing_fields[key] for key in fields.keys() if key in self.flushing_fields}
+            (self.flushing_values, self.flushing_fields) = ({}, {})
+            for key, value in values.items():
+                if key not in self.values and key not in self.fields:
+                    self.values[key] = value
+            for key, (restored_fields, expiry_milliseconds) in fields.items():
+                if key in self.values:
+                    continue
+                (pending_fields, pending_expiry) = self.fields.get(key, ({}, expiry_milliseconds))
+                self.fields[key] = ({**restored_fields, **pending_fields}, pending_expiry)
+            self.pending = len(self.values) + sum(len(pending_fields) for (pending_fields, _) in self.fields.values())
@@ -0,0 +1,38 @@
+import redis
+
+from cache.utility.expiry_utility import queue_set_many
+
+REDIS_WRITE_BEHIND = 'REDIS_WRITE_BEHIND'
+REDIS_WRITE_BEHIND_INTERVAL = 'REDIS_WRITE_BEHIND_INTERVAL'
+REDIS_WRITE_BEHIND_MAX_PENDING = 'REDIS_WRITE_BEHIND_MAX_PENDING'
+
+DEFAULT_WRITE_BEHIND_INTERVAL = 0.1
+DEFAULT_WRITE_BEHIND_MAX_PENDING = 1000
+
+# a flush failing on these is retried with the next flush, anything else is dropped
+RETRIED_FLUSH_ERRORS = (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError)
+
+
+def write_behind_enabled(options):
+    return options is not None and options.get(REDIS_WRITE_BEHIND, False) is True
+
+
+def build_write_behind(options, buffer_class, flush):
+    interval = float(options.get(REDIS_WRITE_BEHIND_INTERVAL, DEFAULT_WRITE_BEHIND_INTERVAL))
+    max_pending = int(options.get(REDIS_WRITE_BEHIND_MAX_PENDING, DEFAULT_WRITE_BEHIND_MAX_PENDING))
+    return buffer_class(flush, interval, max_pending)
+
+
+def queue_buffered_writes(pipeline, values, fields, cluster=False):
+    # values without expiry go out as MSET, the rest as individual SETs
+    unexpiring = {key: value for key, (value, expiry) in values.items() if len(expiry) == 0}
+    if len(unexpiring) > 0:
+        queue_set_many(pipeline, unexpiring, {}, cluster)
+    for key, (value, expiry) in values.items():
+        if len(expiry) > 0:
+            pipeline.set(key, value, **expiry)
+    for key, (key_fields, expiry_milliseconds) in fields.items():
+        if len(key_fields) > 0:
+            pipeline.hset(key, mapping=key_fields)
+            if expiry_milliseconds is not None:
+                pipeline.pexpire(key, expiry_milliseconds)
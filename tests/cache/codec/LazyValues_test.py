@@ -0,0 +1,37 @@
+import unittest
+
+from cache.codec.LazyValues import LazyValues
+from cache.codec.ValueCodec import ValueCodec
+
+
+class LazyValuesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.decoded = []
+
+        def decode(value):
+            self.decoded.append(value)
+            return ValueCodec.deserialize_value(value)
+
+        self.lazy_values = LazyValues({'A': '{"A": "1"}', 'B': '2'}, decode)
+
+    def test_should_not_decode_before_access(self):
+        self.assertEqual(len(self.lazy_values), 2)
+        self.assertTrue('A' in self.lazy_values)
+        self.assertEqual(list(self.lazy_values), ['A', 'B'])
+        self.assertEqual(self.decoded, [])
+
+    def test_should_decode_value_once_on_first_access(self):
+        self.assertEqual(self.lazy_values['A'], {'A': '1'})
+        self.assertEqual(self.lazy_values['A'], {'A': '1'})
+        self.assertEqual(self.decoded, ['{"A": "1"}'])
+
+    def test_should_behave_as_mapping(self):
+        self.assertEqual(dict(self.lazy_values), {'A': {'A': '1'}, 'B': '2'})
+        self.assertIsNone(self.lazy_values.get('Z'))
+        with self.assertRaises(KeyError):
+            _ = self.lazy_values['Z']
+
+
+if __name__ == '__main__':
+    unittest.main()
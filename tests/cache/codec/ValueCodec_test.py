@@ -0,0 +1,162 @@
+import unittest
+from dataclasses import dataclass
+
+from core.constants.not_available import NOT_AVAILABLE
+from core.number.BigFloat import BigFloat
+
+from cache.codec.ValueCodec import ValueCodec
+from cache.serializer.JsonSerializer import JsonSerializer
+
+
+@dataclass
+class Position:
+    instrument: str
+    quantity: BigFloat
+
+
+class ValueCodecTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.codec = ValueCodec()
+
+    def test_should_serialize_bigfloat_as_string(self):
+        self.assertEqual(self.codec.serialize('key', BigFloat('1000000000.000000000012')), '1000000000.000000000012')
+
+    def test_should_serialize_dict_as_compact_json(self):
+        self.assertEqual(self.codec.serialize('key', {'B': 2, 'A': '1'}), '{"A": "1", "B": 2}')
+
+    def test_should_serialize_other_values_as_is(self):
+        self.assertEqual(self.codec.serialize('key', 10), 10)
+        self.assertEqual(self.codec.serialize('key', 'bar'), 'bar')
+
+    def test_should_deserialize_as_type(self):
+        self.assertEqual(self.codec.deserialize('key', '10', int), 10)
+        self.assertEqual(self.codec.deserialize('key', '100.12', float), 100.12)
+        self.assertEqual(str(self.codec.deserialize('key', '1.000000000012', BigFloat)), '1.000000000012')
+        self.assertEqual(self.codec.deserialize('key', '{"A": "1"}', dict), {'A': '1'})
+        self.assertEqual(self.codec.deserialize('key', 'bar'), 'bar')
+
+    def test_should_deserialize_none_and_not_available(self):
+        self.assertIsNone(self.codec.deserialize('key', None, int))
+        self.assertIsNone(self.codec.deserialize('key', None, dict))
+        self.assertEqual(self.codec.deserialize('key', NOT_AVAILABLE, float), NOT_AVAILABLE)
+
+    def test_should_serialize_values_using_default_and_custom_key(self):
+        self.assertEqual(self.codec.serialize_values([{'A': '1'}]), {'A': '{"A": "1"}'})
+        values = self.codec.serialize_values([{'name': 'A', 'context': 'M'}], custom_key=lambda v: f'{v["name"]}{v["context"]}')
+        self.assertEqual(values, {'AM': '{"context": "M", "name": "A"}'})
+        self.assertEqual(self.codec.serialize_values({'A': '1', 'B': {'C': 2}}), {'A': '1', 'B': '{"C": 2}'})
+
+    def test_should_deserialize_values_as_dict_and_list(self):
+        stored_values = {'A': '{"A": "1"}', 'B': '{"B": "2"}'}
+        self.assertEqual(self.codec.deserialize_values(stored_values, dict), {'A': {'A': '1'}, 'B': {'B': '2'}})
+        self.assertEqual(self.codec.deserialize_values(stored_values, list), [{'A': '1'}, {'B': '2'}])
+
+    def test_should_deserialize_value_of_key(self):
+        self.assertEqual(self.codec.deserialize_value_of_key('B', '{"B": "2"}'), '2')
+        self.assertEqual(self.codec.deserialize_value_of_key('A', '["X", "0A"]'), ['X', '0A'])
+        self.assertIsNone(self.codec.deserialize_value_of_key('A', None))
+
+    def test_should_write_marked_values_with_serializer(self):
+        codec = ValueCodec(JsonSerializer())
+        self.assertEqual(codec.serialize('key', {'A': '1'}), '\x00J{"A": "1"}')
+        self.assertEqual(codec.serialize_value(['X']), '\x00J["X"]')
+
+    def test_should_read_marked_and_legacy_values(self):
+        codec = ValueCodec(JsonSerializer())
+        stored_values = {'A': '\x00J{"A": "1"}', 'B': '{"B": "2"}'}
+        self.assertEqual(codec.deserialize_values(stored_values, list), [{'A': '1'}, {'B': '2'}])
+        self.assertEqual(codec.deserialize('key', '\x00J{"A": "1"}', dict), {'A': '1'})
+        self.assertEqual(ValueCodec.deserialize_value('\x00J["{not-json"]'), ['{not-json'])
+
+    def test_should_serialize_bigfloat_in_binary_storage_mode(self):
+        codec = ValueCodec(bigfloat_binary=True)
+        serialized_value = codec.serialize('key', BigFloat('1000000000.000000000012'))
+        self.assertEqual(serialized_value[:2], b'\x00B')
+        self.assertEqual(str(codec.deserialize('key', serialized_value, BigFloat)), '1000000000.000000000012')
+        self.assertEqual(str(ValueCodec.deserialize_value(serialized_value)), '1000000000.000000000012')
+
+    def test_should_read_binary_bigfloat_from_decoded_reply(self):
+        codec = ValueCodec(bigfloat_binary=True)
+        decoded_reply = codec.serialize('key', BigFloat('-27123.45')).decode('utf-8', 'surrogateescape')
+        self.assertEqual(codec.deserialize('key', decoded_reply, BigFloat), BigFloat('-27123.45'))
+
+    def test_should_store_binary_bigfloat_smaller_than_string(self):
+        codec = ValueCodec(bigfloat_binary=True)
+        self.assertLess(len(codec.serialize('key', BigFloat('27123.45'))), len('27123.45'))
+        bigfloats = [BigFloat(f'27123.{i:02d}') for i in range(100)]
+        self.assertLess(len(codec.serialize('key', bigfloats)), len(ValueCodec().serialize('key', [str(v) for v in bigfloats])) / 2)
+
+    def test_should_store_bigfloat_beyond_64_bits_in_binary_storage_mode(self):
+        codec = ValueCodec(bigfloat_binary=True)
+        serialized_value = codec.serialize('key', BigFloat('100000000000000000000000.1'))
+        self.assertEqual(str(codec.deserialize('key', serialized_value, BigFloat)), '100000000000000000000000.1')
+
+    def test_should_read_string_bigfloat_in_binary_storage_mode(self):
+        codec = ValueCodec(bigfloat_binary=True)
+        self.assertEqual(str(codec.deserialize('key', '1.000000000012', BigFloat)), '1.000000000012')
+
+    def test_should_serialize_bigfloat_list_as_binary_array(self):
+        codec = ValueCodec(bigfloat_binary=True)
+        bigfloats = [BigFloat('1.5'), BigFloat('2.25')]
+        serialized_value = codec.serialize('key', bigfloats)
+        self.assertEqual(serialized_value[:2], b'\x00A')
+        self.assertEqual(codec.deserialize('key', serialized_value, list), bigfloats)
+
+    def test_should_select_bigfloat_storage_from_options(self):
+        self.assertTrue(ValueCodec.from_options({'REDIS_BIGFLOAT_STORAGE': 'binary'}).bigfloat_binary)
+        self.assertFalse(ValueCodec.from_options({}).bigfloat_binary)
+
+    def test_should_deserialize_fields_in_requested_order(self):
+        values = ['{"B": "2"}', None, '1']
+        self.assertEqual(self.codec.deserialize_fields(['B', 'Z', 'A'], values), {'B': {'B': '2'}, 'Z': None, 'A': '1'})
+        self.assertEqual(self.codec.deserialize_fields(['B', 'Z', 'A'], values, list), [{'B': '2'}, None, '1'])
+
+    def test_should_deserialize_raw_bytes(self):
+        self.assertEqual(self.codec.deserialize('key', b'10', int), 10)
+        self.assertEqual(self.codec.deserialize('key', b'1.5', float), 1.5)
+        self.assertEqual(str(self.codec.deserialize('key', b'1000000000.000000000012', BigFloat)), '1000000000.000000000012')
+        self.assertEqual(self.codec.deserialize('key', b'{"A": "1"}', dict), {'A': '1'})
+        self.assertEqual(self.codec.deserialize('key', b'bar'), 'bar')
+        self.assertEqual(self.codec.deserialize('key', b'N/A', float), NOT_AVAILABLE)
+        self.assertEqual(self.codec.deserialize('key', b'bar', bytes), b'bar')
+
+    def test_should_deserialize_raw_bytes_values(self):
+        codec = ValueCodec(bigfloat_binary=True)
+        marked_bigfloat = codec.serialize_value(BigFloat('-1.25'))
+        values = {b'A': b'{"A": "1"}', b'B': marked_bigfloat, b'C': b'plain'}
+        self.assertEqual(codec.deserialize_values(values, dict), {'A': {'A': '1'}, 'B': BigFloat('-1.25'), 'C': 'plain'})
+        self.assertIs(codec.deserialize_values(values, bytes), values)
+        self.assertEqual(codec.lazy_values(values)['C'], 'plain')
+
+    def test_should_compress_values_from_threshold(self):
+        try:
+            codec = ValueCodec.from_options({'REDIS_COMPRESSION': 'zstd', 'REDIS_COMPRESSION_THRESHOLD': 100})
+        except ImportError:
+            self.skipTest('zstandard not installed')
+        value = {'instruments': ['BTC'] * 100}
+        compressed = codec.serialize_value(value)
+        self.assertTrue(compressed.startswith(b'\x00Z'))
+        self.assertLess(len(compressed), 100)
+        self.assertEqual(codec.deserialize('test', compressed, dict), value)
+        self.assertEqual(codec.deserialize_value(compressed.decode('utf-8', 'surrogateescape')), value)
+        self.assertEqual(codec.serialize_value({'A': 1}), '{"A": 1}')
+
+    def test_should_serialize_and_deserialize_typed_values(self):
+        position = Position('BTC', BigFloat('1.5'))
+        serialized = self.codec.serialize('key', position)
+        self.assertEqual(serialized, '{"instrument": "BTC", "quantity": "1.5"}')
+        self.assertEqual(self.codec.deserialize('key', serialized, Position), position)
+        self.assertEqual(self.codec.deserialize('key', self.codec.serialize('key', [position]), list[Position]), [position])
+        self.assertIsNone(self.codec.deserialize('key', None, Position))
+
+    def test_should_deserialize_typed_hash_values(self):
+        values = self.codec.serialize_values({'BTC': Position('BTC', BigFloat('1.5')), 'ETH': Position('ETH', BigFloat('2.5'))})
+        self.assertEqual(self.codec.deserialize_values(values, list[Position]), [Position('BTC', BigFloat('1.5')), Position('ETH', BigFloat('2.5'))])
+        self.assertEqual(self.codec.deserialize_values(values, dict[str, Position])['ETH'], Position('ETH', BigFloat('2.5')))
+        with self.assertRaises(ValueError):
+            self.codec.deserialize_values(values, Position)
+
+
+if __name__ == '__main__':
+    unittest.main()
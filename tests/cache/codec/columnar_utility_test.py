@@ -0,0 +1,37 @@
+import unittest
+
+try:
+    import numpy
+    from cache.codec.columnar_utility import records_to_columns, concatenate_columns
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'numpy not installed')
+class ColumnarUtilityTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.records = [{'time': 1, 'price': '1000.5'}, {'time': 2, 'price': 1001.25, 'venue': 'X'}]
+
+    def test_should_convert_records_to_typed_columns(self):
+        columns = records_to_columns(self.records, ['time', 'price', 'venue'], {'time': numpy.int64, 'venue': str}, 'field', ['a', 'b'])
+        self.assertEqual(columns['time'].dtype, numpy.int64)
+        self.assertEqual(columns['price'].tolist(), [1000.5, 1001.25])
+        self.assertEqual(columns['venue'].tolist(), ['', 'X'])
+        self.assertEqual(columns['field'].tolist(), ['a', 'b'])
+
+    def test_should_hold_missing_values_as_nan(self):
+        columns = records_to_columns(self.records + ['not a record'], ['time'])
+        self.assertTrue(numpy.isnan(columns['time'][2]))
+        with self.assertRaises(ValueError):
+            records_to_columns(self.records + [{}], ['time'], {'time': numpy.int64})
+
+    def test_should_concatenate_chunks(self):
+        chunks = [records_to_columns(self.records, ['time']), records_to_columns(self.records, ['time'])]
+        self.assertEqual(concatenate_columns(chunks, ['time'])['time'].tolist(), [1.0, 2.0, 1.0, 2.0])
+        empty = concatenate_columns([], ['time'], {'time': numpy.int64}, 'field')
+        self.assertEqual((empty['time'].dtype, len(empty['field'])), (numpy.int64, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from dataclasses import dataclass, field
+from typing import Optional
+
+from core.number.BigFloat import BigFloat
+
+from cache.codec.type_codec_utility import type_codec_for, register_type_codec, element_type_of
+
+
+@dataclass
+class Leg:
+    venue: str
+    price: BigFloat
+
+
+@dataclass
+class Order:
+    instrument: str
+    quantity: int
+    price: Optional[BigFloat] = None
+    legs: list[Leg] = field(default_factory=list)
+
+
+class Tick:
+    __slots__ = ('instrument', 'price')
+
+    def __init__(self, instrument, price):
+        self.instrument = instrument
+        self.price = price
+
+
+class Money:
+
+    def __init__(self, amount):
+        self.amount = amount
+
+
+class TypeCodecUtilityTestCase(unittest.TestCase):
+
+    def test_should_encode_and_decode_dataclass_with_nested_fields(self):
+        order = Order('BTC', 2, BigFloat('-0.05'), [Leg('X', BigFloat('1.5'))])
+        encoded = type_codec_for(Order).encode(order)
+        self.assertEqual(encoded, {'instrument': 'BTC', 'quantity': 2, 'price': '-0.05', 'legs': [{'venue': 'X', 'price': '1.5'}]})
+        self.assertEqual(type_codec_for(Order).decode(encoded), order)
+
+    def test_should_encode_and_decode_slots_class(self):
+        tick = type_codec_for(Tick).decode(type_codec_for(Tick).encode(Tick('ETH', 3.5)))
+        self.assertEqual((tick.instrument, tick.price), ('ETH', 3.5))
+
+    def test_should_resolve_codec_once_per_type(self):
+        self.assertIs(type_codec_for(Order), type_codec_for(Order))
+        self.assertIsNone(type_codec_for(str))
+        self.assertIsNone(type_codec_for(BigFloat))
+
+    def test_should_use_registered_codec(self):
+        register_type_codec(Money, lambda money: {'amount': money.amount}, lambda data: Money(data['amount']))
+        self.assertEqual(type_codec_for(Money).decode({'amount': 4}).amount, 4)
+
+    def test_should_find_element_type(self):
+        self.assertEqual(element_type_of(list[Order]), (list, Order))
+        self.assertEqual(element_type_of(dict[str, Order]), (dict, Order))
+        self.assertEqual(element_type_of(Order), (None, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
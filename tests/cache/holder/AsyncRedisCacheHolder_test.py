@@ -0,0 +1,42 @@
+import unittest
+
+from core.options.exception.MissingOptionError import MissingOptionError
+
+from cache.holder.AsyncRedisCacheHolder import AsyncRedisCacheHolder
+from cache.provider.AsyncRedisCacheProvider import AsyncRedisCacheProvider
+from cache.provider.AsyncRedisCacheProviderWithHash import AsyncRedisCacheProviderWithHash
+
+
+class AsyncRedisCacheHolderTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.options = {
+            'REDIS_SERVER_ADDRESS': '192.168.1.90',
+            'REDIS_SERVER_PORT': 6379,
+            'AUTO_CONNECT': False
+        }
+
+    def tearDown(self):
+        AsyncRedisCacheHolder.re_initialize()
+
+    def test_should_initialize_only_one_async_redis_cache_provider_instance(self):
+        instance_1 = id(AsyncRedisCacheHolder(self.options))
+        instance_2 = id(AsyncRedisCacheHolder())
+        self.assertEqual(instance_1, instance_2, 'every instance after should be the same')
+
+    def test_should_instantiate_async_redis_cache_provider(self):
+        cache_holder = AsyncRedisCacheHolder(self.options)
+        self.assertIsInstance(cache_holder, AsyncRedisCacheProvider)
+
+    def test_should_instantiate_async_redis_cache_with_hash_provider(self):
+        cache_holder = AsyncRedisCacheHolder(self.options, AsyncRedisCacheProviderWithHash)
+        self.assertIsInstance(cache_holder, AsyncRedisCacheProviderWithHash)
+
+    def test_should_raise_error_when_options_are_missing(self):
+        with self.assertRaises(MissingOptionError) as mo:
+            AsyncRedisCacheHolder(None)
+        self.assertEqual('missing option please provide options REDIS_SERVER_ADDRESS and REDIS_SERVER_PORT', str(mo.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
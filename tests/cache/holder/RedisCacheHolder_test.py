@@ -1,5 +1,7 @@
+import threading
 import unittest
 
+import redis
 from core.options.exception.MissingOptionError import MissingOptionError
 
 from cache.holder.RedisCacheHolder import RedisCacheHolder
@@ -66,6 +68,14 @@ class RedisCacheHolderTestCase(unittest.TestCase):
             RedisCacheHolder(options)
         self.assertEqual('missing option please provide option REDIS_SERVER_PORT', str(mo.exception))
 
+    def test_should_not_require_server_address_when_using_unix_socket(self):
+        options = {
+            'REDIS_UNIX_SOCKET_PATH': '/var/run/redis/redis-server.sock'
+        }
+        RedisCacheHolder.re_initialize()
+        cache = RedisCacheHolder(options)
+        self.assertEqual('/var/run/redis/redis-server.sock', cache.server_address)
+
     def test_should_instantiate_redis_cache_provider(self):
         options = {
             'REDIS_SERVER_ADDRESS': '192.168.1.90',
@@ -101,6 +111,52 @@ class RedisCacheHolderTestCase(unittest.TestCase):
         self.assertIsInstance(cache_holder, RedisCacheProviderWithHash)
         self.assertTrue(callable(getattr(cache_holder, 'values_store', None)), 'should have this method!')
 
+    def test_should_hand_out_primary_client_for_reads_without_replicas(self):
+        options = {
+            'REDIS_SERVER_ADDRESS': '192.168.1.90',
+            'REDIS_SERVER_PORT': 6379
+        }
+        RedisCacheHolder(options)
+        self.assertIsInstance(RedisCacheHolder.client(), redis.Redis)
+        self.assertIs(RedisCacheHolder.client(read_only=True), RedisCacheHolder.client())
+
+    def test_should_hold_provider_per_options_and_held_type(self):
+        options_1 = {'REDIS_SERVER_ADDRESS': '192.168.1.90', 'REDIS_SERVER_PORT': 6379, 'AUTO_CONNECT': False}
+        options_2 = {'REDIS_SERVER_ADDRESS': '192.168.1.91', 'REDIS_SERVER_PORT': 6379, 'AUTO_CONNECT': False}
+        provider_1 = RedisCacheHolder(options_1)
+        provider_2 = RedisCacheHolder(options_2)
+        provider_3 = RedisCacheHolder(dict(options_1), RedisCacheProviderWithHash)
+        self.assertIsNot(provider_1, provider_2)
+        self.assertIsInstance(provider_3, RedisCacheProviderWithHash)
+        self.assertIs(RedisCacheHolder(dict(options_1)), provider_1)
+        self.assertIs(RedisCacheHolder(), provider_1)
+
+    def test_should_construct_one_provider_when_threads_race(self):
+        options = {'REDIS_SERVER_ADDRESS': '192.168.1.90', 'REDIS_SERVER_PORT': 6379, 'AUTO_CONNECT': False}
+        providers = []
+        threads = [threading.Thread(target=lambda: providers.append(RedisCacheHolder(options))) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(id(provider) for provider in providers)), 1)
+
+    def test_should_reuse_provider_within_thread_only(self):
+        options = {'REDIS_SERVER_ADDRESS': '192.168.1.90', 'REDIS_SERVER_PORT': 6379, 'AUTO_CONNECT': False}
+        provider = RedisCacheHolder(options, per_thread=True)
+        self.assertIs(RedisCacheHolder(options, per_thread=True), provider)
+        other_thread_providers = []
+        thread = threading.Thread(target=lambda: other_thread_providers.append(RedisCacheHolder(options, per_thread=True)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other_thread_providers[0], provider)
+
+    def test_should_forget_providers_after_fork(self):
+        options = {'REDIS_SERVER_ADDRESS': '192.168.1.90', 'REDIS_SERVER_PORT': 6379, 'AUTO_CONNECT': False}
+        provider = RedisCacheHolder(options)
+        RedisCacheHolder.reset_after_fork()
+        self.assertIsNot(RedisCacheHolder(options), provider)
+
 
 if __name__ == '__main__':
     unittest.main()
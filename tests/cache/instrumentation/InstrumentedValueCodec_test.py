@@ -0,0 +1,30 @@
+import unittest
+
+from cache.codec.ValueCodec import ValueCodec
+from cache.instrumentation.InstrumentedValueCodec import InstrumentedValueCodec
+from cache.instrumentation.MetricsRegistry import MetricsRegistry
+
+
+class InstrumentedValueCodecTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.codec = InstrumentedValueCodec(ValueCodec(), self.registry)
+
+    def test_should_record_serialization_payload_size(self):
+        serialized_value = self.codec.serialize('key', {'A': '1'})
+        self.assertEqual(serialized_value, '{"A": "1"}')
+        self.assertEqual(self.registry.snapshot()['payload_bytes'], {'serialize': len(serialized_value)})
+
+    def test_should_record_deserialization_of_hash_values(self):
+        values = self.codec.deserialize_values({'A': '{"A": "1"}'}, dict)
+        self.assertEqual(values, {'A': {'A': '1'}})
+        self.assertEqual(self.registry.snapshot()['payload_bytes'], {'deserialize_values': 10})
+
+    def test_should_delegate_other_attributes(self):
+        self.assertIsNone(self.codec.serializer)
+        self.assertEqual(self.codec.deserialize_value('{"A": "1"}'), {'A': '1'})
+
+
+if __name__ == '__main__':
+    unittest.main()
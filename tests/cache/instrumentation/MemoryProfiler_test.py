@@ -0,0 +1,45 @@
+import unittest
+
+from core.number.BigFloat import BigFloat
+
+from cache.instrumentation.MemoryProfiler import MemoryProfiler
+from cache.provider.RedisCacheProviderWithHash import RedisCacheProviderWithHash
+
+
+class MemoryProfilerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.options = {
+            'REDIS_SERVER_ADDRESS': '192.168.1.90',
+            'REDIS_SERVER_PORT': 6379
+        }
+        self.cache_provider = RedisCacheProviderWithHash(self.options)
+
+    def tearDown(self):
+        self.cache_provider.delete_many(['test:profile:plain', 'test:profile:small-hash', 'test:profile:large-hash'])
+
+    def test_should_report_memory_and_encodings_by_prefix(self):
+        self.cache_provider.store('test:profile:plain', {'bids': [[1.5, 2]] * 100})
+        self.cache_provider.values_store('test:profile:small-hash', {'BTC': {'price': 1}})
+        self.cache_provider.values_store('test:profile:large-hash', {f'instrument-{number}': {'price': number} for number in range(1000)})
+        report = MemoryProfiler(self.cache_provider, prefix_depth=2).profile('test:profile:*')
+        self.assertEqual(report['keys'], 3)
+        prefix = report['prefixes']['test:profile']
+        self.assertEqual(prefix['types'], {'string': 1, 'hash': 2})
+        self.assertEqual(prefix['encodings'].get('hashtable'), 1)
+        self.assertEqual(report['large_hashes'][0]['key'], 'test:profile:large-hash')
+        self.assertEqual(report['large_hashes'][0]['reason'], 'entries')
+        self.assertGreater(report['memory_bytes'], 0)
+
+    def test_should_profile_binary_values_in_raw_bytes_mode(self):
+        cache_provider = RedisCacheProviderWithHash({**self.options, 'REDIS_RAW_BYTES': True, 'REDIS_SERIALIZER': 'msgpack',
+                                                     'REDIS_BIGFLOAT_STORAGE': 'binary', 'REDIS_COMPRESSION': 'zstd'})
+        cache_provider.store('test:profile:plain', {'bids': [[1.5, 2]] * 100})
+        cache_provider.values_store('test:profile:small-hash', {'BTC': {'price': 1}, 'ETH': BigFloat('2.5')})
+        report = MemoryProfiler(cache_provider, prefix_depth=2).profile('test:profile:*')
+        self.assertEqual(report['keys'], 2)
+        self.assertEqual(report['prefixes']['test:profile']['sampled_json_bytes'], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
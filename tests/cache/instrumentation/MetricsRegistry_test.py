@@ -0,0 +1,68 @@
+import unittest
+
+from cache.instrumentation.MetricsRegistry import MetricsRegistry
+
+
+class MetricsRegistryTestCase(unittest.TestCase):
+
+    def test_should_count_calls_and_errors_per_method(self):
+        registry = MetricsRegistry()
+        registry.observe_call('fetch', 'test:a', 0.001)
+        registry.observe_call('fetch', 'test:b', 0.002)
+        registry.observe_call('store', 'test:a', 0.003, error=ValueError())
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot['calls'], {'fetch|': 2, 'store|': 1})
+        self.assertEqual(snapshot['errors'], {'store|': 1})
+
+    def test_should_aggregate_calls_by_key_prefix(self):
+        registry = MetricsRegistry(key_prefix_depth=2)
+        registry.observe_call('fetch', 'price:binance:BTCUSDT', 0.001)
+        registry.observe_call('fetch', 'price:binance:ETHUSDT', 0.001)
+        registry.observe_call('fetch_many', ['price:binance:BTCUSDT'], 0.001)
+        self.assertEqual(registry.snapshot()['calls'], {'fetch|price:binance': 2, 'fetch_many|': 1})
+
+    def test_should_notify_hooks(self):
+        registry = MetricsRegistry()
+        events = []
+        registry.add_hook(lambda method, key, seconds, error: events.append((method, key, error)))
+        registry.observe_call('fetch', 'test:a', 0.001)
+        self.assertEqual(events, [('fetch', 'test:a', None)])
+
+    def test_should_record_serialization_time_and_payload_size(self):
+        registry = MetricsRegistry()
+        registry.observe_serialization('serialize', 0.5, 100)
+        registry.observe_serialization('serialize', 0.25, 50)
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot['serialization_seconds'], {'serialize': 0.75})
+        self.assertEqual(snapshot['payload_bytes'], {'serialize': 150})
+
+    def test_should_export_prometheus_text_format(self):
+        registry = MetricsRegistry()
+        registry.observe_call('fetch', 'test:a', 0.0003)
+        registry.observe_serialization('deserialize', 0.00001, 10)
+        exported = registry.to_prometheus()
+        self.assertIn('# TYPE automata_redis_calls_total counter', exported)
+        self.assertIn('automata_redis_calls_total{method="fetch",prefix=""} 1', exported)
+        self.assertIn('automata_redis_call_duration_seconds_bucket{method="fetch",prefix="",le="0.00025"} 0', exported)
+        self.assertIn('automata_redis_call_duration_seconds_bucket{method="fetch",prefix="",le="0.0005"} 1', exported)
+        self.assertIn('automata_redis_call_duration_seconds_bucket{method="fetch",prefix="",le="+Inf"} 1', exported)
+        self.assertIn('automata_redis_call_duration_seconds_count{method="fetch",prefix=""} 1', exported)
+        self.assertIn('automata_redis_payload_bytes_bucket{operation="deserialize",le="64"} 1', exported)
+
+    def test_should_escape_prometheus_label_values(self):
+        registry = MetricsRegistry(key_prefix_depth=1)
+        registry.observe_call('fetch', 'a"b\\c\nd:e', 0.0003)
+        self.assertIn('automata_redis_calls_total{method="fetch",prefix="a\\"b\\\\c\\nd"} 1', registry.to_prometheus())
+
+    def test_should_record_views_with_own_key_prefix_depth_into_the_same_metrics(self):
+        registry = MetricsRegistry()
+        view = registry.with_key_prefix_depth(1)
+        view.observe_call('fetch', 'test:a', 0.1)
+        registry.observe_call('fetch', 'test:a', 0.1)
+        self.assertEqual(registry.key_prefix_depth, 0)
+        self.assertEqual(registry.snapshot()['calls'], {'fetch|test': 1, 'fetch|': 1})
+        self.assertEqual(view.snapshot(), registry.snapshot())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from cache.instrumentation.MetricsRegistry import MetricsRegistry
+from cache.instrumentation.instrumentation_utility import instrumented, metrics_from_options, default_metrics_registry
+
+
+class InstrumentedProvider:
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    @instrumented
+    def fetch(self, key):
+        if key is None:
+            raise ValueError('no key')
+        return key
+
+
+class InstrumentationUtilityTestCase(unittest.TestCase):
+
+    def test_should_not_select_metrics_when_option_missing(self):
+        self.assertIsNone(metrics_from_options({}))
+        self.assertIsNone(metrics_from_options({'REDIS_METRICS': False}))
+
+    def test_should_select_default_registry(self):
+        self.assertIs(metrics_from_options({'REDIS_METRICS': True}), default_metrics_registry())
+
+    def test_should_select_given_registry(self):
+        registry = MetricsRegistry()
+        self.assertIs(metrics_from_options({'REDIS_METRICS': registry}), registry)
+
+    def test_should_apply_key_prefix_depth_to_own_provider_only(self):
+        metrics = metrics_from_options({'REDIS_METRICS': True, 'REDIS_METRICS_KEY_PREFIX_DEPTH': 2})
+        self.assertEqual(metrics.key_prefix_depth, 2)
+        self.assertEqual(default_metrics_registry().key_prefix_depth, 0)
+        self.assertIs(metrics.calls, default_metrics_registry().calls)
+
+    def test_should_record_instrumented_calls(self):
+        registry = MetricsRegistry()
+        provider = InstrumentedProvider(registry)
+        self.assertEqual(provider.fetch('test:a'), 'test:a')
+        with self.assertRaises(ValueError):
+            provider.fetch(None)
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot['calls'], {'fetch|': 2})
+        self.assertEqual(snapshot['errors'], {'fetch|': 1})
+
+    def test_should_pass_through_without_metrics(self):
+        provider = InstrumentedProvider(None)
+        self.assertEqual(provider.fetch('test:a'), 'test:a')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import json
+import unittest
+
+import redis
+
+from cache.instrumentation.memory_profile_utility import key_prefix, listpack_limits, json_payload, encoded_sizes, hash_encoded_sizes
+
+
+class ConfigDisabledClient:
+
+    def config_get(self, pattern):
+        raise redis.exceptions.ResponseError('unknown command CONFIG')
+
+
+class ConfigClient:
+
+    def config_get(self, pattern):
+        return {b'hash-max-ziplist-entries': b'512', b'hash-max-ziplist-value': b'128'}
+
+
+class MemoryProfileUtilityTestCase(unittest.TestCase):
+
+    def test_should_take_key_prefix_of_depth(self):
+        self.assertEqual(key_prefix('quote:BTC:bid', 1), 'quote')
+        self.assertEqual(key_prefix('quote:BTC:bid', 2), 'quote:BTC')
+        self.assertEqual(key_prefix('quote', 2), 'quote')
+
+    def test_should_read_listpack_limits(self):
+        self.assertEqual(listpack_limits(ConfigDisabledClient()), {'entries': 128, 'value': 64})
+        self.assertEqual(listpack_limits(ConfigClient()), {'entries': 512, 'value': 128})
+
+    def test_should_only_measure_json_values(self):
+        self.assertEqual(json_payload('{"A": 1}'), '{"A": 1}')
+        self.assertEqual(json_payload(b'\x00J[1]'), '[1]')
+        self.assertIsNone(json_payload('BTC'))
+        self.assertIsNone(json_payload('\x00M\x81'))
+        self.assertIsNone(json_payload(b'\x00M\x81\xa1A\xc3'))
+        self.assertIsNone(json_payload(b'\x00Z\x28\xb5\x2f\xfd'))
+        self.assertIsNone(json_payload(b'\xff\xfe'))
+        self.assertIsNone(encoded_sizes(b'\x00B\x02\xfa\x01'))
+        self.assertIsNone(encoded_sizes('1000.5'))
+
+    def test_should_measure_alternative_encodings(self):
+        value = json.dumps({'bids': [[1.5, 2]] * 50})
+        sizes = encoded_sizes(value)
+        self.assertEqual(sizes['json'], len(value))
+        self.assertTrue(all(size <= sizes['json'] for name, size in sizes.items() if name != 'msgpack'))
+        self.assertEqual(hash_encoded_sizes({'a': value, 'b': value})['json'], 2 * len(value))
+        self.assertIsNone(hash_encoded_sizes({'a': '1'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import threading
+import time
+import unittest
+
+from cache.loader.SingleFlight import SingleFlight
+
+
+class SingleFlightTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.single_flight = SingleFlight()
+        self.calls = []
+
+    def load(self):
+        self.calls.append(threading.current_thread().name)
+        time.sleep(0.1)
+        return len(self.calls)
+
+    def run_concurrently(self, function, count=10):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(function())) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_should_share_result_of_concurrent_calls(self):
+        results = self.run_concurrently(lambda: self.single_flight.run('key', self.load))
+        self.assertEqual(results, [1] * 10)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.single_flight.run('key', self.load), 2)
+
+    def test_should_share_error_of_concurrent_calls(self):
+        def fail():
+            time.sleep(0.1)
+            raise RuntimeError('upstream down')
+
+        def run():
+            try:
+                return self.single_flight.run('key', fail)
+            except RuntimeError as error:
+                return str(error)
+        self.assertEqual(self.run_concurrently(run), ['upstream down'] * 10)
+        self.assertEqual(self.single_flight.flights, {})
+
+    def test_should_run_in_background_once(self):
+        flights = [self.single_flight.run_in_background('key', self.load) for _ in range(5)]
+        self.assertEqual([flight.result() for flight in flights], [1] * 5)
+        self.assertEqual(len(self.calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+
+from cache.loader.loader_utility import load_lock_key, stored_ttl, refresh_window
+
+
+class LoaderUtilityTestCase(unittest.TestCase):
+
+    def test_should_keep_stale_value_past_ttl(self):
+        self.assertEqual(stored_ttl(10, None), 10)
+        self.assertEqual(stored_ttl(10, 5), 15)
+        self.assertIsNone(stored_ttl(None, 5))
+
+    def test_should_refresh_within_window(self):
+        self.assertIsNone(refresh_window(10, None, None))
+        self.assertIsNone(refresh_window(None, 2, None))
+        self.assertEqual(refresh_window(10, 2, None), 2)
+        self.assertEqual(refresh_window(10, 2, 5), 7)
+
+    def test_should_lock_next_to_key(self):
+        self.assertEqual(load_lock_key('quote:BTC'), 'quote:BTC:load-lock')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import time
+import unittest
+
+from cache.nearcache.NearCache import NearCache, MISSING
+
+
+class NearCacheTestCase(unittest.TestCase):
+
+    def test_should_report_hits_and_misses(self):
+        near_cache = NearCache()
+        self.assertIs(near_cache.get('A'), MISSING)
+        near_cache.put('A', '1')
+        self.assertEqual(near_cache.get('A'), '1')
+        stats = near_cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['size'], 1)
+
+    def test_should_evict_least_recently_used_entry(self):
+        near_cache = NearCache(max_size=2)
+        near_cache.put('A', '1')
+        near_cache.put('B', '2')
+        near_cache.get('A')
+        near_cache.put('C', '3')
+        self.assertIs(near_cache.get('B'), MISSING)
+        self.assertEqual(near_cache.get('A'), '1')
+        self.assertEqual(near_cache.get('C'), '3')
+        self.assertEqual(near_cache.stats()['evictions'], 1)
+
+    def test_should_expire_entry_after_ttl(self):
+        near_cache = NearCache(ttl=0.01)
+        near_cache.put('A', '1')
+        near_cache.put('B', '2', ttl=60)
+        time.sleep(0.02)
+        self.assertIs(near_cache.get('A'), MISSING)
+        self.assertEqual(near_cache.get('B'), '2')
+
+    def test_should_load_only_on_miss(self):
+        near_cache = NearCache()
+        loads = []
+        loader = lambda: loads.append('A') or '1'
+        self.assertEqual(near_cache.get_or_load('A', loader), '1')
+        self.assertEqual(near_cache.get_or_load('A', loader), '1')
+        self.assertEqual(loads, ['A'])
+
+    def test_should_cache_missing_value_as_none(self):
+        near_cache = NearCache()
+        near_cache.get_or_load('A', lambda: None)
+        self.assertIsNone(near_cache.get('A'))
+
+    def test_should_not_cache_load_that_raced_an_invalidation(self):
+        near_cache = NearCache()
+
+        def loader():
+            near_cache.invalidate('A')
+            return 'stale'
+
+        self.assertEqual(near_cache.get_or_load('A', loader), 'stale')
+        self.assertIs(near_cache.get('A'), MISSING)
+
+    def test_should_cache_load_that_only_raced_invalidations_of_other_keys(self):
+        near_cache = NearCache()
+
+        def loader():
+            near_cache.invalidate('B')
+            return 'fresh'
+
+        self.assertEqual(near_cache.get_or_load('A', loader), 'fresh')
+        self.assertEqual(near_cache.get('A'), 'fresh')
+        epoch = near_cache.epoch
+        near_cache.invalidate('B')
+        near_cache.put('A', 'fresh', epoch)
+        near_cache.put('B', 'stale', epoch)
+        self.assertEqual(near_cache.get('A'), 'fresh')
+        self.assertIs(near_cache.get('B'), MISSING)
+
+    def test_should_not_cache_loads_older_than_forgotten_invalidations(self):
+        near_cache = NearCache(max_size=1)
+        epoch = near_cache.epoch
+        near_cache.invalidate('A')
+        near_cache.invalidate('B')
+        near_cache.put('A', 'stale', epoch)
+        self.assertIs(near_cache.get('A'), MISSING)
+
+    def test_should_cache_fields_per_key(self):
+        near_cache = NearCache()
+        near_cache.get_or_load_field('H', 'A', lambda: '1')
+        near_cache.get_or_load_field('H', 'B', lambda: '2')
+        self.assertEqual(near_cache.get_or_load_field('H', 'A', lambda: 'reloaded'), '1')
+        near_cache.invalidate('H')
+        self.assertEqual(near_cache.get_or_load_field('H', 'A', lambda: 'reloaded'), 'reloaded')
+        self.assertEqual(near_cache.stats()['invalidations'], 1)
+
+    def test_should_invalidate_all_entries(self):
+        near_cache = NearCache()
+        near_cache.put('A', '1')
+        near_cache.put('B', '2')
+        near_cache.invalidate_all()
+        self.assertEqual(near_cache.stats()['size'], 0)
+        self.assertEqual(near_cache.stats()['invalidations'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
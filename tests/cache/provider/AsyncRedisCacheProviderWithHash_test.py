@@ -0,0 +1,51 @@
+import logging
+import unittest
+
+from cache.provider.AsyncRedisCacheProviderWithHash import AsyncRedisCacheProviderWithHash
+
+
+class AsyncRedisCacheProviderWithHashTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        logging.basicConfig(level=logging.INFO)
+        logging.getLogger('AsyncRedisCacheProvider').setLevel(logging.DEBUG)
+
+        self.options = {
+            'REDIS_SERVER_ADDRESS': '192.168.1.90',
+            'REDIS_SERVER_PORT': 6379
+        }
+        self.cache_provider = AsyncRedisCacheProviderWithHash(self.options)
+
+    async def asyncTearDown(self):
+        await self.cache_provider.delete_many(['test:async:mv:list', 'test:async:mv:config', 'test:async:mv:set-get-direct'])
+        await self.cache_provider.close()
+
+    async def test_should_store_list_of_values_using_specified_key(self):
+        values_to_store = [
+            {'name': 'A', 'context': 'M'},
+            {'name': 'B', 'context': 'M'}
+        ]
+        value_custom_key = lambda value: f'{value["name"]}{value["context"]}'
+        await self.cache_provider.values_store('test:async:mv:list', values_to_store, custom_key=value_custom_key)
+        self.assertEqual(await self.cache_provider.values_fetch('test:async:mv:list'), values_to_store)
+        self.assertEqual(await self.cache_provider.values_get_value('test:async:mv:list', 'BM'), {'name': 'B', 'context': 'M'})
+
+    async def test_should_store_json_data(self):
+        config = {
+            'name': 'Eugene',
+            'address': {
+                'place': 'on my island'
+            }
+        }
+        await self.cache_provider.values_store('test:async:mv:config', config, atomic=True)
+        self.assertEqual(await self.cache_provider.values_fetch('test:async:mv:config', as_type=dict), config)
+
+    async def test_should_set_get_and_delete_value_directly(self):
+        await self.cache_provider.values_set_value('test:async:mv:set-get-direct', 'A', ['X', '0A'])
+        self.assertEqual(await self.cache_provider.values_get_value('test:async:mv:set-get-direct', 'A'), ['X', '0A'])
+        await self.cache_provider.values_delete_value('test:async:mv:set-get-direct', 'A')
+        self.assertIsNone(await self.cache_provider.values_get_value('test:async:mv:set-get-direct', 'A'))
+
+
+if __name__ == '__main__':
+    unittest.main()
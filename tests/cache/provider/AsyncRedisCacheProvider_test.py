@@ -0,0 +1,61 @@
+import logging
+import unittest
+
+from core.constants.not_available import NOT_AVAILABLE
+from core.number.BigFloat import BigFloat
+
+from cache.provider.AsyncRedisCacheProvider import AsyncRedisCacheProvider
+
+
+class AsyncRedisCacheProviderTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        logging.basicConfig(level=logging.INFO)
+        logging.getLogger('AsyncRedisCacheProvider').setLevel(logging.DEBUG)
+
+        self.options = {
+            'REDIS_SERVER_ADDRESS': '192.168.1.90',
+            'REDIS_SERVER_PORT': 6379
+        }
+        self.cache_provider = AsyncRedisCacheProvider(self.options)
+
+    async def asyncTearDown(self):
+        await self.cache_provider.delete_many(['test:async-foo', 'test:async-number', 'test:async-big-float', 'test:async-dict'])
+        await self.cache_provider.close()
+
+    async def test_should_connect_to_redis_server(self):
+        self.assertEqual(await self.cache_provider.can_connect(), True)
+
+    async def test_should_store_key_string_value(self):
+        await self.cache_provider.store('test:async-foo', 'bar')
+        self.assertEqual(await self.cache_provider.fetch('test:async-foo'), 'bar')
+
+    async def test_should_store_key_large_precision_float_value(self):
+        await self.cache_provider.store('test:async-big-float', BigFloat('1000000000.000000000012'))
+        value = await self.cache_provider.fetch('test:async-big-float', as_type=BigFloat)
+        self.assertEqual(str(value), '1000000000.000000000012')
+
+    async def test_should_store_unavailable_value(self):
+        await self.cache_provider.store('test:async-number', NOT_AVAILABLE)
+        self.assertEqual(await self.cache_provider.fetch('test:async-number', as_type=float), NOT_AVAILABLE)
+
+    async def test_should_store_and_fetch_many_keys_in_order(self):
+        await self.cache_provider.store_many({'test:async-number': 10, 'test:async-dict': {'A': '1'}})
+        values = await self.cache_provider.fetch_many(['test:async-dict', 'test:async-number', 'unknown-key'], as_type=[dict, int, int])
+        self.assertEqual(values, [{'A': '1'}, 10, None])
+
+    async def test_should_delete_many_keys(self):
+        await self.cache_provider.store_many({'test:async-foo': 'bar', 'test:async-number': 10})
+        deleted = await self.cache_provider.delete_many(['test:async-foo', 'test:async-number'])
+        self.assertEqual(deleted, 2)
+
+    async def test_should_expire_stored_keys(self):
+        await self.cache_provider.store('test:async-foo', 'bar', ttl=10)
+        await self.cache_provider.store_many({'test:async-number': 10}, ttl=20)
+        self.assertAlmostEqual(await self.cache_provider.time_to_live('test:async-foo'), 10, delta=1)
+        self.assertEqual(await self.cache_provider.refresh_expiry(['test:async-number'], ttl=30), 1)
+        self.assertAlmostEqual(await self.cache_provider.time_to_live('test:async-number'), 30, delta=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,10 @@
 import logging
+import os
+import tempfile
 import unittest
 
+from core.number.BigFloat import BigFloat
+
 from cache.provider.RedisCacheProviderWithHash import RedisCacheProviderWithHash
 
 
@@ -30,6 +34,11 @@ class RedisCacheProviderWithHashTestCase(unittest.TestCase):
         cache_provider.delete('test:mv:get')
         cache_provider.delete('test:mv:set-get-direct')
         cache_provider.delete('test:mv:list-value')
+        cache_provider.delete('test:mv:bulk-chunked')
+        cache_provider.delete('test:mv:bulk-atomic')
+        cache_provider.delete('test:mv:iterate')
+        cache_provider.delete('test:mv:bigfloat-binary')
+        cache_provider.delete('test:mv:fields')
 
     def test_should_store_list_of_values_by_each_key(self):
         cache_provider = RedisCacheProviderWithHash(self.options)
@@ -206,6 +215,138 @@ class RedisCacheProviderWithHashTestCase(unittest.TestCase):
         # deserialization to type responsible on employer
         self.assertEquals(stored_value, value)
 
+    def test_should_store_many_values_in_chunks(self):
+        options = dict(self.options)
+        options['REDIS_VALUES_STORE_CHUNK_SIZE'] = 100
+        cache_provider = RedisCacheProviderWithHash(options)
+        values_to_store = [{'name': f'{i}', 'context': 'M'} for i in range(1000)]
+        value_custom_key = lambda value: f'{value["name"]}{value["context"]}'
+        cache_provider.values_store('test:mv:bulk-chunked', values_to_store, custom_key=value_custom_key)
+        values = cache_provider.values_fetch('test:mv:bulk-chunked', as_type=dict)
+        self.assertEqual(len(values), 1000)
+        self.assertEqual(values['999M'], {'name': '999', 'context': 'M'})
+
+    def test_should_store_values_atomically(self):
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        values_to_store = {'A': '1', 'B': {'C': '2'}}
+        cache_provider.values_store('test:mv:bulk-atomic', values_to_store, atomic=True)
+        values = cache_provider.values_fetch('test:mv:bulk-atomic', as_type=dict)
+        self.assertEqual(values, values_to_store)
+
+    def test_should_not_store_empty_values(self):
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        cache_provider.values_store('test:mv:bulk-empty', [])
+        values = cache_provider.values_fetch('test:mv:bulk-empty')
+        self.assertEqual(values, [])
+
+    def test_should_iterate_values_lazily(self):
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        values_to_store = [{f'{i}': i} for i in range(100)]
+        cache_provider.values_store('test:mv:iterate', values_to_store)
+        values = cache_provider.iter_values('test:mv:iterate', count=10)
+        self.assertNotIsInstance(values, list)
+        self.assertEqual(sorted(values, key=lambda v: int(next(iter(v)))), values_to_store)
+
+    def test_should_iterate_values_matching_pattern_with_keys(self):
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        cache_provider.values_store('test:mv:iterate', {'A1': '1', 'A2': {'B': '2'}, 'C': '3'})
+        values = dict(cache_provider.iter_values('test:mv:iterate', as_type=dict, pattern='A*'))
+        self.assertEqual(values, {'A1': '1', 'A2': {'B': '2'}})
+
+    def test_should_store_bigfloat_values_in_binary_storage_mode(self):
+        options = dict(self.options)
+        options['REDIS_BIGFLOAT_STORAGE'] = 'binary'
+        cache_provider = RedisCacheProviderWithHash(options)
+        cache_provider.values_store('test:mv:bigfloat-binary', {'bid': BigFloat('1.000000000012'), 'ask': BigFloat('1.1')})
+        values = cache_provider.values_fetch('test:mv:bigfloat-binary', as_type=dict)
+        self.assertEqual(values, {'bid': BigFloat('1.000000000012'), 'ask': BigFloat('1.1')})
+        self.assertEqual(cache_provider.values_get_value('test:mv:bigfloat-binary', 'ask'), BigFloat('1.1'))
+
+    def test_should_fetch_subset_of_fields(self):
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        cache_provider.values_store('test:mv:fields', [{'A': '1'}, {'B': '2'}, {'C': '3'}])
+        values = cache_provider.values_fetch_fields('test:mv:fields', ['C', 'A', 'Z'])
+        self.assertEqual(values, {'C': {'C': '3'}, 'A': {'A': '1'}, 'Z': None})
+        values = cache_provider.values_fetch_fields('test:mv:fields', ['C', 'A'], as_type=list)
+        self.assertEqual(values, [{'C': '3'}, {'A': '1'}])
+
+    def test_should_fetch_values_lazily(self):
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        cache_provider.values_store('test:mv:fields', [{'A': '1'}, {'B': '2'}])
+        values = cache_provider.values_fetch('test:mv:fields', as_type=dict, lazy=True)
+        self.assertEqual(values.decoded_values, {})
+        self.assertEqual(values['B'], {'B': '2'})
+        self.assertEqual(list(values.decoded_values.keys()), ['B'])
+
+    def test_should_expire_hash_key_with_values(self):
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        cache_provider.values_store('test:mv:fields', [{'A': '1'}], ttl=20)
+        self.assertAlmostEqual(cache_provider.time_to_live('test:mv:fields'), 20, delta=1)
+        cache_provider.values_set_value('test:mv:fields', 'B', '2', ttl=40)
+        self.assertAlmostEqual(cache_provider.time_to_live('test:mv:fields'), 40, delta=1)
+
+    def test_should_patch_nested_value_server_side(self):
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        cache_provider.values_store('test:mv:fields', [{'A': {'state': 'new', 'fill': {'qty': '1', 'px': '2'}}}])
+        patched = cache_provider.values_patch_value('test:mv:fields', 'A', {'state': 'filled', 'fill': {'px': None, 'avg': '3'}})
+        self.assertEqual(patched, {'state': 'filled', 'fill': {'qty': '1', 'avg': '3'}})
+        self.assertEqual(cache_provider.values_get_value('test:mv:fields', 'A'), patched)
+
+    def test_should_patch_value_keeping_untouched_members_exact(self):
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        cache_provider.values_set_value('test:mv:fields', 'A', {'id': 1234567890123456789, 'fills': [], 'ratio': 1.0, 'state': 'new'})
+        patched = cache_provider.values_patch_value('test:mv:fields', 'A', {'state': 'filled'})
+        self.assertEqual(patched, {'id': 1234567890123456789, 'fills': [], 'ratio': 1.0, 'state': 'filled'})
+        self.assertEqual(cache_provider.values_get_value('test:mv:fields', 'A'), patched)
+
+    def test_should_increment_numeric_and_bigfloat_values(self):
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        self.assertEqual(cache_provider.values_increment_value('test:mv:fields', 'count', 5), 5)
+        self.assertEqual(cache_provider.values_increment_value('test:mv:fields', 'count', -2), 3)
+        cache_provider.values_store('test:mv:fields', {'price': BigFloat('1000000000.000000000012')})
+        incremented = cache_provider.values_increment_value('test:mv:fields', 'price', BigFloat('-0.000000000002'))
+        self.assertEqual(str(incremented), '1000000000.00000000001')
+
+    def test_should_export_and_import_snapshot_of_keys_matching_pattern(self):
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        cache_provider.store('test:snapshot:plain', {'A': 1})
+        cache_provider.values_store('test:snapshot:hash', {'BTC': {'price': 1}}, ttl=60)
+        path = os.path.join(tempfile.mkdtemp(), 'test.snapshot')
+        self.assertEqual(cache_provider.export_snapshot(path, 'test:snapshot:*'), 2)
+        cache_provider.delete('test:snapshot:plain')
+        cache_provider.values_set_value('test:snapshot:hash', 'ETH', {'price': 2})
+        self.assertEqual(cache_provider.import_snapshot(path), 2)
+        self.assertEqual(cache_provider.fetch('test:snapshot:plain', as_type=dict), {'A': 1})
+        self.assertEqual(cache_provider.values_fetch('test:snapshot:hash', as_type=dict), {'BTC': {'price': 1}})
+        self.assertAlmostEqual(cache_provider.time_to_live('test:snapshot:hash'), 60, delta=1)
+        cache_provider.delete_many(['test:snapshot:plain', 'test:snapshot:hash'])
+        os.remove(path)
+
+    def test_should_fetch_record_values_as_columns(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('numpy not installed')
+        cache_provider = RedisCacheProviderWithHash(self.options)
+        cache_provider.values_store('test:columns', {f'{time}': {'time': time, 'price': f'{time}.5'} for time in range(2500)})
+        columns = cache_provider.values_fetch_columns('test:columns', ['time', 'price'], dtypes={'time': numpy.int64}, key_column='field', count=1000)
+        self.assertEqual(len(columns['time']), 2500)
+        ordered = numpy.argsort(columns['time'])
+        self.assertEqual(columns['price'][ordered][:2].tolist(), [0.5, 1.5])
+        self.assertEqual(columns['field'][ordered][-1], '2499')
+        cache_provider.delete('test:columns')
+
+    def test_should_read_pending_fields_in_write_behind_mode(self):
+        cache_provider = RedisCacheProviderWithHash({**self.options, 'REDIS_WRITE_BEHIND': True, 'REDIS_WRITE_BEHIND_INTERVAL': 60})
+        cache_provider.values_set_value('test:mv:fields', 'A', '1')
+        self.assertEqual(cache_provider.values_get_value('test:mv:fields', 'A'), '1')
+        self.assertEqual(cache_provider.values_fetch_fields('test:mv:fields', ['A', 'B']), {'A': '1', 'B': None})
+        self.assertIsNone(cache_provider.redis_client.hget('test:mv:fields', 'A'))
+        # whole hash reads flush the buffer first
+        self.assertEqual(cache_provider.values_fetch('test:mv:fields', as_type=dict), {'A': '1'})
+        self.assertEqual(cache_provider.write_buffer.pending, 0)
+        cache_provider.close()
+
 
 if __name__ == '__main__':
     unittest.main()
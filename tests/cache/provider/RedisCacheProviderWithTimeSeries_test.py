@@ -0,0 +1,91 @@
+import logging
+import unittest
+from array import array
+
+from core.number.BigFloat import BigFloat
+
+from cache.instrumentation.MetricsRegistry import MetricsRegistry
+from cache.provider.RedisCacheProviderWithTimeSeries import RedisCacheProviderWithTimeSeries
+
+
+class RedisCacheProviderWithTimeSeriesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        logging.basicConfig(level=logging.INFO)
+        logging.getLogger('RedisCacheProvider').setLevel(logging.DEBUG)
+
+        self.options = {
+            'REDIS_SERVER_ADDRESS': '192.168.1.90',
+            'REDIS_SERVER_PORT': 6379
+        }
+
+    def tearDown(self):
+        cache_provider = RedisCacheProviderWithTimeSeries(self.options)
+        cache_provider.delete_many(['test:ts:stream', 'test:ts:sortedset', 'test:ts:retention'])
+
+    def test_should_append_and_fetch_range_as_columns_from_stream(self):
+        cache_provider = RedisCacheProviderWithTimeSeries({**self.options, 'REDIS_TIMESERIES_BACKEND': 'stream'})
+        cache_provider.series_append_many('test:ts:stream', [1000, 1001, 1002], [BigFloat('1.1'), BigFloat('1.2'), BigFloat('1.3')])
+        cache_provider.series_append('test:ts:stream', BigFloat('1.4'), timestamp=1003)
+        (timestamps, values) = cache_provider.series_range('test:ts:stream', 1001, 1002)
+        self.assertEqual(timestamps, array('q', [1001, 1002]))
+        self.assertEqual(values, [BigFloat('1.2'), BigFloat('1.3')])
+
+    def test_should_append_and_fetch_range_as_columns_from_sorted_set(self):
+        options = dict(self.options)
+        options['REDIS_TIMESERIES_BACKEND'] = 'sortedset'
+        cache_provider = RedisCacheProviderWithTimeSeries(options)
+        cache_provider.series_append_many('test:ts:sortedset', [1000, 1001, 1002], [BigFloat('1.1'), BigFloat('1.1'), BigFloat('1.3')])
+        (timestamps, values) = cache_provider.series_range('test:ts:sortedset', as_type=float)
+        self.assertEqual(timestamps, array('q', [1000, 1001, 1002]))
+        self.assertEqual(values, array('d', [1.1, 1.1, 1.3]))
+
+    def test_should_limit_range_count(self):
+        cache_provider = RedisCacheProviderWithTimeSeries({**self.options, 'REDIS_TIMESERIES_BACKEND': 'stream'})
+        cache_provider.series_append_many('test:ts:stream', [1000, 1001, 1002], [1, 2, 3])
+        (timestamps, values) = cache_provider.series_range('test:ts:stream', count=2, as_type=int)
+        self.assertEqual(timestamps, array('q', [1000, 1001]))
+        self.assertEqual(values, array('q', [1, 2]))
+
+    def test_should_cap_retention(self):
+        for backend in ['stream', 'sortedset']:
+            with self.subTest(backend=backend):
+                options = dict(self.options)
+                options['REDIS_TIMESERIES_BACKEND'] = backend
+                cache_provider = RedisCacheProviderWithTimeSeries(options)
+                cache_provider.delete('test:ts:retention')
+                cache_provider.series_append_many('test:ts:retention', list(range(1000, 1010)), list(range(10)))
+                cache_provider.series_trim('test:ts:retention', 3)
+                self.assertEqual(cache_provider.series_length('test:ts:retention'), 3)
+                (timestamps, values) = cache_provider.series_range('test:ts:retention', as_type=int)
+                self.assertEqual(timestamps, array('q', [1007, 1008, 1009]))
+
+    def test_should_raise_error_for_unknown_backend(self):
+        options = dict(self.options)
+        options['REDIS_TIMESERIES_BACKEND'] = 'list'
+        with self.assertRaises(ValueError):
+            RedisCacheProviderWithTimeSeries(options, auto_connect=False)
+
+    def test_should_default_to_sorted_set_backend(self):
+        self.assertEqual(RedisCacheProviderWithTimeSeries(self.options, auto_connect=False).series_backend, 'sortedset')
+
+    def test_should_raise_error_for_timestamps_not_matching_values(self):
+        cache_provider = RedisCacheProviderWithTimeSeries(self.options, auto_connect=False)
+        with self.assertRaises(ValueError):
+            cache_provider.series_append_many('test:ts:sortedset', [1000, 1001], [1, 2, 3])
+
+    def test_should_raise_error_for_decreasing_stream_timestamps(self):
+        cache_provider = RedisCacheProviderWithTimeSeries({**self.options, 'REDIS_TIMESERIES_BACKEND': 'stream'}, auto_connect=False)
+        with self.assertRaises(ValueError):
+            cache_provider.series_append_many('test:ts:stream', [1001, 1000], [1, 2])
+
+    def test_should_record_each_append_once(self):
+        registry = MetricsRegistry()
+        cache_provider = RedisCacheProviderWithTimeSeries({**self.options, 'REDIS_METRICS': registry})
+        cache_provider.series_append('test:ts:sortedset', 1, timestamp=1000)
+        cache_provider.series_append_many('test:ts:sortedset', [1001, 1002], [2, 3])
+        self.assertEqual(registry.snapshot()['calls'], {'series_append|': 1, 'series_append_many|': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,11 @@
 import logging
+import threading
+import time
 import unittest
 
 from core.constants.not_available import NOT_AVAILABLE
 from core.number.BigFloat import BigFloat
+from redis import Redis
 from redis.exceptions import DataError
 
 from cache.provider.RedisCacheProvider import RedisCacheProvider
@@ -31,6 +34,8 @@ class RedisCacheProviderTestCase(unittest.TestCase):
         cache_provider.delete('test-list')
         cache_provider.delete('test:test-list-json')
         cache_provider.delete('test:dict-value')
+        cache_provider.delete('test:near-cache')
+        cache_provider.delete_many(['test:many-foo', 'test:many-number', 'test:many-big-float', 'test:many-dict'])
 
     def test_should_connect_to_redis_server(self):
         cache_provider = RedisCacheProvider(self.options)
@@ -119,6 +124,150 @@ class RedisCacheProviderTestCase(unittest.TestCase):
         values = cache_provider.fetch('test:dict-value', as_type=dict)
         self.assertEqual(values, value_to_store)
 
+    def test_should_store_and_fetch_many_keys_in_order(self):
+        cache_provider = RedisCacheProvider(self.options)
+        cache_provider.store_many({
+            'test:many-foo': 'bar',
+            'test:many-number': 10,
+            'test:many-big-float': BigFloat('1000000000.000000000012'),
+            'test:many-dict': {'A': '1', 'B': 2}
+        })
+        values = cache_provider.fetch_many(['test:many-dict', 'test:many-foo', 'test:many-number', 'test:many-big-float'], as_type=[dict, str, int, BigFloat])
+        self.assertEqual(values, [{'A': '1', 'B': 2}, 'bar', 10, BigFloat('1000000000.000000000012')])
+
+    def test_should_fetch_many_with_single_type_and_missing_keys(self):
+        cache_provider = RedisCacheProvider(self.options)
+        cache_provider.store_many({'test:many-number': 10})
+        values = cache_provider.fetch_many(['test:many-number', 'unknown-key'], as_type=int)
+        self.assertEqual(values, [10, None])
+
+    def test_should_fetch_many_unavailable_values(self):
+        cache_provider = RedisCacheProvider(self.options)
+        cache_provider.store_many({'test:many-number': NOT_AVAILABLE})
+        values = cache_provider.fetch_many(['test:many-number'], as_type=float)
+        self.assertEqual(values, [NOT_AVAILABLE])
+
+    def test_should_delete_many_keys(self):
+        cache_provider = RedisCacheProvider(self.options)
+        cache_provider.store_many({'test:many-foo': 'bar', 'test:many-number': 10})
+        deleted = cache_provider.delete_many(['test:many-foo', 'test:many-number', 'unknown-key'])
+        self.assertEqual(deleted, 2)
+        self.assertEqual(cache_provider.fetch_many(['test:many-foo', 'test:many-number']), [None, None])
+
+    def test_should_serve_repeated_fetch_from_near_cache_and_invalidate_on_remote_write(self):
+        options = dict(self.options)
+        options['REDIS_NEAR_CACHE'] = True
+        options['REDIS_NEAR_CACHE_PREFIXES'] = 'test:near'
+        cache_provider = RedisCacheProvider(options)
+        cache_provider.near_cache_invalidator.subscribed.wait(timeout=5)
+        cache_provider.store('test:near-cache', 10)
+        self.assertEqual(cache_provider.fetch('test:near-cache', as_type=int), 10)
+        self.assertEqual(cache_provider.fetch('test:near-cache', as_type=int), 10)
+        self.assertEqual(cache_provider.near_cache.stats()['hits'], 1)
+        other_provider = RedisCacheProvider(self.options)
+        other_provider.store('test:near-cache', 20)
+        time.sleep(0.1)
+        self.assertEqual(cache_provider.fetch('test:near-cache', as_type=int), 20)
+        cache_provider.close()
+
+    def test_should_load_near_cache_from_primary_when_reading_from_replicas(self):
+        options = dict(self.options)
+        options['REDIS_NEAR_CACHE'] = True
+        options['REDIS_NEAR_CACHE_PREFIXES'] = 'test:near'
+        cache_provider = RedisCacheProvider(options)
+        cache_provider.near_cache_invalidator.subscribed.wait(timeout=5)
+        # another database still holding the older value stands in for a lagging replica
+        lagging_replica = Redis(host=self.options['REDIS_SERVER_ADDRESS'], port=self.options['REDIS_SERVER_PORT'], db=1, decode_responses=True)
+        lagging_replica.set('test:near-cache', 10)
+        cache_provider.replica_client = lagging_replica
+        cache_provider.store('test:near-cache', 20)
+        self.assertEqual(cache_provider.fetch('test:near-cache', as_type=int), 20)
+        cache_provider.near_cache.invalidate('test:near-cache')
+        self.assertEqual(cache_provider.fetch_many(['test:near-cache'], as_type=int), [20])
+        lagging_replica.delete('test:near-cache')
+        cache_provider.close()
+
+    def test_should_iterate_key_names_matching_pattern(self):
+        cache_provider = RedisCacheProvider(self.options)
+        cache_provider.store_many({'test:many-foo': 'bar', 'test:many-number': 10})
+        keys = list(cache_provider.iter_keys('test:many-*', count=1))
+        self.assertEqual(sorted(set(keys)), ['test:many-foo', 'test:many-number'])
+
+    def test_should_store_key_large_precision_float_value_in_binary_storage_mode(self):
+        options = dict(self.options)
+        options['REDIS_BIGFLOAT_STORAGE'] = 'binary'
+        cache_provider = RedisCacheProvider(options)
+        cache_provider.store('test-big-float', BigFloat('1000000000.000000000012'))
+        value = cache_provider.fetch('test-big-float', as_type=BigFloat)
+        self.assertEqual(str(value), '1000000000.000000000012')
+
+    def test_should_expire_stored_keys(self):
+        cache_provider = RedisCacheProvider(self.options)
+        cache_provider.store('test:expiring', 'bar', ttl=10)
+        cache_provider.store_many({'test:many-foo': 'bar', 'test:many-number': 10}, ttl=0.5)
+        self.assertAlmostEqual(cache_provider.time_to_live('test:expiring'), 10, delta=1)
+        self.assertLessEqual(cache_provider.time_to_live('test:many-foo'), 0.5)
+        time.sleep(0.6)
+        self.assertEqual(cache_provider.fetch_many(['test:many-foo', 'test:many-number']), [None, None])
+        cache_provider.delete('test:expiring')
+
+    def test_should_apply_default_ttl_and_refresh_expiry(self):
+        options = dict(self.options)
+        options['REDIS_DEFAULT_TTL'] = 30
+        cache_provider = RedisCacheProvider(options)
+        cache_provider.store('test:expiring', 'bar')
+        self.assertAlmostEqual(cache_provider.time_to_live('test:expiring'), 30, delta=1)
+        self.assertEqual(cache_provider.refresh_expiry(['test:expiring', 'unknown-key'], ttl=60), 1)
+        self.assertAlmostEqual(cache_provider.time_to_live('test:expiring'), 60, delta=1)
+        cache_provider.delete('test:expiring')
+
+    def test_should_compare_and_set_value(self):
+        cache_provider = RedisCacheProvider(self.options)
+        self.assertTrue(cache_provider.compare_and_set('test:cas', None, 'pending'))
+        self.assertFalse(cache_provider.compare_and_set('test:cas', None, 'other'))
+        self.assertFalse(cache_provider.compare_and_set('test:cas', 'filled', 'cancelled'))
+        self.assertTrue(cache_provider.compare_and_set('test:cas', 'pending', 'filled'))
+        self.assertEqual(cache_provider.fetch('test:cas'), 'filled')
+        cache_provider.delete('test:cas')
+
+    def test_should_coalesce_writes_in_write_behind_mode(self):
+        options = dict(self.options)
+        options['REDIS_WRITE_BEHIND'] = True
+        options['REDIS_WRITE_BEHIND_INTERVAL'] = 60
+        cache_provider = RedisCacheProvider(options)
+        for number in range(100):
+            cache_provider.store('test:write-behind', number)
+        # pending writes are read from the buffer until they are flushed
+        self.assertEqual(cache_provider.fetch('test:write-behind', as_type=int), 99)
+        self.assertEqual(cache_provider.fetch_many(['test:write-behind'], as_type=int), [99])
+        self.assertIsNone(cache_provider.redis_client.get('test:write-behind'))
+        self.assertEqual(cache_provider.flush(), 1)
+        self.assertEqual(cache_provider.fetch('test:write-behind', as_type=int), 99)
+        cache_provider.store('test:write-behind', 100)
+        cache_provider.close()
+        self.assertEqual(cache_provider.fetch('test:write-behind', as_type=int), 100)
+        cache_provider.delete('test:write-behind')
+
+    def test_should_load_missing_key_once(self):
+        cache_provider = RedisCacheProvider(self.options)
+        loads = []
+
+        def loader():
+            loads.append(1)
+            time.sleep(0.2)
+            return {'price': 1}
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache_provider.get_or_load('test:loaded', loader, ttl=30, as_type=dict))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [{'price': 1}] * 5)
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(cache_provider.get_or_load('test:loaded', loader, as_type=dict), {'price': 1})
+        self.assertAlmostEqual(cache_provider.time_to_live('test:loaded'), 30, delta=1)
+        cache_provider.delete('test:loaded')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+from cache.serializer.JsonSerializer import JsonSerializer
+from cache.serializer.serializer_utility import serializer_from_options, dumps_marked, loads_marked, is_marked, load_serializer, \
+    compression_from_options
+
+
+class SerializerUtilityTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.value = {'name': 'Eugene', 'address': {'place': 'on my island'}, 'numbers': [1, 2.5]}
+
+    def test_should_not_select_serializer_when_option_missing(self):
+        self.assertIsNone(serializer_from_options({}))
+
+    def test_should_select_serializer_from_options(self):
+        serializer = serializer_from_options({'REDIS_SERIALIZER': 'json'})
+        self.assertIsInstance(serializer, JsonSerializer)
+
+    def test_should_raise_error_for_unknown_serializer(self):
+        with self.assertRaises(ValueError) as ve:
+            serializer_from_options({'REDIS_SERIALIZER': 'yaml'})
+        self.assertEqual("unknown serializer:yaml please use one of ['json', 'orjson', 'msgpack']", str(ve.exception))
+
+    def test_should_mark_serialized_value_with_format(self):
+        serialized_value = dumps_marked(JsonSerializer(), self.value)
+        self.assertTrue(is_marked(serialized_value))
+        self.assertEqual(serialized_value[:2], '\x00J')
+        self.assertEqual(loads_marked(serialized_value), self.value)
+
+    def test_should_not_consider_plain_values_marked(self):
+        self.assertFalse(is_marked('{"A": "1"}'))
+        self.assertFalse(is_marked(''))
+
+    def test_should_round_trip_each_available_serializer(self):
+        for name in ['json', 'orjson', 'msgpack']:
+            try:
+                serializer = load_serializer(name)
+            except ImportError:
+                continue
+            with self.subTest(serializer=name):
+                self.assertEqual(loads_marked(dumps_marked(serializer, self.value)), self.value)
+
+    def test_should_read_orjson_values_as_json(self):
+        try:
+            orjson_serializer = load_serializer('orjson')
+        except ImportError:
+            self.skipTest('orjson not installed')
+        self.assertEqual(JsonSerializer.loads(orjson_serializer.dumps(self.value)), self.value)
+
+    def test_should_read_marked_raw_bytes(self):
+        json_value = dumps_marked(JsonSerializer(), self.value).encode()
+        self.assertTrue(is_marked(json_value))
+        self.assertFalse(is_marked(b'{"A": "1"}'))
+        self.assertEqual(loads_marked(json_value), self.value)
+
+    def test_should_round_trip_compressed_values(self):
+        for name in ['zstd', 'lz4']:
+            try:
+                compression = compression_from_options({'REDIS_COMPRESSION': name})
+            except ImportError:
+                continue
+            with self.subTest(compression=name):
+                compressed = dumps_marked(compression, dumps_marked(JsonSerializer(), self.value))
+                self.assertEqual(compressed[:2], f'\x00{compression.marker}'.encode())
+                self.assertEqual(loads_marked(compressed), self.value)
+                self.assertEqual(loads_marked(compressed.decode('utf-8', 'surrogateescape')), self.value)
+                self.assertEqual(loads_marked(dumps_marked(compression, '{"A": "1"}')), {'A': '1'})
+
+    def test_should_pack_equal_msgpack_maps_equally(self):
+        try:
+            msgpack_serializer = load_serializer('msgpack')
+        except ImportError:
+            self.skipTest('msgpack not installed')
+        self.assertEqual(msgpack_serializer.dumps({'B': [{'D': 1, 'C': 2}], 'A': 1}), msgpack_serializer.dumps({'A': 1, 'B': [{'C': 2, 'D': 1}]}))
+
+    def test_should_send_msgpack_values_as_raw_bytes(self):
+        try:
+            msgpack_serializer = load_serializer('msgpack')
+        except ImportError:
+            self.skipTest('msgpack not installed')
+        packed = dumps_marked(msgpack_serializer, self.value)
+        self.assertEqual(packed[:2], b'\x00M')
+        self.assertEqual(loads_marked(packed), self.value)
+        self.assertEqual(loads_marked(packed.decode('utf-8', 'surrogateescape')), self.value)
+        for name in ['zstd', 'lz4']:
+            try:
+                compression = compression_from_options({'REDIS_COMPRESSION': name})
+            except ImportError:
+                continue
+            self.assertEqual(loads_marked(dumps_marked(compression, packed)), self.value)
+
+    def test_should_reject_unknown_compression(self):
+        with self.assertRaises(ValueError):
+            compression_from_options({'REDIS_COMPRESSION': 'gzip'})
+
+
+if __name__ == '__main__':
+    unittest.main()
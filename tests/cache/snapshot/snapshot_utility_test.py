@@ -0,0 +1,38 @@
+import os
+import tempfile
+import unittest
+
+from cache.snapshot.snapshot_utility import write_snapshot_header, write_string_entry, write_hash_entry, read_snapshot, \
+    STRING_ENTRY, HASH_ENTRY
+
+
+class SnapshotUtilityTestCase(unittest.TestCase):
+
+    def setUp(self):
+        (handle, self.path) = tempfile.mkstemp(suffix='.snapshot')
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_should_read_written_entries(self):
+        with open(self.path, 'wb') as snapshot:
+            write_snapshot_header(snapshot)
+            write_string_entry(snapshot, 'test:plain', '{"A": "é"}', -1)
+            write_hash_entry(snapshot, b'test:hash', {'a': '1', b'b': b'\x00M\x01'}, 5000)
+            write_string_entry(snapshot, 'test:empty', '', 1)
+        self.assertEqual(list(read_snapshot(self.path)), [
+            (STRING_ENTRY, b'test:plain', '{"A": "é"}'.encode(), -1),
+            (HASH_ENTRY, b'test:hash', {b'a': b'1', b'b': b'\x00M\x01'}, 5000),
+            (STRING_ENTRY, b'test:empty', b'', 1)
+        ])
+
+    def test_should_reject_file_that_is_not_a_snapshot(self):
+        with open(self.path, 'wb') as snapshot:
+            snapshot.write(b'SAVE dump.rdb')
+        with self.assertRaises(ValueError):
+            list(read_snapshot(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
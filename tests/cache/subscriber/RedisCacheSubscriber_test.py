@@ -0,0 +1,41 @@
+import time
+import unittest
+
+from cache.provider.RedisCacheProviderWithHash import RedisCacheProviderWithHash
+from cache.subscriber.ChangeEvent import ChangeEvent
+from cache.subscriber.RedisCacheSubscriber import RedisCacheSubscriber
+from cache.subscriber.change_utility import REDIS_PUBLISH_CHANGES
+
+
+class RedisCacheSubscriberTestCase(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.options = {
+            'REDIS_SERVER_ADDRESS': '192.168.1.90',
+            'REDIS_SERVER_PORT': 6379,
+            REDIS_PUBLISH_CHANGES: True
+        }
+        self.cache = RedisCacheProviderWithHash(self.options)
+        self.events = []
+        self.subscriber = RedisCacheSubscriber(self.options, self.events.append, keys=['test:change'], patterns=['test:changes:*'])
+        self.subscriber.start()
+        self.subscriber.subscribed.wait(1)
+
+    def tearDown(self):
+        self.subscriber.stop()
+        self.cache.delete_many(['test:change', 'test:changes:hash'])
+
+    def test_should_receive_coalesced_change_for_stored_key(self):
+        self.cache.store('test:change', 'one')
+        self.cache.store('test:change', 'two')
+        time.sleep(0.2)
+        self.assertEqual(self.events, [ChangeEvent('test:change', 'set')])
+
+    def test_should_receive_change_for_hash_field(self):
+        self.cache.values_set_value('test:changes:hash', 'ask', '1.5')
+        time.sleep(0.2)
+        self.assertEqual(self.events, [ChangeEvent('test:changes:hash', 'hset', 'ask')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import time
+import unittest
+
+from cache.subscriber.ChangeCoalescer import ChangeCoalescer
+from cache.subscriber.ChangeEvent import ChangeEvent
+from cache.subscriber.change_utility import change_channel, change_message, parse_change, publish_changes_enabled, change_channel_prefix, \
+    REDIS_PUBLISH_CHANGES, REDIS_CHANGE_CHANNEL_PREFIX
+
+
+class ChangeUtilityTestCase(unittest.TestCase):
+
+    def test_should_read_change_options(self):
+        self.assertFalse(publish_changes_enabled({}))
+        self.assertTrue(publish_changes_enabled({REDIS_PUBLISH_CHANGES: True}))
+        self.assertEqual(change_channel_prefix({}), 'change:')
+        self.assertEqual(change_channel_prefix({REDIS_CHANGE_CHANNEL_PREFIX: 'feed:'}), 'feed:')
+
+    def test_should_round_trip_change_message(self):
+        channel = change_channel('change:', 'price:BTC')
+        self.assertEqual(channel, 'change:price:BTC')
+        self.assertEqual(parse_change('change:', channel, change_message('set')), ChangeEvent('price:BTC', 'set'))
+        self.assertEqual(parse_change('change:', channel, change_message('hset', 'ask')), ChangeEvent('price:BTC', 'hset', 'ask'))
+
+    def test_should_coalesce_events_per_key_within_window(self):
+        coalescer = ChangeCoalescer(0.05)
+        coalescer.add(ChangeEvent('A', 'set'))
+        coalescer.add(ChangeEvent('B', 'set'))
+        coalescer.add(ChangeEvent('A', 'del'))
+        self.assertFalse(coalescer.due())
+        time.sleep(0.06)
+        self.assertTrue(coalescer.due())
+        self.assertEqual(coalescer.drain(), [ChangeEvent('B', 'set'), ChangeEvent('A', 'del')])
+        self.assertFalse(coalescer.due())
+        self.assertIsNone(coalescer.remaining())
+
+    def test_should_coalesce_hash_events_per_field(self):
+        coalescer = ChangeCoalescer(0.0)
+        coalescer.add(ChangeEvent('book', 'hset', 'bid'))
+        coalescer.add(ChangeEvent('book', 'hset', 'ask'))
+        coalescer.add(ChangeEvent('book', 'hset', 'bid'))
+        self.assertTrue(coalescer.due())
+        self.assertEqual(coalescer.drain(), [ChangeEvent('book', 'hset', 'ask'), ChangeEvent('book', 'hset', 'bid')])
+
+    def test_should_parse_raw_bytes_change_message(self):
+        self.assertEqual(parse_change('change:', b'change:price:BTC', b'hdel:ask'), ChangeEvent('price:BTC', 'hdel', 'ask'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,8 @@ import unittest
 
 from core.number.BigFloat import BigFloat
 
-from cache.utility.BigFloat_utility import crack_to_serialize, join_to_deserialize
+from cache.utility.BigFloat_utility import crack_to_serialize, join_to_deserialize, pack_bigfloat, unpack_bigfloat, pack_bigfloats, \
+    unpack_bigfloats, to_decimal_string, write_bigfloat
 
 
 class BigFloatUtilityTestCase(unittest.TestCase):
@@ -58,6 +59,49 @@ class BigFloatUtilityTestCase(unittest.TestCase):
         bigfloat = join_to_deserialize(0, 0, 0)
         self.assertEqual(str(bigfloat), '0.0')
 
+    def test_should_pack_bigfloat_into_varint_binary(self):
+        packed = pack_bigfloat(BigFloat('27123.45'))
+        self.assertEqual(len(packed), 5)
+        self.assertEqual(str(unpack_bigfloat(packed)), '27123.45')
+        self.assertEqual(str(unpack_bigfloat(pack_bigfloat(BigFloat('1000000000.000000000012')))), '1000000000.000000000012')
+
+    def test_should_pack_bigfloat_beyond_64_bits(self):
+        bigfloat = BigFloat('123456789012345678901234.000000000000000000001')
+        self.assertEqual(unpack_bigfloat(pack_bigfloat(bigfloat)), bigfloat)
+
+    def test_should_pack_negative_bigfloat_below_one(self):
+        bigfloat = unpack_bigfloat(pack_bigfloat(BigFloat('-0.05')))
+        self.assertEqual(bigfloat.number, -5)
+        self.assertEqual(bigfloat.decimals, 2)
+
+    def test_should_pack_zero_bigfloat(self):
+        self.assertEqual(str(unpack_bigfloat(pack_bigfloat(BigFloat('0.0')))), '0.0')
+
+    def test_should_pack_and_unpack_bigfloats_in_bulk(self):
+        bigfloats = [BigFloat('1000000000.000000000012'), BigFloat('0.000000000012'), BigFloat('-1.25'), BigFloat('5.0')]
+        self.assertEqual(unpack_bigfloats(pack_bigfloats(bigfloats)), bigfloats)
+
+    def test_should_pack_large_arrays_in_the_same_layout_with_and_without_numpy(self):
+        bigfloats = [BigFloat(number * 7919 * (-1) ** number, number % 13) for number in range(500)]
+        bigfloats += [BigFloat(-2 ** 63, 3), BigFloat(2 ** 63 - 1, 0), BigFloat('0.0')]
+        one_at_a_time = bytearray()
+        for bigfloat in bigfloats:
+            write_bigfloat(bigfloat, one_at_a_time)
+        self.assertEqual(pack_bigfloats(bigfloats), bytes(one_at_a_time))
+        self.assertEqual(unpack_bigfloats(bytes(one_at_a_time)), bigfloats)
+
+    def test_should_pack_large_arrays_beyond_64_bits(self):
+        bigfloats = [BigFloat('123456789012345678901234.5')] + [BigFloat('1.5')] * 100
+        self.assertEqual(unpack_bigfloats(pack_bigfloats(bigfloats)), bigfloats)
+
+    def test_should_pack_no_bigfloats(self):
+        self.assertEqual(unpack_bigfloats(pack_bigfloats([])), [])
+
+    def test_should_write_signed_decimal_string(self):
+        self.assertEqual(to_decimal_string(BigFloat('-0.05')), '-0.05')
+        self.assertEqual(to_decimal_string(BigFloat('1000000000.000000000012')), '1000000000.000000000012')
+        self.assertEqual(to_decimal_string(BigFloat('5')), '5')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+import redis
+
+from cache.utility.connection_pool_utility import get_connection_pool, create_async_connection_pool, release_connection_pools, connection_pool_settings
+
+
+class ConnectionPoolUtilityTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.options = {
+            'REDIS_SERVER_ADDRESS': '192.168.1.90',
+            'REDIS_SERVER_PORT': 6379
+        }
+
+    def tearDown(self):
+        release_connection_pools()
+
+    def test_should_share_connection_pool_for_same_server(self):
+        pool_1 = get_connection_pool(self.options)
+        pool_2 = get_connection_pool(dict(self.options))
+        self.assertIs(pool_1, pool_2)
+
+    def test_should_not_share_connection_pool_for_different_server_or_settings(self):
+        pool = get_connection_pool(self.options)
+        other_server_pool = get_connection_pool({'REDIS_SERVER_ADDRESS': '192.168.1.91', 'REDIS_SERVER_PORT': 6379})
+        other_settings_pool = get_connection_pool({**self.options, 'REDIS_MAX_CONNECTIONS': 5})
+        self.assertIsNot(pool, other_server_pool)
+        self.assertIsNot(pool, other_settings_pool)
+
+    def test_should_create_own_async_pool_per_client(self):
+        self.assertIsNot(create_async_connection_pool(self.options), create_async_connection_pool(self.options))
+
+    def test_should_read_tunable_client_options(self):
+        options = {
+            **self.options,
+            'REDIS_MAX_CONNECTIONS': '20',
+            'REDIS_SOCKET_TIMEOUT': '0.5',
+            'REDIS_SOCKET_CONNECT_TIMEOUT': 2,
+            'REDIS_SOCKET_KEEPALIVE': True,
+            'REDIS_HEALTH_CHECK_INTERVAL': 30
+        }
+        pool = get_connection_pool(options)
+        self.assertEqual(pool.max_connections, 20)
+        self.assertEqual(pool.connection_kwargs['socket_timeout'], 0.5)
+        self.assertEqual(pool.connection_kwargs['socket_connect_timeout'], 2.0)
+        self.assertEqual(pool.connection_kwargs['socket_keepalive'], True)
+        self.assertEqual(pool.connection_kwargs['health_check_interval'], 30)
+        self.assertEqual(pool.connection_kwargs['decode_responses'], True)
+
+    def test_should_read_socket_keepalive_like_other_flags(self):
+        self.assertFalse(connection_pool_settings({**self.options, 'REDIS_SOCKET_KEEPALIVE': 'false'})['socket_keepalive'])
+        self.assertTrue(connection_pool_settings({**self.options, 'REDIS_SOCKET_KEEPALIVE': True})['socket_keepalive'])
+
+    def test_should_connect_using_unix_socket(self):
+        pool = get_connection_pool({'REDIS_UNIX_SOCKET_PATH': '/var/run/redis/redis-server.sock'})
+        self.assertEqual(pool.connection_class, redis.UnixDomainSocketConnection)
+        self.assertEqual(pool.connection_kwargs['path'], '/var/run/redis/redis-server.sock')
+
+    def test_should_not_require_tcp_options_with_unix_socket(self):
+        settings = connection_pool_settings({'REDIS_UNIX_SOCKET_PATH': '/tmp/redis.sock', 'REDIS_SOCKET_KEEPALIVE': True})
+        self.assertEqual(settings, {'decode_responses': True, 'encoding_errors': 'surrogateescape', 'path': '/tmp/redis.sock'})
+
+    def test_should_not_decode_responses_in_raw_bytes_mode(self):
+        options = dict(self.options)
+        options['REDIS_RAW_BYTES'] = True
+        self.assertFalse(connection_pool_settings(options)['decode_responses'])
+        self.assertIsNot(get_connection_pool(options), get_connection_pool(self.options))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from redis.cluster import ClusterPipeline
+
+from cache.utility.expiry_utility import default_ttl_from_options, effective_ttl, expiry_arguments, queue_set_many, REDIS_DEFAULT_TTL
+
+
+class ExpiryUtilityTestCase(unittest.TestCase):
+
+    def test_should_read_default_ttl(self):
+        self.assertIsNone(default_ttl_from_options({}))
+        self.assertEqual(default_ttl_from_options({REDIS_DEFAULT_TTL: '30'}), 30.0)
+
+    def test_should_prefer_call_ttl_over_default(self):
+        self.assertEqual(effective_ttl(5, 30), 5)
+        self.assertEqual(effective_ttl(None, 30), 30)
+        self.assertIsNone(effective_ttl(None, None))
+
+    def test_should_reject_ttl_that_is_not_positive(self):
+        for ttl in [0, -1, -0.5]:
+            with self.subTest(ttl=ttl), self.assertRaises(ValueError):
+                effective_ttl(ttl, 30)
+        with self.assertRaises(ValueError):
+            default_ttl_from_options({REDIS_DEFAULT_TTL: '0'})
+
+    def test_should_use_seconds_for_whole_ttl_and_milliseconds_otherwise(self):
+        self.assertEqual(expiry_arguments(None), {})
+        self.assertEqual(expiry_arguments(30.0), {'ex': 30})
+        self.assertEqual(expiry_arguments(0.25), {'px': 250})
+
+    def test_should_queue_individual_sets_in_cluster_pipeline(self):
+        pipeline = ClusterPipeline(nodes_manager=None, commands_parser=None)
+        queue_set_many(pipeline, {'{price}:BTC': '1', 'other': '2'}, {}, cluster=True)
+        queue_set_many(pipeline, {'expiring': '3'}, {'px': 250}, cluster=True)
+        self.assertEqual([command.args for command in pipeline.command_stack], [
+            ('SET', '{price}:BTC', '1'),
+            ('SET', 'other', '2'),
+            ('SET', 'expiring', '3', 'PX', 250)
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+
+from cache.utility.merge_patch_utility import merge_patch
+
+
+class MergePatchUtilityTestCase(unittest.TestCase):
+
+    def test_should_merge_nested_members_and_remove_none(self):
+        target = {'state': 'new', 'fill': {'qty': '1', 'px': '2'}}
+        self.assertEqual(merge_patch(target, {'state': 'filled', 'fill': {'px': None, 'avg': '3'}}), {'state': 'filled', 'fill': {'qty': '1', 'avg': '3'}})
+
+    def test_should_replace_non_object_member_with_patched_object(self):
+        self.assertEqual(merge_patch({'fill': [1, 2]}, {'fill': {'qty': '1', 'px': None}}), {'fill': {'qty': '1'}})
+
+    def test_should_keep_untouched_members_exactly(self):
+        patched = merge_patch({'id': 1234567890123456789, 'ratio': 1.0, 'fills': [], 'state': 'new'}, {'state': 'filled'})
+        self.assertEqual(patched, {'id': 1234567890123456789, 'ratio': 1.0, 'fills': [], 'state': 'filled'})
+        self.assertIs(type(patched['ratio']), float)
+        self.assertIs(type(patched['fills']), list)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import logging
+import unittest
+
+from cache.utility.options_utility import check_options
+from cache.utility.topology_utility import parse_nodes, is_cluster, is_sentinel
+
+
+class TopologyUtilityTestCase(unittest.TestCase):
+
+    def test_should_parse_node_list(self):
+        self.assertEqual(parse_nodes('10.0.0.1:7000, 10.0.0.2:7001'), [('10.0.0.1', 7000), ('10.0.0.2', 7001)])
+        self.assertEqual(parse_nodes([('10.0.0.1', '7000')]), [('10.0.0.1', 7000)])
+
+    def test_should_detect_topology(self):
+        self.assertTrue(is_cluster({'REDIS_CLUSTER_NODES': '10.0.0.1:7000'}))
+        self.assertTrue(is_sentinel({'REDIS_SENTINEL_NODES': '10.0.0.1:26379'}))
+        self.assertFalse(is_cluster({'REDIS_SERVER_ADDRESS': '10.0.0.1', 'REDIS_SERVER_PORT': 6379}))
+
+    def test_should_not_require_server_address_for_cluster_nodes(self):
+        check_options(logging.getLogger('test'), {'REDIS_CLUSTER_NODES': '10.0.0.1:7000'}, True)
+
+
+if __name__ == '__main__':
+    unittest.main()
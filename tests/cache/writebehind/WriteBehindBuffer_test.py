@@ -0,0 +1,41 @@
+import threading
+import unittest
+
+from cache.writebehind.WriteBehindBuffer import WriteBehindBuffer
+
+
+class WriteBehindBufferTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.flushed = threading.Event()
+        self.buffer = WriteBehindBuffer(self.flush, interval=0.01, max_pending=10)
+
+    def flush(self):
+        self.buffer.drain()
+        self.buffer.flushed()
+        self.flushed.set()
+
+    def test_should_restart_flush_thread_on_write_after_stop(self):
+        self.buffer.put('a', '1', {})
+        self.assertTrue(self.flushed.wait(timeout=1))
+        self.buffer.stop()
+        self.assertIsNone(self.buffer.thread)
+        self.flushed.clear()
+        self.buffer.put('a', '2', {})
+        self.assertTrue(self.buffer.thread.is_alive())
+        self.assertTrue(self.flushed.wait(timeout=1))
+        self.buffer.stop()
+
+    def test_should_restart_flush_thread_that_is_no_longer_running(self):
+        self.buffer.put('a', '1', {})
+        # as after a fork, the thread object is kept but no longer runs
+        self.buffer.stopped.set()
+        self.buffer.thread.join()
+        self.flushed.clear()
+        self.buffer.put('a', '2', {})
+        self.assertTrue(self.flushed.wait(timeout=1))
+        self.buffer.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+
+from cache.nearcache.NearCache import MISSING
+from cache.writebehind.WriteBuffer import WriteBuffer
+
+
+class WriteBufferTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = WriteBuffer(max_pending=3)
+
+    def test_should_keep_latest_value_per_key_and_field(self):
+        self.buffer.put('a', '1', {})
+        self.buffer.put('a', '2', {'ex': 10})
+        self.buffer.put_field('h', 'f', '1', 5000)
+        self.buffer.put_field('h', 'f', '2', None)
+        self.assertEqual(self.buffer.pending, 2)
+        (values, fields) = self.buffer.drain()
+        self.assertEqual(values, {'a': ('2', {'ex': 10})})
+        self.assertEqual(fields, {'h': ({'f': '2'}, 5000)})
+        self.assertEqual(self.buffer.pending, 0)
+
+    def test_should_report_full_at_max_pending(self):
+        self.buffer.put('a', '1', {})
+        self.buffer.put_field('h', 'f', '1', None)
+        self.assertFalse(self.buffer.full())
+        self.buffer.put_field('h', 'g', '1', None)
+        self.assertTrue(self.buffer.full())
+
+    def test_should_discard_keys_and_fields(self):
+        self.buffer.put('a', '1', {})
+        self.buffer.put_field('h', 'f', '1', None)
+        self.buffer.put_field('h', 'g', '1', None)
+        self.buffer.discard('a')
+        self.buffer.discard_field('h', 'f')
+        self.assertEqual(self.buffer.pending, 1)
+        self.assertEqual(self.buffer.drain(), ({}, {'h': ({'g': '1'}, None)}))
+
+    def test_should_restore_writes_not_superseded(self):
+        self.buffer.put('a', '1', {})
+        self.buffer.put('b', '1', {})
+        self.buffer.put_field('h', 'f', '1', None)
+        (values, fields) = self.buffer.drain()
+        self.buffer.put('a', '2', {})
+        self.buffer.put_field('h', 'g', '2', None)
+        self.buffer.restore(values, fields)
+        self.assertEqual(self.buffer.pending, 4)
+        self.assertEqual(self.buffer.drain(), ({'a': ('2', {}), 'b': ('1', {})}, {'h': ({'f': '1', 'g': '2'}, None)}))
+
+    def test_should_read_pending_values_and_fields(self):
+        self.buffer.put('a', '1', {'ex': 10})
+        self.buffer.put_field('h', 'f', '2', None)
+        self.assertEqual(self.buffer.pending_value('a'), '1')
+        self.assertEqual(self.buffer.pending_field('h', 'f'), '2')
+        self.assertIs(self.buffer.pending_value('h'), MISSING)
+        self.assertIs(self.buffer.pending_field('h', 'g'), MISSING)
+        self.buffer.drain()
+        self.assertEqual(self.buffer.pending_value('a'), '1')
+        self.assertEqual(self.buffer.pending_field('h', 'f'), '2')
+        self.assertTrue(self.buffer.busy())
+        self.buffer.flushed()
+        self.assertIs(self.buffer.pending_value('a'), MISSING)
+        self.assertIs(self.buffer.pending_field('h', 'f'), MISSING)
+        self.assertFalse(self.buffer.busy())
+
+    def test_should_read_latest_write_over_flushing_one(self):
+        self.buffer.put('a', '1', {})
+        self.buffer.put_field('h', 'f', '1', None)
+        self.buffer.drain()
+        self.buffer.put('a', '2', {})
+        self.buffer.put_field('h', 'g', '2', None)
+        self.assertEqual(self.buffer.pending_value('a'), '2')
+        self.assertEqual(self.buffer.pending_field('h', 'f'), '1')
+        self.assertEqual(self.buffer.pending_field('h', 'g'), '2')
+
+    def test_should_not_restore_writes_discarded_while_flushing(self):
+        self.buffer.put('a', '1', {})
+        self.buffer.put('b', '1', {})
+        self.buffer.put_field('h', 'f', '1', None)
+        self.buffer.put_field('h', 'g', '1', None)
+        (values, fields) = self.buffer.drain()
+        self.buffer.discard('a')
+        self.buffer.discard_field('h', 'f')
+        self.assertIs(self.buffer.pending_value('a'), MISSING)
+        self.assertIs(self.buffer.pending_field('h', 'f'), MISSING)
+        self.buffer.restore(values, fields)
+        self.assertEqual(self.buffer.drain(), ({'b': ('1', {})}, {'h': ({'g': '1'}, None)}))
+
+
+if __name__ == '__main__':
+    unittest.main()